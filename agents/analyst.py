@@ -1,55 +1,110 @@
-from openai import OpenAI
-from pathlib import Path
-from dotenv import load_dotenv
+import sys
+import asyncio
 import json
 
-load_dotenv()
-client = OpenAI()
+from config import (
+    RANK_CHUNK_TOKENS, RANK_CHUNK_MAX_JOBS, RANK_CONCURRENCY,
+    RANK_PROMPT_TOKEN_BUDGET, PROMPT_RESUME_SHARE, PRERANK_TOP_K, RANK_CASCADE_FIRST_PASS,
+    RANK_CASCADE_BAND, RANK_CASCADE_MIN_RESCORE, RANK_CASCADE_AGREE_POINTS
+)
+from agents.prerank import job_text, prerank_jobs, prerank_scores
+from core.loop import run_sync
+from core.llm_cache import get_llm_cache
+from core.llm_gateway import get_llm_gateway
+from core.json_extract import extract_json_array
+from core.limits import stage_slot
+from core.prompting import PromptTemplate, count_tokens, fit_to_budget, get_resume_store
+from core.score_index import content_hash, get_score_index
+from core.tracing import current_span
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-DATA_DIR = BASE_DIR / "data"
-RESUME_PATH = DATA_DIR / "master_resume.md"
 
+# ------------------------------------
+# Absolute rubric: every chunk is scored against the same
+# fixed scale, so scores from different chunks can be merged.
+# ------------------------------------
+RUBRIC = """
+SCORING RUBRIC (absolute — do NOT grade on a curve, do NOT compare jobs to each other):
+- 90–100: candidate already has nearly all required skills and the role matches the query
+- 70–89: strong overlap, only minor gaps, matches the query
+- 40–69: partial overlap or only loosely related to the query
+- 10–39: weak overlap, most key requirements missing
+- 0–9: unrelated to the candidate or the query
 
-def rank_jobs(jobs: list, user_query: str):
+Criteria:
+- Skill match
+- Relevance to query
+- Career alignment
+- Internship suitability
+"""
+
+MODEL = "gpt-4o"
+
+
+def scorer_id(model: str):
+    # Scores in the index are only reused by the same model + rubric
+    return content_hash(model + RUBRIC)
+
+
+def chunk_jobs(jobs: list, max_tokens: int = RANK_CHUNK_TOKENS, max_jobs: int = RANK_CHUNK_MAX_JOBS):
     """
-    Takes list of job dicts
-    Returns sorted jobs with match_score
+    Split (id, job) pairs into chunks bounded by prompt tokens and count.
+    A single oversized job still gets its own chunk.
     """
+    chunks = []
+    current = []
+    current_tokens = 0
+
+    for job_id, job in enumerate(jobs):
+        job_tokens = count_tokens(json.dumps(job))
 
-    if not RESUME_PATH.exists():
-        raise FileNotFoundError("master_resume.md not found.")
+        if current and (current_tokens + job_tokens > max_tokens or len(current) >= max_jobs):
+            chunks.append(current)
+            current = []
+            current_tokens = 0
 
-    resume_text = RESUME_PATH.read_text(encoding="utf-8")
+        current.append((job_id, job))
+        current_tokens += job_tokens
 
-    prompt = f"""
+    if current:
+        chunks.append(current)
+
+    return chunks
+
+
+# ------------------------------------
+# Stable parts first (see PromptTemplate): every ranking call
+# for a resume shares the prefix up to the query.
+# ------------------------------------
+PROMPT = PromptTemplate(
+    system="Return structured JSON only.",
+    static=f"""
 You are an AI job fit evaluator.
 
 Given:
-1) User search query
-2) Candidate resume
+1) Candidate resume
+2) User search query
 3) Multiple job descriptions
 
-Score each job from 0–100 based on:
-- Skill match
-- Relevance to query
-- Career alignment
-- Internship suitability
-
-Return ONLY valid JSON array.
+Score each job from 0–100.
+{RUBRIC}
+Return ONLY valid JSON array with one entry per job id.
 
 Format:
 [
   {{
-    "title": "...",
-    "company": "...",
-    "description": "...",
-    "source_url": "...",
+    "id": number,
     "match_score": number,
     "reason": "short explanation"
   }}
 ]
+""",
+    resume="""
+------------------------------------
 
+CANDIDATE RESUME:
+{resume_text}
+""",
+    request="""
 ------------------------------------
 
 USER QUERY:
@@ -57,43 +112,286 @@ USER QUERY:
 
 ------------------------------------
 
-CANDIDATE RESUME:
-{resume_text}
-
-------------------------------------
-
 JOBS:
-{json.dumps(jobs, indent=2)}
+{jobs}
 
 ------------------------------------
 
-Return sorted highest match_score first.
 Return JSON only.
 """
+)
+
+
+def prompt_fields(chunk: list, user_query: str):
+    jobs_payload = [
+        {
+            "id": job_id,
+            "title": job.get("title", ""),
+            "company": job.get("company", ""),
+            "description": job.get("description", "")
+        }
+        for job_id, job in chunk
+    ]
+
+    return {"user_query": user_query, "jobs": json.dumps(jobs_payload, indent=2)}
+
+
+def build_prompt(chunk: list, user_query: str, resume_text: str):
+    return PROMPT.render(resume_text, **prompt_fields(chunk, user_query))
+
+
+def parse_scores(raw: str):
+    scores = extract_json_array(raw.strip())
+
+    if scores is None:
+        print("Raw Analyst Output:\n", raw, file=sys.stderr)
+        raise RuntimeError("Analyst did not return a JSON array.")
+
+    return scores
+
+
+def compact_chunk(chunk: list, user_query: str, resume_text: str):
+    """
+    Fit resume + descriptions into RANK_PROMPT_TOKEN_BUDGET.
+    """
+    bare = [(job_id, {**job, "description": ""}) for job_id, job in chunk]
+    fixed_text = build_prompt(bare, user_query, "")
+
+    resume_text, descriptions, _ = fit_to_budget(
+        fixed_text,
+        resume_text,
+        [job.get("description", "") for _, job in chunk],
+        RANK_PROMPT_TOKEN_BUDGET,
+        label="analyst",
+        resume_share=PROMPT_RESUME_SHARE
+    )
+
+    chunk = [
+        (job_id, {**job, "description": description})
+        for (job_id, job), description in zip(chunk, descriptions)
+    ]
+
+    return chunk, resume_text
+
+
+async def score_chunk(chunk: list, user_query: str, resume_text: str, semaphore, model: str = MODEL):
+    compact, compact_resume = compact_chunk(chunk, user_query, resume_text)
+
+    async with semaphore, stage_slot("analyst"):
+        return await get_llm_cache().acomplete(
+            get_llm_gateway(),
+            model=model,
+            messages=PROMPT.messages(compact_resume, **prompt_fields(compact, user_query)),
+            temperature=0.2,
+            resume_text=resume_text,
+            label="analyst",
+            parse=parse_scores
+        )
+
+
+def local_fallback(local_ranking: list):
+    # Marked so a checkpoint never stores it as a finished Analyst stage
+    return [
+        {
+            **job,
+            "match_score": round(job["local_score"] * 100),
+            "reason": "Local relevance score (analyst unavailable).",
+            "local_fallback": True
+        }
+        for job in local_ranking
+    ]
+
+
+def load_resume():
+    return get_resume_store().text()
+
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "Return structured JSON only."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.2
+async def ascore_jobs(jobs: list, user_query: str, resume_text: str, semaphore, model: str = MODEL):
+    """
+    LLM-scores jobs in token-bounded chunks (concurrently, bounded by
+    `semaphore`). Jobs already in the score index for this resume,
+    query and model are not sent again. Returns the jobs in input
+    order with match_score/reason.
+    Raises openai.APIError if the analyst is unavailable.
+    """
+    index = get_score_index()
+    known = index.lookup(jobs, user_query, resume_text, scorer_id(model))
+    unseen = [job for position, job in enumerate(jobs) if position not in known]
+
+    current_span().add("score_index_hits", len(known))
+
+    results = await asyncio.gather(*(
+        score_chunk(chunk, user_query, resume_text, semaphore, model) for chunk in chunk_jobs(unseen)
+    ))
+
+    scores = {}
+    for chunk_scores in results:
+        for entry in chunk_scores:
+            try:
+                scores[int(entry["id"])] = entry
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    fresh = []
+    for job_id, job in enumerate(unseen):
+        if job_id in scores:
+            fresh.append({
+                **job,
+                "match_score": scores[job_id].get("match_score", 0),
+                "reason": scores[job_id].get("reason", "")
+            })
+        else:
+            fresh.append({**job, "match_score": 0, "reason": "Not scored by analyst."})
+
+    index.store([job for job_id, job in enumerate(fresh) if job_id in scores], user_query, resume_text, scorer_id(model))
+
+    fresh = iter(fresh)
+
+    return [
+        {**job, **known[position]} if position in known else next(fresh)
+        for position, job in enumerate(jobs)
+    ]
+
+
+# ------------------------------------
+# MODEL CASCADE: a cheap first pass over every job, MODEL only
+# for the jobs near the top of it (see config RANK_CASCADE_*).
+# ------------------------------------
+def rank_order(job: dict):
+    """
+    Sort key: jobs the strong model scored come first, then the rest by
+    first-pass score; one scale never competes with the other.
+    """
+    return job.get("score_tier") == "first_pass", -job["match_score"]
+
+
+async def afirst_pass(jobs: list, user_query: str, resume_text: str, semaphore,
+                      first_pass: str = RANK_CASCADE_FIRST_PASS):
+    """
+    First-tier scores, in input order: the first-pass model, or the
+    local pre-rank score x 100 for "local". Without a cascade
+    (first_pass "") this is the only tier and uses MODEL.
+    """
+    if first_pass != "local":
+        return await ascore_jobs(jobs, user_query, resume_text, semaphore, first_pass or MODEL)
+
+    if all("local_score" in job for job in jobs):
+        scores = [job["local_score"] for job in jobs]
+    else:
+        scores = prerank_scores([job_text(job) for job in jobs], user_query, resume_text)
+
+    return [
+        {**job, "match_score": round(float(score) * 100), "reason": "Local relevance score (first pass)."}
+        for job, score in zip(jobs, scores)
+    ]
+
+
+def rescore_band(first: list, band: float = RANK_CASCADE_BAND, min_rescore: int = RANK_CASCADE_MIN_RESCORE):
+    """
+    Positions of the first-pass jobs worth the strong model: within
+    `band` points of the best, and at least the top `min_rescore`.
+    """
+    order = sorted(range(len(first)), key=lambda position: -first[position]["match_score"])
+    if not order:
+        return []
+
+    cutoff = first[order[0]]["match_score"] - band
+
+    return [
+        position for rank, position in enumerate(order)
+        if rank < min_rescore or first[position]["match_score"] >= cutoff
+    ]
+
+
+async def arefine(first: list, user_query: str, resume_text: str, semaphore,
+                  band: float = RANK_CASCADE_BAND, min_rescore: int = RANK_CASCADE_MIN_RESCORE):
+    """
+    Second tier: re-scores the rescore_band() jobs with MODEL. Returns
+    the jobs in input order, each with `first_pass_score` and a
+    `score_tier` ("strong" / "first_pass"); tier agreement goes on
+    the current span. If MODEL is unavailable the first pass stands.
+    """
+    from openai import APIError
+
+    positions = rescore_band(first, band, min_rescore)
+
+    try:
+        strong = await ascore_jobs([first[position] for position in positions], user_query, resume_text, semaphore)
+    except APIError as e:
+        print(f"⚠ Strong re-score unavailable, keeping first-pass scores: {e}", file=sys.stderr)
+        strong = []
+
+    refined = [{**job, "first_pass_score": job["match_score"], "score_tier": "first_pass"} for job in first]
+
+    for position, job in zip(positions, strong):
+        refined[position] = {**refined[position], **job, "score_tier": "strong"}
+
+    if strong:
+        record_agreement([first[position] for position in positions], strong)
+
+    return refined
+
+
+def record_agreement(first: list, strong: list):
+    """
+    How often the tiers agree on the re-scored jobs (scores within
+    RANK_CASCADE_AGREE_POINTS) and whether they pick the same leader:
+    the numbers to tune RANK_CASCADE_BAND against.
+    """
+    agreed = sum(
+        abs(a["match_score"] - b["match_score"]) <= RANK_CASCADE_AGREE_POINTS
+        for a, b in zip(first, strong)
     )
 
-    raw = response.choices[0].message.content.strip()
+    def leader(jobs):
+        return max(range(len(jobs)), key=lambda position: (jobs[position]["match_score"], -position))
 
-    # robust extraction
-    import re
-    match = re.search(r"\[.*\]", raw, re.DOTALL)
-    if not match:
-        raise RuntimeError("Analyst did not return JSON.")
+    s = current_span()
+    s.add("cascade_runs")
+    s.add("cascade_rescored", len(strong))
+    s.add("cascade_agreed", agreed)
+    s.add("cascade_same_leader", int(leader(first) == leader(strong)))
 
-    json_text = match.group(0)
+
+async def arank_jobs(jobs: list, user_query: str, concurrency: int = RANK_CONCURRENCY,
+                     top_k: int = PRERANK_TOP_K, first_pass: str = RANK_CASCADE_FIRST_PASS,
+                     band: float = RANK_CASCADE_BAND, fallback: bool = True):
+    """
+    Local TF-IDF pre-rank picks the top_k candidates, then
+    token-bounded chunks of those are scored concurrently by the
+    first-pass scorer; the strong model re-scores the top band
+    (no cascade: MODEL scores them all). Sorted locally.
+    If the analyst is unavailable: the local ranking, or with
+    fallback=False the openai.APIError.
+    """
+
+    resume_text = load_resume()
+
+    candidates, local_ranking = prerank_jobs(jobs, user_query, resume_text, top_k)
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    from openai import APIError
 
     try:
-        ranked = json.loads(json_text)
-    except json.JSONDecodeError:
-        print("Raw Analyst Output:\n", raw)
-        raise RuntimeError("Failed to parse analyst JSON.")
+        ranked = await afirst_pass(candidates, user_query, resume_text, semaphore, first_pass)
+        if first_pass:
+            ranked = await arefine(ranked, user_query, resume_text, semaphore, band)
+    except APIError as e:
+        if not fallback:
+            raise
+        print(f"⚠ Analyst unavailable, using local ranking: {e}", file=sys.stderr)
+        return local_fallback(local_ranking)
+
+    # stable: ties keep pre-rank order
+    ranked.sort(key=rank_order)
 
     return ranked
+
+
+def rank_jobs(jobs: list, user_query: str):
+    """
+    Takes list of job dicts
+    Returns sorted jobs with match_score
+    """
+    return run_sync(arank_jobs(jobs, user_query))
@@ -0,0 +1,197 @@
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+from config import INTERNSHALA_BASE_URL
+from core.http_pool import fetch_text
+
+
+class ParseError(RuntimeError):
+    pass
+
+
+# -----------------------------------------
+# MINIMAL DOM (stdlib parser, no extra dependency)
+# -----------------------------------------
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+}
+_BLOCK_TAGS = {
+    "div", "p", "br", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+    "section", "tr", "table",
+}
+_SKIP_TAGS = {"script", "style", "noscript", "svg"}
+
+
+class Node:
+
+    __slots__ = ("tag", "attrs", "classes", "children", "parent")
+
+    def __init__(self, tag: str, attrs: dict, parent=None):
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = set((attrs.get("class") or "").split())
+        self.children = []
+        self.parent = parent
+
+    def iter(self):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Node):
+                yield node
+                stack.extend(reversed(node.children))
+
+    def find_all(self, class_name: str = None, tag: str = None):
+        return [
+            node for node in self.iter()
+            if (class_name is None or class_name in node.classes) and (tag is None or node.tag == tag)
+        ]
+
+    def find(self, class_name: str = None, tag: str = None):
+        for node in self.iter():
+            if (class_name is None or class_name in node.classes) and (tag is None or node.tag == tag):
+                return node
+        return None
+
+    def text(self, separator: str = " "):
+        """
+        Text content; block elements start a new line when separator is "\\n".
+        """
+        parts = []
+
+        def walk(node):
+            for child in node.children:
+                if isinstance(child, str):
+                    parts.append(child)
+                elif child.tag not in _SKIP_TAGS:
+                    # Tags break words apart ("<span>Python</span><span>SQL</span>")
+                    gap = "\n" if separator == "\n" and child.tag in _BLOCK_TAGS else " "
+                    parts.append(gap)
+                    walk(child)
+                    parts.append(gap)
+
+        walk(self)
+        raw = "".join(parts)
+
+        if separator == "\n":
+            lines = (" ".join(line.split()) for line in raw.split("\n"))
+            return "\n".join(line for line in lines if line)
+
+        return " ".join(raw.split())
+
+
+class _TreeBuilder(HTMLParser):
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node("#root", {})
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {key: value or "" for key, value in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in _VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(Node(tag, {key: value or "" for key, value in attrs}, self.current))
+
+    def handle_endtag(self, tag):
+        # Unclosed <p>/<li> etc.: close back to the matching open tag, if any
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(html: str):
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+# -----------------------------------------
+# PAGES
+# -----------------------------------------
+def search_url(search_keyword: str, base_url: str = INTERNSHALA_BASE_URL):
+    slug = re.sub(r"[^a-z0-9]+", "-", search_keyword.lower()).strip("-")
+    return f"{base_url.rstrip('/')}/internships/keywords-{slug}/"
+
+
+def parse_search_page(html: str, page_url: str, max_jobs: int):
+    """
+    [{title, company, source_url}] in results-page order.
+    Raises ParseError when no listing card is recognised.
+    """
+    root = parse_html(html)
+    links = []
+
+    for card in root.find_all("individual_internship"):
+        anchor = card.find("job-title-href", "a") or card.find("profile")
+        if anchor is not None and anchor.tag != "a":
+            anchor = anchor.find(tag="a") or anchor
+
+        href = anchor.attrs.get("href") if anchor is not None else None
+        href = href or card.attrs.get("data-href")
+
+        company = card.find("company-name") or card.find("company_name") or card.find("link_display_like_text")
+
+        if not href or anchor is None:
+            continue
+
+        links.append({
+            "title": anchor.text(),
+            "company": company.text() if company is not None else "",
+            "source_url": urljoin(page_url, href),
+        })
+
+        if len(links) >= max_jobs:
+            break
+
+    if not links:
+        raise ParseError("No internship cards found on the search page.")
+
+    return links
+
+
+def parse_listing_page(html: str, link: dict):
+    """
+    {title, company, description, source_url} for one listing.
+    Raises ParseError when the description block is missing.
+    """
+    root = parse_html(html)
+
+    title = root.find("heading_title") or root.find("profile")
+    company = root.find("company_name") or root.find("link_display_like_text")
+    details = root.find("internship_details")
+
+    description = details.text("\n") if details is not None else ""
+    if not description:
+        raise ParseError(f"No description block on {link['source_url']}.")
+
+    return {
+        "title": (title.text() if title is not None else "") or link.get("title", ""),
+        "company": (company.text() if company is not None else "") or link.get("company", ""),
+        "description": description,
+        "source_url": link["source_url"],
+    }
+
+
+# -----------------------------------------
+# FETCH (pooled, rate-limited per host: core/http_pool.py)
+# -----------------------------------------
+async def fetch_listing_links(search_keyword: str, max_jobs: int, base_url: str = INTERNSHALA_BASE_URL):
+    html, page_url = await fetch_text(search_url(search_keyword, base_url))
+    return parse_search_page(html, page_url, max_jobs)
+
+
+async def fetch_listing(link: dict):
+    html, _ = await fetch_text(link["source_url"])
+    return parse_listing_page(html, link)
@@ -1,69 +1,110 @@
 import sys
 import asyncio
+import contextlib
 import json
-from browser_use import Agent
-from dotenv import load_dotenv
+from pathlib import Path
 
-load_dotenv()
+if __package__ in (None, ""):
+    # Allow `python agents/scout.py` as well as `python -m agents.scout`
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import SCOUT_CONCURRENCY, SCOUT_LISTING_TIMEOUT, SCOUT_HTTP_FAST_PATH, SCOUT_DEADLINE
+from core.http_pool import close_clients
+from core.json_extract import extract_json
+from core.startup import init
+from core.tracing import span, payload_bytes
 
 
 # -----------------------------------------
-# CORE SCOUT LOGIC
+# HELPERS
 # -----------------------------------------
-async def scout_jobs(query: str, max_jobs: int = 3):
-
-    # -----------------------------------------
-    # Extract clean technical keyword
-    # -----------------------------------------
+def extract_search_keyword(query: str):
     if "machine learning" in query.lower():
-        search_keyword = "Machine Learning"
+        return "Machine Learning"
     elif "data science" in query.lower():
-        search_keyword = "Data Science"
+        return "Data Science"
     elif "backend" in query.lower():
-        search_keyword = "Backend"
+        return "Backend"
     elif "ai" in query.lower():
-        search_keyword = "Artificial Intelligence"
-    else:
-        search_keyword = query.strip()
+        return "Artificial Intelligence"
+    return query.strip()
+
+
+def parse_agent_json(raw_text):
+    if not raw_text:
+        raise RuntimeError("Scout did not return final result.")
+
+    data = extract_json(raw_text)
+
+    if data is None:
+        print("⚠ Raw Scout Output:\n", raw_text, file=sys.stderr)
+        raise RuntimeError("Scout returned malformed JSON.")
+
+    return data
+
+
+async def run_browser_agent(task_prompt: str, browser_session=None, agent_factory=None, step: str = "agent"):
+    if agent_factory is None:
+        # browser_use is only imported once a page actually needs the browser
+        from browser_use import Agent
+        init()
+        agent_factory = Agent
+
+    if isinstance(browser_session, LazyBrowserSession):
+        # One session per running agent: a shared one would drive the same tab
+        async with browser_session.lease() as session:
+            return await run_browser_agent(task_prompt, session, agent_factory, step)
+
+    agent_kwargs = {}
+    if browser_session is not None:
+        # Reuse a warm browser instead of launching a new one
+        agent_kwargs["browser_session"] = browser_session
+
+    with span(f"scout.{step}", task_bytes=payload_bytes(task_prompt), shared_browser=browser_session is not None) as s:
+        agent = agent_factory(
+            task=task_prompt,
+            provider="browser-use",
+            model="bu-3.0",
+            **agent_kwargs)
+        result = await agent.run()
+
+        raw_text = result.final_result() if callable(result.final_result) else result.final_result
+
+        number_of_steps = getattr(result, "number_of_steps", None)
+        s.set(
+            output_bytes=payload_bytes(raw_text or ""),
+            agent_steps=number_of_steps() if callable(number_of_steps) else None
+        )
+
+    return parse_agent_json(raw_text)
+
+
+# -----------------------------------------
+# PHASE 1 — RESULT PAGE LINKS
+# -----------------------------------------
+async def collect_listing_links(search_keyword: str, max_jobs: int, browser_session=None, agent_factory=None,
+                                site_name: str = "", search_steps: str = ""):
+    """
+    Result-page links via the browser agent. The site and the steps
+    to search it come from the job source (agents/sources/).
+    """
 
-    # -----------------------------------------
-    # Deterministic prompt
-    # -----------------------------------------
     task_prompt = f"""
 You are a deterministic job scouting agent.
 
-Target website: Internshala
+Target website: {site_name}
 
 GOAL:
-Find up to {max_jobs} internships matching: "{search_keyword}"
-
-POPUP HANDLING:
-After clicking "Internships":
-- Immediately close sign-up popup if visible.
-- Do NOT read it.
-- Do NOT scroll before closing.
-
-SEARCH RULES:
-1. Open https://internshala.com
-2. Click "Internships"
-3. Close popup
-4. Use ONLY main keyword search bar
-5. Type EXACTLY "{search_keyword}"
-6. Press Enter
-7. Do NOT use filters
-8. Collect first {max_jobs} relevant internships only
-
-FOR EACH:
-- Click job title
-- Extract:
-    - title
-    - company
-    - full description
-    - source_url (current URL)
-- Return to results page
+Collect links to up to {max_jobs} internships matching: "{search_keyword}"
+{search_steps}
+
+FOR EACH (from the results page only, do NOT open listings):
+- title
+- company
+- source_url (absolute link of the job title)
 
 OUTPUT:
-Return ONLY valid JSON list.
+Return ONLY valid JSON list, in results page order.
 No markdown.
 No commentary.
 
@@ -72,54 +113,353 @@ Format:
   {{
     "title": "...",
     "company": "...",
-    "description": "...",
     "source_url": "..."
   }}
 ]
 """
 
-    agent = Agent(
-        task=task_prompt,
-        provider="browser-use",
-        model="bu-3.0")
-    result = await agent.run()
+    links = await run_browser_agent(task_prompt, browser_session, agent_factory, step="links")
 
-    raw_text = result.final_result() if callable(result.final_result) else result.final_result
+    if not isinstance(links, list):
+        raise RuntimeError("Scout output is not a list.")
 
-    if not raw_text:
-        raise RuntimeError("Scout did not return final result.")
+    return links[:max_jobs]
+
+
+# -----------------------------------------
+# PHASE 2 — LISTING DETAILS (concurrent)
+# -----------------------------------------
+async def extract_listing(link: dict, browser_session=None, agent_factory=None):
+
+    task_prompt = f"""
+You are a deterministic listing extraction agent.
+
+Open this internship listing in a new tab:
+SOURCE_URL: {link["source_url"]}
+
+- Close sign-up popup if visible.
+- Do NOT click any other links.
+
+Extract:
+- title
+- company
+- full description
+
+OUTPUT:
+Return ONLY one valid JSON object.
+No markdown.
+No commentary.
+
+Format:
+{{
+  "title": "...",
+  "company": "...",
+  "description": "..."
+}}
+"""
 
-    raw_text = raw_text.strip()
+    detail = await run_browser_agent(task_prompt, browser_session, agent_factory, step="listing")
 
-    # Remove markdown fences
-    if raw_text.startswith("```"):
-        raw_text = raw_text.replace("```json", "").replace("```", "").strip()
+    if not isinstance(detail, dict):
+        raise RuntimeError("Listing output is not an object.")
 
-    # Handle escaped JSON
-    if '\\"' in raw_text:
-        raw_text = raw_text.encode("utf-8").decode("unicode_escape")
+    return {
+        "title": detail.get("title") or link.get("title", ""),
+        "company": detail.get("company") or link.get("company", ""),
+        "description": detail.get("description", ""),
+        "source_url": link["source_url"]
+    }
+
+
+async def iter_listing_details(
+    links: list,
+    fetch_detail,
+    concurrency: int = SCOUT_CONCURRENCY,
+    listing_timeout: float = SCOUT_LISTING_TIMEOUT
+):
+    """
+    Runs `await fetch_detail(link)` for every link with at most
+    `concurrency` fetches (or agent tabs) open, yielding
+    (result_index, job) as each one completes.
+    A listing that fails or exceeds `listing_timeout` is skipped.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_one(index, link):
+        async with semaphore:
+            try:
+                job = await asyncio.wait_for(
+                    fetch_detail(link),
+                    listing_timeout
+                )
+                return index, job
+            except asyncio.TimeoutError:
+                print(f"⚠ Listing timed out: {link.get('source_url')}", file=sys.stderr)
+            except Exception as e:
+                print(f"⚠ Listing failed: {link.get('source_url')}: {e}", file=sys.stderr)
+            return index, None
+
+    tasks = [asyncio.ensure_future(fetch_one(i, link)) for i, link in enumerate(links)]
 
     try:
-        jobs = json.loads(raw_text)
+        for next_done in asyncio.as_completed(tasks):
+            index, job = await next_done
+            if job is not None:
+                yield index, job
+    finally:
+        # Consumer stopped early -> don't leave agents running
+        for task in tasks:
+            task.cancel()
 
-        # Handle double-encoded JSON
-        if isinstance(jobs, str):
-            jobs = json.loads(jobs)
 
-    except json.JSONDecodeError:
-        print("⚠ Raw Scout Output:\n", raw_text)
-        raise RuntimeError("Scout returned malformed JSON.")
+async def fetch_listing_details(links: list, fetch_detail, **kwargs):
+    """
+    Same as iter_listing_details, collected back into result order.
+    """
+    details = [
+        pair async for pair in iter_listing_details(links, fetch_detail, **kwargs)
+    ]
+    details.sort(key=lambda pair: pair[0])
 
-    if not isinstance(jobs, list):
-        raise RuntimeError("Scout output is not a list.")
+    return [job for _, job in details]
 
-    return jobs
+
+# -----------------------------------------
+# CORE SCOUT LOGIC
+# -----------------------------------------
+async def scout_jobs_stream(
+    query: str,
+    max_jobs: int = 3,
+    browser_session=None,
+    agent_factory=None,
+    concurrency: int = SCOUT_CONCURRENCY,
+    listing_timeout: float = SCOUT_LISTING_TIMEOUT,
+    http_first: bool = SCOUT_HTTP_FAST_PATH,
+    sources: list = None,
+    deadline: float = SCOUT_DEADLINE
+):
+    """
+    Yields (result_index, job) as soon as any source has a listing.
+
+    Every source (agents/sources/, SCOUT_SOURCES) is searched at the
+    same time for up to `max_jobs` listings each. Indices interleave
+    the sources by rank: every board's first result sorts ahead of
+    any board's second. Sources still running at `deadline` seconds
+    are cancelled; a failing source only loses its own listings.
+
+    With http_first (SCOUT_HTTP_FAST_PATH) sources fetch and parse
+    pages directly; the browser agent is their fallback.
+
+    browser_session is normally a LazyBrowserSession (one session per
+    running agent); the agents of a single session passed in take
+    turns on it.
+
+    agent_factory defaults to browser_use.Agent; pass a stand-in
+    with the same (task=..., **kwargs) -> .run() shape to test offline.
+    """
+    from agents.sources import get_sources
+
+    if browser_session is not None and not isinstance(browser_session, LazyBrowserSession):
+        browser_session = LazyBrowserSession.around(browser_session)
+
+    search_keyword = extract_search_keyword(query)
+    sources = get_sources() if sources is None else sources
+
+    loop = asyncio.get_running_loop()
+    ends_at = loop.time() + deadline
+    arrivals = asyncio.Queue()
+    done = object()
+    errors = []
+
+    async def run_source(position, source):
+        with span("scout.source", source=source.name) as s:
+            jobs = 0
+            try:
+                async for index, job in source.stream(
+                    search_keyword,
+                    max_jobs,
+                    browser_session=browser_session,
+                    agent_factory=agent_factory,
+                    concurrency=concurrency,
+                    listing_timeout=listing_timeout,
+                    http_first=http_first
+                ):
+                    jobs += 1
+                    await arrivals.put((index * len(sources) + position, {**job, "source": source.name}))
+            except Exception as e:
+                print(f"⚠ Source {source.name} failed: {e}", file=sys.stderr)
+                errors.append(e)
+                s.set(error=str(e))
+            finally:
+                s.set(jobs=jobs)
+                await arrivals.put(done)
+
+    tasks = [asyncio.ensure_future(run_source(position, source)) for position, source in enumerate(sources)]
+    running = len(tasks)
+    yielded = 0
+
+    try:
+        while running:
+            remaining = ends_at - loop.time()
+            if remaining <= 0:
+                print(f"⚠ Scout deadline ({deadline:g}s) reached, keeping {yielded} listing(s)", file=sys.stderr)
+                break
+
+            try:
+                item = await asyncio.wait_for(arrivals.get(), remaining)
+            except asyncio.TimeoutError:
+                continue
+
+            if item is done:
+                running -= 1
+                continue
+
+            yielded += 1
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    if not yielded and errors and len(errors) == len(sources):
+        raise errors[0]
+
+
+async def scout_jobs(query: str, max_jobs: int = 3, browser_session=None, agent_factory=None, **kwargs):
+    """
+    Jobs in their original result order (see scout_jobs_stream).
+    """
+    pairs = [
+        pair async for pair in scout_jobs_stream(query, max_jobs, browser_session, agent_factory, **kwargs)
+    ]
+    pairs.sort(key=lambda pair: pair[0])
+
+    return [job for _, job in pairs]
+
+
+def create_browser_session():
+    """
+    Long-lived browser shared across queries.
+    Returns None when this browser_use build has no session API.
+    """
+    try:
+        from browser_use import BrowserSession
+    except ImportError:
+        return None
+
+    return BrowserSession(keep_alive=True)
+
+
+class LazyBrowserSession:
+    """
+    Browser sessions for the browser agents, one per agent while it
+    runs: agents sharing a session would drive the same tab and
+    overwrite each other's page state. A session is created (and
+    browser_use imported) the first time an agent finds none idle,
+    then kept warm for the next one; with the HTTP fast path most
+    searches never get that far. At most `size` exist
+    (SCOUT_CONCURRENCY), further agents wait for one to be free.
+    Pass it wherever a browser_session is expected.
+    """
+
+    def __init__(self, size: int = SCOUT_CONCURRENCY):
+        self.size = max(1, size)
+        self.sessions = []
+        self.idle = []
+        self._slots = None
+
+    @classmethod
+    def around(cls, session):
+        """
+        A pool of just `session` (never closed by it).
+        """
+        pool = cls(size=1)
+        pool.idle.append(session)
+        return pool
+
+    @contextlib.asynccontextmanager
+    async def lease(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+
+        async with self._slots:
+            if self.idle:
+                session = self.idle.pop()
+            else:
+                with span("scout.browser_session", sessions=len(self.sessions) + 1):
+                    session = create_browser_session()
+                self.sessions.append(session)
+
+            try:
+                yield session
+            finally:
+                self.idle.append(session)
+
+    async def close(self):
+        sessions = self.sessions
+        self.sessions = []
+        self.idle = []
+        self._slots = None
+
+        for session in sessions:
+            if session is not None and hasattr(session, "kill"):
+                await session.kill()
+
+
+# -----------------------------------------
+# WORKER MODE (see agents/scout_pool.py)
+# -----------------------------------------
+async def worker_main():
+    from agents.scout_protocol import read_frame, write_frame
+    # Run as __main__: the sources call into agents.scout, so the session
+    # must be that module's class for it to be recognised there
+    from agents.scout import LazyBrowserSession, scout_jobs_stream
+
+    # Frames own the real stdout; anything else printed goes to stderr
+    frame_out = sys.stdout
+    sys.stdout = sys.stderr
+
+    loop = asyncio.get_running_loop()
+    browser_session = LazyBrowserSession()
+
+    write_frame(frame_out, {"type": "ready"})
+
+    while True:
+        request = await loop.run_in_executor(None, read_frame, sys.stdin)
+
+        if request is None or request.get("type") == "shutdown":
+            break
+
+        try:
+            pairs = []
+
+            async for index, job in scout_jobs_stream(
+                request["query"],
+                request.get("max_jobs", 3),
+                browser_session=browser_session
+            ):
+                pairs.append((index, job))
+                if request.get("stream"):
+                    write_frame(frame_out, {"type": "job", "id": request["id"], "index": index, "job": job})
+
+            pairs.sort(key=lambda pair: pair[0])
+            jobs = [job for _, job in pairs]
+            write_frame(frame_out, {"type": "result", "id": request["id"], "jobs": jobs})
+        except Exception as e:
+            write_frame(frame_out, {"type": "error", "id": request["id"], "error": str(e)})
+
+    await close_clients()
+    await browser_session.close()
 
 
 # -----------------------------------------
 # CLI ENTRYPOINT (CRITICAL FOR STREAMLIT)
 # -----------------------------------------
 if __name__ == "__main__":
+    init()
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        asyncio.run(worker_main())
+        sys.exit(0)
 
     # Read query from command line
     query = sys.argv[1] if len(sys.argv) > 1 else "Machine Learning Intern"
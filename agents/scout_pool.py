@@ -0,0 +1,298 @@
+import sys
+import queue
+import asyncio
+import threading
+import subprocess
+import itertools
+
+from config import BASE_DIR, SCOUT_MODE, SCOUT_POOL_SIZE
+from agents.scout_protocol import read_frame, write_frame
+from core.json_extract import extract_json_array
+from core.loop import get_loop, run_sync
+from core.tracing import span
+
+
+# -----------------------------------------
+# MODE 0 — one interpreter per query (legacy)
+# -----------------------------------------
+class SubprocessScout:
+
+    def run(self, query: str, max_jobs: int = 3):
+        try:
+            process = subprocess.run(
+                [sys.executable, "-m", "agents.scout", query],
+                capture_output=True,
+                text=True,
+                check=True,
+                cwd=BASE_DIR
+            )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Scout process failed:\n{e.stderr}")
+
+        raw_output = process.stdout.strip()
+
+        jobs = extract_json_array(raw_output)
+
+        if jobs is None:
+            raise RuntimeError(f"Could not extract JSON from Scout:\n{raw_output}")
+
+        return jobs
+
+    async def astream(self, query: str, max_jobs: int = 3):
+        # One-shot process: nothing to stream, results arrive together
+        with span("scout.subprocess") as s:
+            jobs = await asyncio.to_thread(self.run, query, max_jobs)
+            s.set(jobs=len(jobs))
+        for pair in enumerate(jobs):
+            yield pair
+
+    def close(self):
+        pass
+
+
+# -----------------------------------------
+# MODE 1 — in-process on the shared event loop
+# -----------------------------------------
+class InProcessScout:
+
+    def __init__(self):
+        self._browser_session = None
+
+    def _get_browser_session(self):
+        # Launched on the shared loop the first time a browser agent runs
+        from agents.scout import LazyBrowserSession
+
+        if self._browser_session is None:
+            self._browser_session = LazyBrowserSession()
+
+        return self._browser_session
+
+    async def arun(self, query: str, max_jobs: int = 3):
+        from agents.scout import scout_jobs
+
+        return await scout_jobs(query, max_jobs, browser_session=self._get_browser_session())
+
+    async def astream(self, query: str, max_jobs: int = 3):
+        from agents.scout import scout_jobs_stream
+
+        async for pair in scout_jobs_stream(query, max_jobs, browser_session=self._get_browser_session()):
+            yield pair
+
+    def run(self, query: str, max_jobs: int = 3):
+        return run_sync(self.arun(query, max_jobs))
+
+    def close(self):
+        session = self._browser_session
+        self._browser_session = None
+
+        if session is not None:
+            asyncio.run_coroutine_threadsafe(session.close(), get_loop()).result()
+
+
+# -----------------------------------------
+# MODE 2 — warm worker processes
+# -----------------------------------------
+class ScoutWorker:
+    """
+    One long-lived `python -m agents.scout --worker` process.
+    Talks framed JSON over stdin/stdout (agents/scout_protocol.py).
+    """
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "agents.scout", "--worker"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=BASE_DIR
+        )
+
+        ready = read_frame(self.process.stdout)
+        if not ready or ready.get("type") != "ready":
+            self.close()
+            raise RuntimeError("Scout worker failed to start.")
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def request(self, request_id: int, query: str, max_jobs: int, stream: bool = False):
+        """
+        Generator: yields ("job", (index, job)) frames while streaming,
+        then ("result", jobs) once the worker is done.
+        """
+        write_frame(self.process.stdin, {
+            "type": "scout",
+            "id": request_id,
+            "query": query,
+            "max_jobs": max_jobs,
+            "stream": stream
+        })
+
+        while True:
+            frame = read_frame(self.process.stdout)
+
+            if frame is None:
+                raise RuntimeError("Scout worker exited mid-request.")
+
+            if frame.get("id") != request_id:
+                continue
+
+            if frame["type"] == "error":
+                raise RuntimeError(frame["error"])
+
+            if frame["type"] == "job":
+                yield "job", (frame["index"], frame["job"])
+                continue
+
+            yield "result", frame["jobs"]
+            return
+
+    def close(self):
+        if not self.alive():
+            return
+
+        try:
+            write_frame(self.process.stdin, {"type": "shutdown"})
+            self.process.stdin.close()
+            self.process.wait(timeout=10)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+
+
+def _close_frames(frames, future):
+    if not future.cancelled():
+        # Retrieved so a failed read isn't logged as never retrieved
+        future.exception()
+    frames.close()
+
+
+class ScoutWorkerPool:
+
+    def __init__(self, size: int = SCOUT_POOL_SIZE):
+        self.size = size
+        self._idle = queue.Queue()
+        self._workers = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._workers) < self.size:
+                worker = ScoutWorker()
+                self._workers.append(worker)
+                return worker
+
+        return self._idle.get()
+
+    def _replace(self, worker):
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.close()
+
+    def _frames(self, query: str, max_jobs: int, stream: bool):
+        worker = self._checkout()
+        jobs = None
+
+        try:
+            for kind, payload in worker.request(next(self._ids), query, max_jobs, stream):
+                if kind == "result":
+                    jobs = payload
+                    break
+                yield kind, payload
+        except RuntimeError:
+            if not worker.alive():
+                self._replace(worker)
+            else:
+                self._idle.put(worker)
+            raise
+        except BaseException:
+            # Broken pipe, abandoned mid-stream etc. — worker state unknown, drop it
+            self._replace(worker)
+            raise
+
+        # Back in the pool before the caller sees the result, so a
+        # caller that stops iterating here doesn't discard the worker
+        self._idle.put(worker)
+        yield "result", jobs
+
+    def run(self, query: str, max_jobs: int = 3):
+        for kind, payload in self._frames(query, max_jobs, stream=False):
+            if kind == "result":
+                return payload
+
+    async def astream(self, query: str, max_jobs: int = 3):
+        frames = self._frames(query, max_jobs, stream=True)
+        done = object()
+
+        # Started by hand: a span entered here would stay "current" for
+        # the consumer between yields
+        s = span("scout.worker_request")
+        jobs = 0
+        pending = None
+
+        try:
+            while True:
+                # Blocking pipe reads stay off the event loop; shielded so a
+                # cancelled caller can still tell when the read has finished
+                pending = asyncio.ensure_future(asyncio.to_thread(next, frames, done))
+                frame = await asyncio.shield(pending)
+                if frame is done:
+                    return
+
+                kind, payload = frame
+                if kind == "job":
+                    if not jobs:
+                        s.set(first_job_ms=s.elapsed_ms())
+                    jobs += 1
+                    yield payload
+        finally:
+            s.set(jobs=jobs)
+            s.end()
+
+            if pending is not None and not pending.done():
+                # Cancelled mid-read: the generator is running in the worker
+                # thread and can't be closed from here. Close it once the read
+                # returns; _frames then drops the worker, whose state is unknown
+                pending.add_done_callback(lambda future: _close_frames(frames, future))
+            else:
+                frames.close()
+
+    def close(self):
+        with self._lock:
+            workers, self._workers = self._workers, []
+
+        for worker in workers:
+            worker.close()
+
+
+# -----------------------------------------
+# BACKEND SELECTION
+# -----------------------------------------
+_BACKENDS = {
+    "subprocess": SubprocessScout,
+    "inprocess": InProcessScout,
+    "pool": ScoutWorkerPool,
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_scout_backend(mode: str = None):
+    mode = mode or SCOUT_MODE
+
+    if mode not in _BACKENDS:
+        raise ValueError(f"Unknown SCOUT_MODE: {mode}")
+
+    with _instances_lock:
+        if mode not in _instances:
+            _instances[mode] = _BACKENDS[mode]()
+        return _instances[mode]
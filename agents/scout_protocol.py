@@ -0,0 +1,26 @@
+import json
+
+# Every frame is one line: PREFIX + compact JSON.
+# The prefix lets both sides skip stray log lines that
+# browser_use (or chromium) write to the same stream.
+FRAME_PREFIX = "@@SCOUT@@ "
+
+
+def write_frame(stream, payload: dict):
+    stream.write(FRAME_PREFIX + json.dumps(payload, separators=(",", ":")) + "\n")
+    stream.flush()
+
+
+def read_frame(stream):
+    """
+    Read lines until a frame arrives.
+    Returns None on EOF.
+    """
+    while True:
+        line = stream.readline()
+
+        if not line:
+            return None
+
+        if line.startswith(FRAME_PREFIX):
+            return json.loads(line[len(FRAME_PREFIX):])
@@ -0,0 +1,22 @@
+from config import SCOUT_SOURCES
+from agents.sources.base import JobSource, to_job
+from agents.sources.internshala import InternshalaSource
+from agents.sources.greenhouse import GreenhouseSource
+
+SOURCES = {
+    InternshalaSource.name: InternshalaSource,
+    GreenhouseSource.name: GreenhouseSource,
+}
+
+
+def get_sources(names: list = None):
+    """
+    One instance of every configured source (SCOUT_SOURCES).
+    """
+    names = SCOUT_SOURCES if names is None else names
+
+    unknown = [name for name in names if name not in SOURCES]
+    if unknown:
+        raise ValueError(f"Unknown job source(s): {', '.join(unknown)}")
+
+    return [SOURCES[name]() for name in names]
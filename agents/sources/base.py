@@ -0,0 +1,47 @@
+from agents.scout import iter_listing_details
+from config import SCOUT_CONCURRENCY, SCOUT_LISTING_TIMEOUT
+
+
+def to_job(detail: dict, link: dict):
+    """
+    The common job shape every source produces.
+    """
+    return {
+        "title": str(detail.get("title") or link.get("title") or "").strip(),
+        "company": str(detail.get("company") or link.get("company") or "").strip(),
+        "description": str(detail.get("description") or "").strip(),
+        "source_url": link["source_url"],
+    }
+
+
+class JobSource:
+    """
+    One job board. A source implements search() (result links, in
+    board order) and listing() (one link -> job); stream() fetches the
+    listings concurrently. Sources with their own flow override stream().
+
+    Links are dicts with at least "source_url"; jobs are
+    {title, company, description, source_url}.
+    """
+
+    name = ""
+
+    async def search(self, search_keyword: str, max_jobs: int, **options):
+        raise NotImplementedError
+
+    async def listing(self, link: dict, **options):
+        raise NotImplementedError
+
+    async def stream(self, search_keyword: str, max_jobs: int, concurrency: int = SCOUT_CONCURRENCY,
+                     listing_timeout: float = SCOUT_LISTING_TIMEOUT, **options):
+        """
+        Yields (result_index, job) as listings complete.
+        """
+        links = await self.search(search_keyword, max_jobs, **options)
+        links = [link for link in links if isinstance(link, dict) and link.get("source_url")]
+
+        async def fetch_detail(link):
+            return await self.listing(link, **options)
+
+        async for pair in iter_listing_details(links[:max_jobs], fetch_detail, concurrency, listing_timeout):
+            yield pair
@@ -0,0 +1,85 @@
+import re
+import sys
+import html
+import asyncio
+
+from agents.internshala import parse_html
+from agents.sources.base import JobSource, to_job
+from config import GREENHOUSE_BOARDS, GREENHOUSE_API_URL
+from core.http_pool import fetch_json
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def matches(title: str, search_keyword: str):
+    """
+    Every keyword word appears in the title ("Machine Learning" matches
+    "Machine Learning Engineer Intern").
+    """
+    words = set(_WORD_RE.findall(title.lower()))
+    return all(word in words for word in _WORD_RE.findall(search_keyword.lower()))
+
+
+class GreenhouseSource(JobSource):
+    """
+    Public Greenhouse job-board API (one board per company). The
+    listing text comes with the search response, so listing() does
+    no further request.
+    """
+
+    name = "greenhouse"
+
+    def __init__(self, boards: list = GREENHOUSE_BOARDS, api_url: str = GREENHOUSE_API_URL):
+        self.boards = boards
+        self.api_url = api_url.rstrip("/")
+
+    async def board_links(self, board: str, search_keyword: str):
+        info, listing = await asyncio.gather(
+            fetch_json(f"{self.api_url}/v1/boards/{board}"),
+            fetch_json(f"{self.api_url}/v1/boards/{board}/jobs?content=true")
+        )
+
+        return [
+            {
+                "title": job.get("title", ""),
+                "company": info.get("name") or board,
+                "source_url": job["absolute_url"],
+                "content": job.get("content", ""),
+            }
+            for job in listing.get("jobs", [])
+            if job.get("absolute_url") and matches(job.get("title", ""), search_keyword)
+        ]
+
+    async def search(self, search_keyword: str, max_jobs: int, **options):
+        """
+        A board that fails (bad token, timeout) is skipped; the source
+        only fails when every board does.
+        """
+        results = await asyncio.gather(
+            *(self.board_links(board, search_keyword) for board in self.boards),
+            return_exceptions=True
+        )
+
+        per_board = []
+        errors = []
+        for board, result in zip(self.boards, results):
+            if isinstance(result, BaseException):
+                print(f"⚠ Greenhouse board failed: {board}: {result}", file=sys.stderr)
+                errors.append(result)
+            else:
+                per_board.append(result)
+
+        if errors and not per_board:
+            raise errors[0]
+
+        # Round-robin across boards so one big board doesn't crowd out the rest
+        links = []
+        for rank in range(max(map(len, per_board), default=0)):
+            links += [board[rank] for board in per_board if rank < len(board)]
+
+        return links[:max_jobs]
+
+    async def listing(self, link: dict, **options):
+        # `content` is HTML, escaped once more inside the JSON
+        description = parse_html(html.unescape(link.get("content", ""))).text("\n")
+        return to_job({"description": description}, link)
@@ -0,0 +1,94 @@
+import sys
+
+import httpx
+
+from agents.internshala import ParseError, fetch_listing, fetch_listing_links
+from agents.scout import collect_listing_links, extract_listing, iter_listing_details
+from agents.sources.base import JobSource
+from config import INTERNSHALA_BASE_URL, SCOUT_CONCURRENCY, SCOUT_LISTING_TIMEOUT, SCOUT_HTTP_FAST_PATH
+from core.tracing import span
+
+SEARCH_STEPS = """
+POPUP HANDLING:
+After clicking "Internships":
+- Immediately close sign-up popup if visible.
+- Do NOT read it.
+- Do NOT scroll before closing.
+
+SEARCH RULES:
+1. Open {site_url}
+2. Click "Internships"
+3. Close popup
+4. Use ONLY main keyword search bar
+5. Type EXACTLY "{search_keyword}"
+6. Press Enter
+7. Do NOT use filters
+8. Take the first {max_jobs} relevant internships only
+"""
+
+
+class InternshalaSource(JobSource):
+    """
+    Plain HTTP + HTML parsing (agents/internshala.py) first; the
+    browser agent when a page can't be fetched or its markup is not
+    recognised.
+    """
+
+    name = "internshala"
+
+    def __init__(self, base_url: str = INTERNSHALA_BASE_URL):
+        self.base_url = base_url
+
+    async def find_links(self, search_keyword: str, max_jobs: int, browser_session=None, agent_factory=None,
+                         http_first: bool = SCOUT_HTTP_FAST_PATH):
+        """
+        Returns (links, via_http).
+        """
+        if http_first:
+            try:
+                with span("scout.http_search") as s:
+                    links = await fetch_listing_links(search_keyword, max_jobs, self.base_url)
+                    s.set(links=len(links))
+                    return links, True
+            except (httpx.HTTPError, ParseError) as e:
+                print(f"⚠ HTTP search failed, using browser agent: {e}", file=sys.stderr)
+
+        links = await collect_listing_links(
+            search_keyword,
+            max_jobs,
+            browser_session,
+            agent_factory,
+            site_name="Internshala",
+            search_steps=SEARCH_STEPS.format(
+                site_url=self.base_url, search_keyword=search_keyword, max_jobs=max_jobs
+            )
+        )
+        return links, False
+
+    async def search(self, search_keyword: str, max_jobs: int, **options):
+        links, _ = await self.find_links(search_keyword, max_jobs, **options)
+        return links
+
+    async def listing(self, link: dict, browser_session=None, agent_factory=None,
+                      http_first: bool = SCOUT_HTTP_FAST_PATH):
+        if http_first:
+            try:
+                with span("scout.http_listing"):
+                    return await fetch_listing(link)
+            except (httpx.HTTPError, ParseError) as e:
+                print(f"⚠ HTTP listing fetch failed, using browser agent: {e}", file=sys.stderr)
+
+        return await extract_listing(link, browser_session, agent_factory)
+
+    async def stream(self, search_keyword: str, max_jobs: int, concurrency: int = SCOUT_CONCURRENCY,
+                     listing_timeout: float = SCOUT_LISTING_TIMEOUT, browser_session=None, agent_factory=None,
+                     http_first: bool = SCOUT_HTTP_FAST_PATH):
+        links, via_http = await self.find_links(search_keyword, max_jobs, browser_session, agent_factory, http_first)
+        links = [link for link in links if isinstance(link, dict) and link.get("source_url")]
+
+        async def fetch_detail(link):
+            # Search page blocked or unrecognised: the listing pages will be too
+            return await self.listing(link, browser_session, agent_factory, http_first=via_http)
+
+        async for pair in iter_listing_details(links, fetch_detail, concurrency, listing_timeout):
+            yield pair
@@ -1,34 +1,36 @@
-from openai import OpenAI
-from pathlib import Path
-from dotenv import load_dotenv
+import sys
+import asyncio
 import json
 
-load_dotenv()
+from config import PROMPT_RESUME_SHARE, TAILOR_CONCURRENCY, TAILOR_PROMPT_TOKEN_BUDGET
+from core.json_extract import extract_json
+from core.limits import stage_slot
+from core.llm_cache import get_llm_cache
+from core.llm_gateway import get_llm_gateway
+from core.prompting import PromptTemplate, fit_to_budget, get_resume_store
+from core.tracing import span, payload_bytes, usage_attributes
 
-client = OpenAI()
+MODEL = "gpt-4o"
+TEMPERATURE = 0.3
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-DATA_DIR = BASE_DIR / "data"
+# Top-level keys of the tailored package, in prompt order
+SECTIONS = (
+    "skill_gap_analysis",
+    "cold_email",
+    "tailored_summary",
+    "skill_emphasis_suggestions",
+)
 
-RESUME_PATH = DATA_DIR / "master_resume.md"
 
+def load_resume():
+    return get_resume_store().text()
 
-def tailor_application(job: dict, user_query: str):
-    """
-    job = {
-        "title": "...",
-        "company": "...",
-        "description": "...",
-        "source_url": "..."
-    }
-    """
-
-    if not RESUME_PATH.exists():
-        raise FileNotFoundError("master_resume.md not found in data folder.")
-
-    resume_text = RESUME_PATH.read_text(encoding="utf-8")
 
-    prompt = f"""
+# Stable parts first (see PromptTemplate): every tailoring call for a
+# resume shares the prefix up to the search query
+PROMPT = PromptTemplate(
+    system="You are a precise structured-output generator.",
+    static="""
 You are an AI Career Strategy Assistant.
 
 Your job is to analyze:
@@ -43,24 +45,6 @@ DO NOT fabricate experience.
 DO NOT invent skills not mentioned in resume.
 You may identify missing skills separately.
 
-----------------------------------------
-USER SEARCH QUERY:
-{user_query}
-
-----------------------------------------
-JOB TITLE:
-{job['title']}
-
-COMPANY:
-{job['company']}
-
-JOB DESCRIPTION:
-{job['description']}
-
-----------------------------------------
-CANDIDATE RESUME:
-{resume_text}
-
 ----------------------------------------
 
 OUTPUT REQUIREMENTS:
@@ -69,24 +53,24 @@ Return ONLY valid JSON.
 
 Format:
 
-{{
-  "skill_gap_analysis": {{
+{
+  "skill_gap_analysis": {
       "missing_skills": [],
-      "priority_levels": {{
+      "priority_levels": {
           "high": [],
           "medium": [],
           "low": []
-      }},
+      },
       "learning_recommendations": []
-  }},
-  "cold_email": {{ 
+  },
+  "cold_email": { 
     "subject": "",
     "body": ""
-   }},
+   },
 
   "tailored_summary": "",
   "skill_emphasis_suggestions": []
-}}
+}
 
 INSTRUCTIONS:
 
@@ -116,46 +100,297 @@ INSTRUCTIONS:
 4. Skill Emphasis Suggestions:
    - List which existing resume skills should be highlighted.
    - No new invented skills.
+""",
+    resume="""
+----------------------------------------
+CANDIDATE RESUME:
+{resume_text}
+""",
+    request="""
+----------------------------------------
+USER SEARCH QUERY:
+{user_query}
+
+----------------------------------------
+JOB TITLE:
+{title}
+
+COMPANY:
+{company}
+
+JOB DESCRIPTION:
+{description}
+
+----------------------------------------
 
 Return JSON only.
 """
+)
+
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "You are a precise structured-output generator."},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.3
+def build_prompt(job: dict, user_query: str, resume_text: str):
+    return PROMPT.render(
+        resume_text,
+        user_query=user_query,
+        title=job['title'],
+        company=job['company'],
+        description=job['description']
     )
 
-    raw_output = response.choices[0].message.content.strip()
 
-# Remove markdown fences if present
-    if raw_output.startswith("```"):
-       raw_output = raw_output.strip("```")
-       raw_output = raw_output.replace("json", "").strip()
+def build_messages(job: dict, user_query: str, resume_text: str):
+    """
+    Prompt with resume + description compacted to TAILOR_PROMPT_TOKEN_BUDGET.
+    """
+    fixed_text = build_prompt({**job, "description": ""}, user_query, "")
+
+    resume_text, [description], _ = fit_to_budget(
+        fixed_text,
+        resume_text,
+        [job.get("description", "")],
+        TAILOR_PROMPT_TOKEN_BUDGET,
+        label="tailor",
+        resume_share=PROMPT_RESUME_SHARE
+    )
 
-# Try extracting JSON block manually
-    import re
-    match = re.search(r"\{.*\}", raw_output, re.DOTALL)
+    return PROMPT.messages(
+        resume_text,
+        user_query=user_query,
+        title=job['title'],
+        company=job['company'],
+        description=description
+    )
 
-    if not match:
-       raise RuntimeError("No JSON object found in LLM output.")
 
-    json_text = match.group(0)
+def parse_tailor_output(raw_output: str):
+    result = extract_json(raw_output, dict)
 
-    try:
-       result = json.loads(json_text)
-    except json.JSONDecodeError as e:
-       print("⚠ Raw LLM Output:\n")
-       print(raw_output)
-       raise RuntimeError("Tailor LLM returned malformed JSON.")
+    if result is None:
+        print("⚠ Raw LLM Output:\n", file=sys.stderr)
+        print(raw_output, file=sys.stderr)
+        raise RuntimeError("No JSON object found in LLM output.")
 
     return result
 
 
-    
+def tailor_application(job: dict, user_query: str):
+    """
+    job = {
+        "title": "...",
+        "company": "...",
+        "description": "...",
+        "source_url": "..."
+    }
+    """
+
+    resume_text = load_resume()
+
+    return get_llm_cache().complete(
+        get_llm_gateway(),
+        model=MODEL,
+        messages=build_messages(job, user_query, resume_text),
+        temperature=TEMPERATURE,
+        resume_text=resume_text,
+        label="tailor",
+        parse=parse_tailor_output
+    )
+
+
+# -----------------------------------------
+# ASYNC (several jobs at once)
+# -----------------------------------------
+async def atailor_application(job: dict, user_query: str, resume_text: str = None):
+    resume_text = resume_text or load_resume()
+
+    async with stage_slot("tailor"):
+        return await get_llm_cache().acomplete(
+            get_llm_gateway(),
+            model=MODEL,
+            messages=build_messages(job, user_query, resume_text),
+            temperature=TEMPERATURE,
+            resume_text=resume_text,
+            label="tailor",
+            parse=parse_tailor_output
+        )
+
+
+async def atailor_many(jobs: list, user_query: str, concurrency: int = TAILOR_CONCURRENCY):
+    """
+    Tailors every job concurrently (at most `concurrency` in flight).
+    Returns one result per job, in order: the package dict, or the
+    exception that job raised.
+    """
+    resume_text = load_resume()
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def tailor_one(job):
+        async with semaphore:
+            return await atailor_application(job, user_query, resume_text)
+
+    return await asyncio.gather(
+        *(tailor_one(job) for job in jobs),
+        return_exceptions=True
+    )
+
+
+# -----------------------------------------
+# STREAMING
+# -----------------------------------------
+class SectionStreamParser:
+    """
+    Incremental parser for a streamed top-level JSON object.
+
+    feed() returns every top-level member that closed inside the
+    new chunk as (key, value). Anything before the opening brace
+    (e.g. a ```json fence) is skipped.
+    """
+
+    def __init__(self):
+        self.buffer = []
+        self.started = False
+        self.finished = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+
+    def _flush_member(self):
+        member = "".join(self.buffer).strip()
+        self.buffer = []
+
+        if not member:
+            return None
+
+        try:
+            # strict=False: models leave raw newlines / tabs in long strings
+            parsed = json.loads("{" + member + "}", strict=False)
+        except json.JSONDecodeError:
+            return None
+
+        return next(iter(parsed.items()), None)
+
+    def feed(self, chunk: str):
+        sections = []
+
+        for ch in chunk:
+            if self.finished:
+                break
+
+            if not self.started:
+                if ch == "{":
+                    self.started = True
+                    self.depth = 1
+                continue
+
+            if self.in_string:
+                self.buffer.append(ch)
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                continue
+
+            if ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+
+            if self.depth == 0:
+                # closing brace of the whole object
+                self.finished = True
+                section = self._flush_member()
+                if section:
+                    sections.append(section)
+                break
+
+            if self.depth == 1 and ch == ",":
+                section = self._flush_member()
+                if section:
+                    sections.append(section)
+                continue
+
+            self.buffer.append(ch)
+
+        return sections
+
+
+def stream_tailor_application(job: dict, user_query: str):
+    """
+    Yields (section_name, value) as each top-level section of the
+    tailored package closes in the completion stream.
+    """
+
+    resume_text = load_resume()
+    messages = build_messages(job, user_query, resume_text)
+
+    cache = get_llm_cache()
+    key = cache.key(MODEL, TEMPERATURE, messages, resume_text)
+    cached = cache.lookup(key)
+
+    # Not entered as a context: this generator yields to the caller mid-span
+    s = span("llm.tailor_stream", model=MODEL, prompt_bytes=payload_bytes(messages))
+
+    if cached is not None:
+        try:
+            package = parse_tailor_output(cached)
+        except RuntimeError:
+            # Stored before it was checked: drop it, stream a fresh one
+            cache.invalidate(key)
+        else:
+            s.set(cache_hit=True, completion_bytes=payload_bytes(cached))
+            s.end()
+            yield from package.items()
+            return
+
+    try:
+        stream = get_llm_gateway().stream(
+            model=MODEL,
+            messages=messages,
+            temperature=TEMPERATURE,
+            stream_options={"include_usage": True}
+        )
+
+        parser = SectionStreamParser()
+        parts = []
+        seen = set()
+
+        for event in stream:
+            if getattr(event, "usage", None) is not None:
+                s.set(**usage_attributes(event.usage))
+
+            if not event.choices:
+                continue
+
+            delta = event.choices[0].delta.content
+            if not delta:
+                continue
+
+            parts.append(delta)
+
+            for name, value in parser.feed(delta):
+                if not seen:
+                    s.set(first_section_ms=s.elapsed_ms())
+                seen.add(name)
+                yield name, value
+
+        raw_output = "".join(parts)
+        s.set(cache_hit=False, completion_bytes=payload_bytes(raw_output))
+
+        # Stream did not parse cleanly (or a section failed to) -> fall back to the whole-output parser
+        if not parser.finished or not seen.issuperset(SECTIONS):
+            for name, value in parse_tailor_output(raw_output).items():
+                if name in SECTIONS and name not in seen:
+                    yield name, value
+    except Exception as e:
+        s.end(f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        s.end()
+
+    cache.save(key, raw_output)
 
 
 # Optional standalone test
@@ -1,16 +1,16 @@
-import sys
-import asyncio
-
-# 🔥 Fix Windows subprocess issue for browser_use
-if sys.platform.startswith("win"):
-    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-
-import nest_asyncio
-nest_asyncio.apply()
-
-import streamlit as st
-from pipeline import run_agent
+import json
 import time
+import streamlit as st
+from config import UI_POLL_INTERVAL
+from run_pool import RunPool
+from core.loop import get_loop
+from core.prompting import prompt_stats
+from core.startup import allow_nested_loops, init, preload
+from core.tracing import get_trace, summarize, to_jsonl, to_otlp
+
+# Once per process: Streamlit re-executes this script on every rerun
+init()
+allow_nested_loops()
 
 # ==========================================
 # PAGE CONFIGURATION
@@ -22,6 +22,34 @@ st.set_page_config(
     menu_items=None
 )
 
+# ==========================================
+# SHARED RESOURCES (built once per process, not per rerun / session)
+# ==========================================
+@st.cache_resource
+def run_pool():
+    return RunPool()
+
+
+@st.cache_resource
+def warm_resources():
+    # Shared loop, Scout backend and caches; the first run doesn't pay for them
+    from agents.scout_pool import get_scout_backend
+    from core.checkpoints import get_checkpoint_store
+    from core.job_cache import get_job_cache
+    from core.llm_cache import get_llm_cache
+
+    get_loop()
+    get_scout_backend()
+    get_job_cache()
+    get_llm_cache()
+    get_checkpoint_store()
+    # The LLM client and numpy load in the background while the page renders
+    preload("openai", "tiktoken", "numpy")
+    return True
+
+
+warm_resources()
+
 # ==========================================
 # SESSION STATE
 # ==========================================
@@ -31,6 +59,10 @@ if "result_data" not in st.session_state:
 if "loading" not in st.session_state:
     st.session_state.loading = False
 
+# RunHandle of the run this session is waiting on (see run_pool.py)
+if "run_handle" not in st.session_state:
+    st.session_state.run_handle = None
+
 # ==========================================
 # CUSTOM CSS
 # ==========================================
@@ -192,45 +224,13 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ==========================================
-# INPUT
+# RENDERERS (one card per tailored section)
 # ==========================================
-query = st.text_input(
-    "",
-    placeholder="e.g., Machine Learning Intern, Data Science Intern...",
-    label_visibility="collapsed"
-)
-
-if st.button("🚀 Start Agent", use_container_width=True):
-
-    if not query.strip():
-        st.warning("Please enter a role.")
-    else:
-        st.session_state.loading = True
-        with st.spinner("🔍 Agent is scouting internships..."):
-            time.sleep(0.5)
-            result = run_agent(query)
-            st.session_state.result_data = result
-        st.session_state.loading = False
-
-# ==========================================
-# RENDER RESULTS
-# ==========================================
-if st.session_state.result_data:
-
-    result = st.session_state.result_data
-    best = result["best_match"]
-    package = result["tailored_package"]
-    alternatives = result.get("alternatives", [])
-
-    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
-
-    # ==========================================
-    # SKILL GAP
-    # ==========================================
+def render_skill_gap(skill_gap):
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown('<div class="section-header">🔥 Skill Gap Analysis</div>', unsafe_allow_html=True)
 
-    priorities = package["skill_gap_analysis"]["priority_levels"]
+    priorities = skill_gap["priority_levels"]
 
     for level, label, css in [
         ("high", "🔴 High Priority", "priority-high"),
@@ -242,14 +242,13 @@ if st.session_state.result_data:
 
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # ==========================================
-    # COLD EMAIL
-    # ==========================================
+
+def render_cold_email(cold_email, key="copy_email"):
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown('<div class="section-header">✉ Cold Email</div>', unsafe_allow_html=True)
 
-    email_subject = package['cold_email']['subject']
-    email_body = package['cold_email']['body']
+    email_subject = cold_email['subject']
+    email_body = cold_email['body']
     full_email = f"Subject: {email_subject}\n\n{email_body}"
 
     st.markdown(f"""
@@ -262,23 +261,20 @@ if st.session_state.result_data:
     # Real copy button
     st.code(full_email, language="text")
 
-    if st.button("📋 Copy Email"):
-     st.success("Email ready to copy above 👆")
+    if st.button("📋 Copy Email", key=key):
+        st.success("Email ready to copy above 👆")
 
+    st.markdown('</div>', unsafe_allow_html=True)
 
-    st.markdown('</div>', unsafe_allow_html=True)   
 
-    # ==========================================
-    # SUMMARY
-    # ==========================================
+def render_summary(tailored_summary):
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown('<div class="section-header">📝 Tailored Resume Summary</div>', unsafe_allow_html=True)
-    st.markdown(f'<div class="summary-block">{package["tailored_summary"]}</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="summary-block">{tailored_summary}</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # ==========================================
-    # BEST MATCH
-    # ==========================================
+
+def render_best_match(best):
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown('<div class="section-header">🏆 Best Internship Match</div>', unsafe_allow_html=True)
 
@@ -300,9 +296,8 @@ if st.session_state.result_data:
 
     st.markdown('</div>', unsafe_allow_html=True)
 
-    # ==========================================
-    # ALTERNATIVES
-    # ==========================================
+
+def render_alternatives(alternatives):
     if alternatives:
         with st.expander("🔍 Alternative Opportunities"):
             for idx, alt in enumerate(alternatives, 1):
@@ -315,3 +310,248 @@ if st.session_state.result_data:
                     </a>
                 </div>
                 """, unsafe_allow_html=True)
+
+                # Tailored alongside the best match (see TAILOR_TOP_N)
+                package = alt.get("tailored_package")
+                if package:
+                    render_summary(package["tailored_summary"])
+                    render_cold_email(package["cold_email"], key=f"copy_email_alt_{idx}")
+                elif alt.get("tailor_error"):
+                    st.caption(f"⚠ Could not tailor this one: {alt['tailor_error']}")
+
+
+def span_rows(spans):
+    """
+    One table row per span, indented under its parent, in start order.
+    """
+    by_id = {item["span_id"]: item for item in spans}
+    origin = min(item["start_time"] for item in spans)
+
+    def depth(item):
+        level = 0
+        while item["parent_id"] in by_id:
+            item = by_id[item["parent_id"]]
+            level += 1
+        return level
+
+    return [
+        {
+            "span": " " * depth(item) + item["name"],
+            "start (ms)": round((item["start_time"] - origin) * 1000),
+            "duration (ms)": round(item["duration_ms"]),
+            "tokens in/out": (
+                f"{item['attributes'].get('prompt_tokens', '')}/{item['attributes'].get('completion_tokens', '')}"
+                if "prompt_tokens" in item["attributes"] else ""
+            ),
+            "details": ", ".join(
+                f"{key}={value}" for key, value in item["attributes"].items()
+                if key not in ("prompt_tokens", "completion_tokens", "query")
+            ),
+            "error": item["error"] or "",
+        }
+        for item in spans
+    ]
+
+
+def render_performance(trace_id):
+    spans = get_trace(trace_id) if trace_id else []
+    if not spans:
+        return
+
+    summary = summarize(spans)
+
+    with st.expander("⚡ Performance"):
+        cols = st.columns(4)
+        cols[0].metric("Total", f"{summary['total_ms'] / 1000:.1f}s")
+        cols[1].metric("LLM calls", summary["llm_calls"], help=f"{summary['llm_cache_hits']} served from cache")
+        cols[2].metric("Prompt tokens", summary["prompt_tokens"], help=f"{summary['cached_tokens']} cached by the provider")
+        cols[3].metric("Completion tokens", summary["completion_tokens"])
+
+        if summary["prompt_saved_tokens"]:
+            compaction = prompt_stats.snapshot()
+            st.caption(
+                f"Prompt compaction: {summary['prompt_saved_tokens']} token(s) trimmed in this run, "
+                f"{compaction['saved_tokens']} across {compaction['calls']} prompt(s) since startup."
+            )
+        if summary["duplicates_removed"]:
+            st.caption(f"{summary['duplicates_removed']} duplicate listing(s) removed before ranking.")
+        if summary["score_index_hits"]:
+            st.caption(f"{summary['score_index_hits']} listing(s) reused earlier scores instead of calling the Analyst.")
+        if summary["cascade_rescored"]:
+            st.caption(
+                f"Model cascade: {summary['cascade_rescored']} job(s) re-scored by the strong model, "
+                f"{summary['cascade_agreement']:.0%} agreement with the first pass."
+            )
+        if summary["prefix_cache_hits"]:
+            st.caption(
+                f"Prompt cache: {summary['prefix_cache_hit_rate']:.0%} of prompt tokens served from the provider's "
+                f"prefix cache ({summary['prefix_cache_hits']} call(s)), about "
+                f"{summary['prefix_cache_saved_ms'] / 1000:.1f}s saved."
+            )
+        if summary["llm_retries"] or summary["llm_queue_wait_ms"] >= 1000:
+            st.caption(
+                f"LLM rate limits: {summary['llm_retries']} retried call(s), "
+                f"{summary['llm_queue_wait_ms'] / 1000:.1f}s queued for a slot or budget."
+            )
+
+        st.dataframe(span_rows(spans), use_container_width=True, hide_index=True)
+
+        left, right = st.columns(2)
+        left.download_button(
+            "Download spans (JSONL)",
+            to_jsonl(spans),
+            file_name=f"trace-{trace_id}.jsonl",
+            key=f"trace_jsonl_{trace_id}"
+        )
+        right.download_button(
+            "Download OpenTelemetry (OTLP JSON)",
+            json.dumps(to_otlp(spans)),
+            file_name=f"trace-{trace_id}.otlp.json",
+            key=f"trace_otlp_{trace_id}"
+        )
+
+
+STAGE_PROGRESS = {
+    "queued": (0.02, "⏳ Waiting for a free worker..."),
+    "scout": (0.15, "🔍 Agent is scouting internships..."),
+    "analyst": (0.45, "🧮 Scoring matches against your resume..."),
+    "tailor": (0.75, "✍ Tailoring your application..."),
+    "done": (1.0, "✅ Done"),
+}
+
+
+def render_progress(snapshot):
+    fraction, label = STAGE_PROGRESS.get(snapshot["stage"], STAGE_PROGRESS["queued"])
+    counts = snapshot["counts"]
+
+    if snapshot["stage"] == "scout" and counts.get("jobs"):
+        label += f" {counts['jobs']} found"
+    elif snapshot["stage"] == "analyst" and counts.get("jobs"):
+        label += f" {counts.get('scored', 0)}/{counts['jobs']} scored"
+        fraction += 0.3 * counts.get("scored", 0) / counts["jobs"]
+    elif snapshot["stage"] == "tailor":
+        label += f" {len(snapshot['sections'])}/{len(SECTION_RENDERERS)} sections"
+        fraction += 0.25 * len(snapshot["sections"]) / len(SECTION_RENDERERS)
+
+    st.progress(min(fraction, 1.0), text=f"{label} ({snapshot['elapsed']:.0f}s)")
+
+    if snapshot["subscribers"] > 1:
+        st.caption(f"Sharing this run with {snapshot['subscribers'] - 1} other request(s) for the same query.")
+
+
+SECTION_RENDERERS = {
+    "skill_gap_analysis": render_skill_gap,
+    "cold_email": render_cold_email,
+    "tailored_summary": render_summary,
+}
+
+
+def create_slots():
+    """
+    Empty containers in display order, filled as sections arrive.
+    """
+    st.markdown('<div class="divider"></div>', unsafe_allow_html=True)
+    slots = {name: st.empty() for name in SECTION_RENDERERS}
+    slots["best_match"] = st.empty()
+    slots["alternatives"] = st.empty()
+    return slots
+
+
+def fill_slot(slots, name, value):
+    if name in SECTION_RENDERERS:
+        with slots[name].container():
+            SECTION_RENDERERS[name](value)
+
+
+# ==========================================
+# INPUT
+# ==========================================
+query = st.text_input(
+    "",
+    placeholder="e.g., Machine Learning Intern, Data Science Intern...",
+    label_visibility="collapsed"
+)
+
+refresh = st.checkbox("Force fresh scrape (ignore cached listings)")
+
+with st.expander("♻ Resume a previous run"):
+    resume_run_id = st.text_input(
+        "Run ID",
+        value=st.session_state.get("failed_run_id", ""),
+        help="Continues from the last completed stage; the run's original query is used."
+    ).strip()
+
+rendered_live = False
+
+if st.button("🚀 Start Agent", use_container_width=True):
+
+    if not query.strip() and not resume_run_id:
+        st.warning("Please enter a role.")
+    else:
+        # Runs on the shared pool; identical queries in flight share one run
+        st.session_state.run_handle = run_pool().submit(
+            query or None, refresh=refresh, run_id=resume_run_id or None
+        )
+        st.session_state.loading = True
+
+handle = st.session_state.run_handle
+
+if handle is not None:
+    snapshot = handle.snapshot()
+
+    if snapshot["status"] == "failed":
+        st.session_state.run_handle = None
+        st.session_state.loading = False
+        if snapshot["run_id"]:
+            st.session_state.failed_run_id = snapshot["run_id"]
+            st.error(f"Run {snapshot['run_id']} failed: {snapshot['error']}. Resume it from the panel above.")
+        else:
+            st.error(f"Run failed: {snapshot['error']}")
+
+    else:
+        if snapshot["status"] != "done":
+            render_progress(snapshot)
+
+        if snapshot["ranked"] is not None:
+            slots = create_slots()
+
+            # Each card appears as soon as its JSON section closes
+            for name, value in snapshot["sections"].items():
+                fill_slot(slots, name, value)
+
+            result = snapshot["result"] or snapshot["ranked"]
+            with slots["best_match"].container():
+                render_best_match(result["best_match"])
+            with slots["alternatives"].container():
+                render_alternatives(result["alternatives"])
+
+            rendered_live = True
+
+        if snapshot["status"] == "done":
+            st.session_state.result_data = snapshot["result"]
+            st.session_state.run_handle = None
+            st.session_state.loading = False
+            st.session_state.pop("failed_run_id", None)
+            render_performance(snapshot["result"].get("trace_id"))
+        else:
+            # The run keeps going on the pool between polls
+            time.sleep(UI_POLL_INTERVAL)
+            st.rerun()
+
+# ==========================================
+# RENDER RESULTS
+# ==========================================
+if st.session_state.result_data and not rendered_live:
+
+    result = st.session_state.result_data
+    slots = create_slots()
+
+    for name, value in result["tailored_package"].items():
+        fill_slot(slots, name, value)
+
+    with slots["best_match"].container():
+        render_best_match(result["best_match"])
+    with slots["alternatives"].container():
+        render_alternatives(result.get("alternatives", []))
+
+    render_performance(result.get("trace_id"))
@@ -0,0 +1,119 @@
+"""
+Analyst model cascade vs strong-model-only ranking, fully offline.
+
+    python bench/cascade_bench.py --jobs 40 --bands 5 10 15 25
+
+bench/fakes/openai scores "*mini*" models faster
+(FAKE_LLM_CHEAP_LATENCY) but off by up to FAKE_LLM_CHEAP_NOISE points.
+The strong model's scores are the reference. Each configuration ranks
+the same jobs and reports:
+
+  wall_ms            time to rank
+  strong_calls       calls to the strong model (and their prompt tokens)
+  rescored           jobs the strong model saw
+  agreement          share of re-scored jobs the tiers agreed on
+  same_leader        did both tiers pick the same leader in the band
+  same_best_match    is best_match the one the strong model alone picks
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="cascade-bench-"))
+atexit.register(shutil.rmtree, SCRATCH_DIR, True)
+
+os.environ.setdefault("AGENT_DATA_DIR", str(SCRATCH_DIR))
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+os.environ.setdefault("SCORE_INDEX_ENABLED", "0")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.2")
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+from agents.analyst import MODEL, arank_jobs  # noqa: E402
+from core.tracing import get_trace, summarize, trace  # noqa: E402
+
+QUERY = "Machine Learning Intern"
+
+RESUME = """# Jane Doe
+## Skills
+Python, PyTorch, scikit-learn, SQL, NLP, Docker
+"""
+
+ROLES = ["Machine Learning", "Data Science", "NLP Research", "Computer Vision", "Backend", "Sales", "Marketing"]
+
+
+def make_jobs(n: int):
+    return [
+        {
+            "title": f"{ROLES[i % len(ROLES)]} Intern {i}",
+            "company": f"Company {i}",
+            "description": f"{ROLES[i % len(ROLES)]} internship. Python and ML a plus. " * 4,
+            "source_url": f"https://example.com/jobs/{i}",
+        }
+        for i in range(n)
+    ]
+
+
+async def rank(name: str, jobs: list, concurrency: int, first_pass: str, band: float = 0):
+    with trace("bench.cascade") as root:
+        started = time.perf_counter()
+        ranked = await arank_jobs(jobs, QUERY, concurrency, top_k=0, first_pass=first_pass, band=band)
+        elapsed = time.perf_counter() - started
+
+    spans = get_trace(root.trace_id)
+    summary = summarize(spans)
+    strong = [item for item in spans if item["name"] == "llm.analyst" and item["attributes"].get("model") == MODEL]
+
+    return ranked, {
+        "config": name,
+        "wall_ms": round(elapsed * 1000, 1),
+        "strong_calls": len(strong),
+        "strong_prompt_tokens": sum(item["attributes"].get("prompt_tokens") or 0 for item in strong),
+        "llm_calls": summary["llm_calls"],
+        "rescored": summary["cascade_rescored"],
+        "agreement": summary["cascade_agreement"],
+        "same_leader": summary["cascade_same_leader"],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=2, help="ranking calls in flight")
+    parser.add_argument("--bands", type=float, nargs="+", default=[5, 10, 15, 25])
+    parser.add_argument("--first-pass", default="gpt-4o-mini")
+    args = parser.parse_args()
+
+    (SCRATCH_DIR / "master_resume.md").write_text(RESUME, encoding="utf-8")
+    jobs = make_jobs(args.jobs)
+
+    reference, report = await rank("strong only", jobs, args.concurrency, first_pass="")
+    best_url = reference[0]["source_url"]
+    print(json.dumps({**report, "same_best_match": True}))
+
+    configs = [(f"{args.first_pass} band={band:g}", args.first_pass, band) for band in args.bands]
+    configs.append(("local band=10", "local", 10))
+
+    for name, first_pass, band in configs:
+        ranked, report = await rank(name, jobs, args.concurrency, first_pass, band)
+        same = ranked[0]["source_url"] == best_url
+        print(json.dumps({**report, "same_best_match": same}))
+
+        # The strong model scores whatever makes the band; its pick must be the reference's
+        # whenever the reference's best is in the band
+        rescored = {job["source_url"] for job in ranked if job.get("score_tier") == "strong"}
+        assert same or best_url not in rescored, name
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""
+Job deduplication (core/dedup.py) as the posting history grows.
+
+    python bench/dedup_bench.py --sizes 1000 10000 50000
+
+Fills a scratch DedupIndex with distinct synthetic postings and, at
+each history size, times `--probes` lookups of new postings (median
+ms per lookup). The cost per job should stay flat: one URL probe plus
+one indexed query over the LSH buckets, whatever the history.
+
+At the largest size a run (DedupSession) then gets a new posting and:
+
+  - a repost of it: another URL, a word edited, a line added
+  - its link with tracking parameters (utm_*, ref, ...)
+  - its link with www. and a trailing slash
+
+and must keep the posting, drop the three duplicates and count them.
+A repost of a posting from an earlier run must be linked to it.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="dedup-bench-"))
+atexit.register(shutil.rmtree, SCRATCH_DIR, True)
+
+os.environ.setdefault("AGENT_DATA_DIR", str(SCRATCH_DIR))
+sys.path.insert(0, str(BASE_DIR))
+
+from core.dedup import DedupIndex  # noqa: E402
+
+VOCABULARY = [f"w{i}" for i in range(5000)]
+
+
+def make_posting(rng: random.Random, i: int):
+    return {
+        "title": f"Intern {i}",
+        "company": f"Company {i}",
+        "description": " ".join(rng.choices(VOCABULARY, k=80)),
+        "source_url": f"https://jobs.example.com/listing/{i}",
+    }
+
+
+def fill(index: DedupIndex, rng: random.Random, start: int, stop: int):
+    for i in range(start, stop):
+        index.resolve(make_posting(rng, i))
+
+
+def probe(index: DedupIndex, rng: random.Random, start: int, n: int):
+    """
+    Median ms to resolve `n` postings not seen before.
+    """
+    times = []
+
+    for i in range(start, start + n):
+        job = make_posting(rng, i)
+        started = time.perf_counter()
+        _, match, _ = index.resolve(job)
+        times.append((time.perf_counter() - started) * 1000)
+        assert match is None, f"distinct posting {i} matched ({match})"
+
+    return statistics.median(times)
+
+
+def repost_of(job: dict, rng: random.Random, url: str):
+    # Same listing reposted elsewhere: a word edited, a line added
+    words = job["description"].split()
+    words[rng.randrange(len(words))] = "changed"
+    return {**job, "description": " ".join(words) + " Apply now", "source_url": url}
+
+
+def check_duplicates(index: DedupIndex, rng: random.Random, old: dict, next_id: int):
+    session = index.session()
+
+    original = make_posting(rng, next_id)
+    repost = repost_of(original, rng, f"https://other.example.org/job/{next_id}")
+    tracked = {**original, "source_url": original["source_url"] + "?utm_source=newsletter&utm_medium=email&ref=home"}
+    restyled = {**original, "source_url": original["source_url"].replace("https://", "https://www.") + "/"}
+
+    kept = session.filter([original, repost, tracked, restyled])
+    report = session.report()
+
+    assert [job["source_url"] for job in kept] == [original["source_url"]], kept
+    assert report["duplicates_removed"] == 3, report
+
+    # A repost of a posting from an earlier run is linked to it
+    # (and dropped with DEDUP_DROP_SEEN=1)
+    later = index.session()
+    [linked] = later.filter([repost_of(old, rng, f"https://other.example.org/job/{next_id + 1}")])
+    assert linked.get("near_duplicate") and "first_seen_at" in linked, linked
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--probes", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = DedupIndex(path=SCRATCH_DIR / "dedup.sqlite", ttl=None)
+
+    history = 0
+    medians = []
+    old = make_posting(rng, -1)
+    index.resolve(old)
+
+    for size in sorted(args.sizes):
+        started = time.perf_counter()
+        fill(index, rng, history, size)
+        fill_s = time.perf_counter() - started
+        history = size
+
+        median_ms = probe(index, rng, 10 ** 9 + size, args.probes)
+        medians.append(median_ms)
+        print(json.dumps({"history": size, "median_lookup_ms": round(median_ms, 3), "fill_s": round(fill_s, 1)}))
+
+    # Flat: the largest history costs at most twice the smallest, plus noise
+    assert medians[-1] <= 2 * medians[0] + 0.5, f"lookup cost grew with history: {medians}"
+
+    print(json.dumps({"duplicates": check_duplicates(index, rng, old, 2 * 10 ** 9)}))
+
+
+if __name__ == "__main__":
+    main()
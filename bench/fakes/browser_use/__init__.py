@@ -0,0 +1,123 @@
+"""
+Stand-in for browser_use used by the benchmarks.
+
+Put bench/fakes on PYTHONPATH (ahead of site-packages) and
+`from browser_use import Agent` resolves here instead.
+
+Env knobs:
+    FAKE_BROWSER_USE_IMPORT_SECONDS  simulated import cost
+    FAKE_BROWSER_START_SECONDS       simulated browser launch per session
+    FAKE_AGENT_LATENCY               seconds per Agent.run()
+    FAKE_AGENT_JOBS                  jobs returned per run
+    FAKE_AGENT_DUPLICATES            how many of those repost an earlier listing
+
+`max_agents_per_session` records the most Agents ever running on one
+BrowserSession at the same time (they would share its tab).
+"""
+import os
+import re
+import json
+import time
+import asyncio
+
+time.sleep(float(os.getenv("FAKE_BROWSER_USE_IMPORT_SECONDS", "0")))
+
+BROWSER_START_SECONDS = float(os.getenv("FAKE_BROWSER_START_SECONDS", "0"))
+AGENT_LATENCY = float(os.getenv("FAKE_AGENT_LATENCY", "0.05"))
+AGENT_JOBS = int(os.getenv("FAKE_AGENT_JOBS", "3"))
+AGENT_DUPLICATES = int(os.getenv("FAKE_AGENT_DUPLICATES", "0"))
+# Same host the real Scout would browse (a fixture server in bench/http_scout_bench.py)
+SITE_URL = os.getenv("INTERNSHALA_BASE_URL", "https://internshala.com").rstrip("/")
+
+
+SKILLS = [
+    "Python", "PyTorch", "TensorFlow", "NLP", "SQL", "Docker", "Kubernetes", "pandas",
+    "scikit-learn", "computer vision", "LLMs", "FastAPI", "AWS", "Spark", "statistics",
+]
+
+
+def fake_description(i: int):
+    # Distinct per listing, so the deduplication stage keeps them apart
+    picks = [SKILLS[(i * 7 + k * 3) % len(SKILLS)] for k in range(6)]
+    return (
+        f"Listing {i}: work on {picks[0]} and {picks[1]} pipelines for team {i % 5}. "
+        f"You will ship {picks[2]} services, evaluate {picks[3]} models and "
+        f"document {picks[4]} experiments. Bonus: {picks[5]}. Stipend tier {i % 4}, "
+        f"{3 + i % 4} months, openings {1 + i % 3}."
+    )
+
+
+max_agents_per_session = 0
+
+
+class BrowserSession:
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.started = False
+        self.agents = 0
+
+    async def start(self):
+        if not self.started:
+            await asyncio.sleep(BROWSER_START_SECONDS)
+            self.started = True
+
+    async def kill(self):
+        self.started = False
+
+
+class AgentHistory:
+
+    def __init__(self, text):
+        self._text = text
+
+    def final_result(self):
+        return self._text
+
+
+class Agent:
+
+    def __init__(self, task, browser_session=None, **kwargs):
+        self.task = task
+        self.browser_session = browser_session
+        self.kwargs = kwargs
+
+    async def run(self):
+        global max_agents_per_session
+
+        # No shared session -> pay for a fresh browser every run
+        session = self.browser_session or BrowserSession()
+
+        session.agents += 1
+        max_agents_per_session = max(max_agents_per_session, session.agents)
+        try:
+            await session.start()
+            await asyncio.sleep(AGENT_LATENCY)
+        finally:
+            session.agents -= 1
+
+        # Listing-detail task (agents/scout.py extract_listing)
+        if "SOURCE_URL:" in self.task:
+            url = self.task.split("SOURCE_URL:", 1)[1].split()[0]
+            # fake-{i} links, or any real-looking slug ending in digits
+            match = re.search(r"(\d+)\D*$", url)
+            i = int(match.group(1)) if match else 0
+            originals = max(1, AGENT_JOBS - AGENT_DUPLICATES)
+            # Reposts: same listing text under a new link and a tweaked title
+            source = i if i < originals else i % originals
+            return AgentHistory(json.dumps({
+                "title": f"Machine Learning Intern {source}" + (" (Reposted)" if source != i else ""),
+                "company": f"Company {source}",
+                "description": fake_description(source)
+            }))
+
+        # Result-page task: links only
+        links = [
+            {
+                "title": f"Machine Learning Intern {i}",
+                "company": f"Company {i}",
+                "source_url": f"{SITE_URL}/internship/detail/fake-{i}"
+            }
+            for i in range(AGENT_JOBS)
+        ]
+        return AgentHistory(json.dumps(links))
@@ -0,0 +1,281 @@
+"""
+Stand-in for the openai package used by the benchmarks.
+
+Put bench/fakes on PYTHONPATH (ahead of site-packages) and
+`from openai import OpenAI, AsyncOpenAI, APIError, ...` resolves here.
+Answers are deterministic: the Analyst prompt gets a score list for
+the ids in its JOBS payload, anything else gets a tailored package.
+
+Env knobs:
+    FAKE_LLM_LATENCY          seconds before the first token
+    FAKE_LLM_TOKENS_PER_SEC   generation speed (0 = instant)
+    FAKE_LLM_OUTPUT_TOKENS    approximate size of a tailored package
+    FAKE_LLM_STREAM_CHUNK     characters per streamed delta
+    FAKE_LLM_FAILURE_RATE     fraction of calls raising APIError
+    FAKE_LLM_CHEAP_LATENCY    seconds before the first token for "*mini*" models
+    FAKE_LLM_CHEAP_NOISE      max points a "*mini*" model's score is off by
+    FAKE_LLM_PREFILL_MS_PER_1K  extra latency per 1K prompt tokens not
+                                served from the prefix cache
+    FAKE_LLM_PREFIX_CACHE     "0" turns the simulated prefix cache off
+    FAKE_LLM_MALFORMED        first N Analyst and first N Tailor answers
+                              contain no JSON (see `malformed`)
+
+The prefix cache works like OpenAI's: per model, a prompt reuses the
+longest prefix of 1024+ tokens (in 128-token steps) an earlier call
+sent, and reports it as usage.prompt_tokens_details.cached_tokens.
+"""
+import os
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+
+LLM_LATENCY = float(os.getenv("FAKE_LLM_LATENCY", "0.2"))
+TOKENS_PER_SEC = float(os.getenv("FAKE_LLM_TOKENS_PER_SEC", "0"))
+OUTPUT_TOKENS = int(os.getenv("FAKE_LLM_OUTPUT_TOKENS", "600"))
+STREAM_CHUNK = int(os.getenv("FAKE_LLM_STREAM_CHUNK", "16"))
+FAILURE_RATE = float(os.getenv("FAKE_LLM_FAILURE_RATE", "0"))
+CHEAP_LATENCY = float(os.getenv("FAKE_LLM_CHEAP_LATENCY", str(LLM_LATENCY / 4)))
+CHEAP_NOISE = int(os.getenv("FAKE_LLM_CHEAP_NOISE", "8"))
+PREFILL_MS_PER_1K = float(os.getenv("FAKE_LLM_PREFILL_MS_PER_1K", "0"))
+PREFIX_CACHE = os.getenv("FAKE_LLM_PREFIX_CACHE", "1") == "1"
+
+# Answers still to be malformed, per kind ("analyst" / "tailor")
+malformed = dict.fromkeys(("analyst", "tailor"), int(os.getenv("FAKE_LLM_MALFORMED", "0")))
+_MALFORMED_ANSWER = "Sorry, I can't produce JSON for this one."
+
+# count_tokens below is ~4 characters per token
+_CACHE_MIN_CHARS = 1024 * 4
+_CACHE_STEP_CHARS = 128 * 4
+_prefixes = set()
+
+# Set to a list to log every (model, messages) received
+requests = None
+
+_JOBS_RE = re.compile(r"JOBS:\s*(\[.*?\n\])", re.DOTALL)
+_TITLE_RE = re.compile(r"JOB TITLE:\s*\n(.*)")
+
+
+class APIError(Exception):
+    pass
+
+
+class APIConnectionError(APIError):
+    pass
+
+
+class APITimeoutError(APIConnectionError):
+    pass
+
+
+class RateLimitError(APIError):
+    pass
+
+
+class InternalServerError(APIError):
+    pass
+
+
+class _Obj:
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def count_tokens(text: str):
+    return len(text) // 4 + 1 if text else 0
+
+
+def _stable_score(text: str):
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return 40 + digest[0] % 56
+
+
+def _is_cheap(model):
+    return "mini" in (model or "")
+
+
+def _latency(model):
+    return CHEAP_LATENCY if _is_cheap(model) else LLM_LATENCY
+
+
+def _model_score(text: str, model):
+    score = _stable_score(text)
+    if not _is_cheap(model) or not CHEAP_NOISE:
+        return score
+    # Cheap models: same ballpark, off by up to CHEAP_NOISE points
+    noise = hashlib.sha256(f"{model}|{text}".encode("utf-8")).digest()[0] % (2 * CHEAP_NOISE + 1) - CHEAP_NOISE
+    return max(0, min(100, score + noise))
+
+
+def _prefix_cache(messages: list, model):
+    """
+    Prompt tokens served from the simulated prefix cache; the prompt's
+    own prefixes are cached for later calls.
+    """
+    text = "".join(f"{m['role']}\n{m['content']}\n" for m in messages)
+    digest = hashlib.sha256((model or "").encode("utf-8"))
+    cached = 0
+
+    for end in range(_CACHE_STEP_CHARS, len(text) + 1, _CACHE_STEP_CHARS):
+        digest.update(text[end - _CACHE_STEP_CHARS:end].encode("utf-8"))
+        if end < _CACHE_MIN_CHARS:
+            continue
+        key = digest.hexdigest()
+        if PREFIX_CACHE and key in _prefixes:
+            cached = end
+        _prefixes.add(key)
+
+    return min(cached // 4, _prompt_tokens(messages))
+
+
+def _prompt_tokens(messages: list):
+    return sum(count_tokens(m["content"]) for m in messages)
+
+
+def _prefill_seconds(messages: list, cached_tokens: int):
+    return (_prompt_tokens(messages) - cached_tokens) / 1000 * PREFILL_MS_PER_1K / 1000
+
+
+def _take_malformed(kind: str):
+    if malformed.get(kind, 0) > 0:
+        malformed[kind] -= 1
+        return True
+    return False
+
+
+def fake_content(messages: list, model=None):
+    prompt = messages[-1]["content"]
+
+    jobs = _JOBS_RE.search(prompt)
+    if _take_malformed("analyst" if jobs else "tailor"):
+        return _MALFORMED_ANSWER
+
+    if jobs:
+        return json.dumps([
+            {
+                "id": job["id"],
+                "match_score": _model_score(f"{job.get('title')}|{job.get('company')}", model),
+                "reason": "Deterministic benchmark score."
+            }
+            for job in json.loads(jobs.group(1))
+        ])
+
+    title = _TITLE_RE.search(prompt)
+    title = title.group(1).strip() if title else "the role"
+    filler = "Relevant project experience with Python and ML. "
+
+    return json.dumps({
+        "skill_gap_analysis": {
+            "missing_skills": ["Docker", "Kubernetes"],
+            "priority_levels": {"high": ["Docker"], "medium": ["Kubernetes"], "low": []},
+            "learning_recommendations": ["Ship one model behind an API."]
+        },
+        "cold_email": {
+            "subject": f"Application for {title}",
+            "body": filler * max(1, OUTPUT_TOKENS // 2 // count_tokens(filler))
+        },
+        "tailored_summary": filler * max(1, OUTPUT_TOKENS // 4 // count_tokens(filler)),
+        "skill_emphasis_suggestions": ["PyTorch", "NLP"]
+    })
+
+
+def _response(messages: list, content: str, cached_tokens: int = 0):
+    prompt_tokens = _prompt_tokens(messages)
+    completion_tokens = count_tokens(content)
+
+    return _Obj(
+        choices=[_Obj(message=_Obj(role="assistant", content=content), finish_reason="stop")],
+        usage=_Obj(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            prompt_tokens_details=_Obj(cached_tokens=cached_tokens)
+        )
+    )
+
+
+def _chunk(delta):
+    return _Obj(choices=[_Obj(delta=_Obj(content=delta), finish_reason=None)])
+
+
+def _usage_chunk(messages: list, content: str, cached_tokens: int):
+    # Final chunk of an include_usage stream: no choices, only usage
+    return _Obj(choices=[], usage=_response(messages, content, cached_tokens).usage)
+
+
+def _generation_seconds(content: str):
+    return count_tokens(content) / TOKENS_PER_SEC if TOKENS_PER_SEC > 0 else 0.0
+
+
+def _maybe_fail():
+    if FAILURE_RATE and random.random() < FAILURE_RATE:
+        raise APIError("Injected failure (FAKE_LLM_FAILURE_RATE).")
+
+
+class _Completions:
+
+    def create(self, model=None, messages=None, temperature=None, stream=False, **kwargs):
+        if requests is not None:
+            requests.append((model, messages))
+        _maybe_fail()
+        cached_tokens = _prefix_cache(messages, model)
+        time.sleep(_latency(model) + _prefill_seconds(messages, cached_tokens))
+        # Only now: a call cancelled while waiting never produced an answer
+        content = fake_content(messages, model)
+
+        if not stream:
+            time.sleep(_generation_seconds(content))
+            return _response(messages, content, cached_tokens)
+
+        def events():
+            pieces = [content[i:i + STREAM_CHUNK] for i in range(0, len(content), STREAM_CHUNK)]
+            for piece in pieces:
+                time.sleep(_generation_seconds(piece))
+                yield _chunk(piece)
+            if (kwargs.get("stream_options") or {}).get("include_usage"):
+                yield _usage_chunk(messages, content, cached_tokens)
+
+        return events()
+
+
+class _AsyncCompletions:
+
+    async def create(self, model=None, messages=None, temperature=None, stream=False, **kwargs):
+        if requests is not None:
+            requests.append((model, messages))
+        _maybe_fail()
+        cached_tokens = _prefix_cache(messages, model)
+        await asyncio.sleep(_latency(model) + _prefill_seconds(messages, cached_tokens))
+        # Only now: a call cancelled while waiting never produced an answer
+        content = fake_content(messages, model)
+
+        if not stream:
+            await asyncio.sleep(_generation_seconds(content))
+            return _response(messages, content, cached_tokens)
+
+        async def events():
+            for i in range(0, len(content), STREAM_CHUNK):
+                piece = content[i:i + STREAM_CHUNK]
+                await asyncio.sleep(_generation_seconds(piece))
+                yield _chunk(piece)
+            if (kwargs.get("stream_options") or {}).get("include_usage"):
+                yield _usage_chunk(messages, content, cached_tokens)
+
+        return events()
+
+
+class OpenAI:
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.chat = _Obj(completions=_Completions())
+
+
+class AsyncOpenAI:
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.chat = _Obj(completions=_AsyncCompletions())
@@ -0,0 +1,122 @@
+"""
+HTTP fast-path Scout against saved Internshala pages.
+
+    python bench/http_scout_bench.py --queries 20
+
+Serves bench/fixtures/internshala from a local HTTP server, points
+INTERNSHALA_BASE_URL at it and compares:
+
+  http     fetch + parse (agents/internshala.py)
+  browser  the vision-agent path (bench/fakes/browser_use, FAKE_* env vars)
+
+The fixtures also cover the fallbacks: the "data science" search page
+is a bot-check page and one listing has no detail page, so both must
+be served by the (fake) browser agent.
+"""
+import os
+import sys
+import time
+import json
+import asyncio
+import argparse
+import statistics
+import threading
+from functools import partial
+from pathlib import Path
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+FIXTURES_DIR = BASE_DIR / "bench" / "fixtures" / "internshala"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server():
+    handler = partial(QuietHandler, directory=str(FIXTURES_DIR))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+server = start_fixture_server()
+
+os.environ["INTERNSHALA_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+os.environ.setdefault("FAKE_AGENT_LATENCY", "0.5")
+# Measures fetch + parse; the per-host rate limit would dominate otherwise
+os.environ.setdefault("SCOUT_HOST_RATE", "0")
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+from agents.scout import scout_jobs  # noqa: E402
+
+
+def check_jobs(jobs: list):
+    assert jobs, "scout returned no jobs"
+    for job in jobs:
+        for key in ("title", "company", "description", "source_url"):
+            assert job.get(key), f"{key} missing in {json.dumps(job)[:200]}"
+
+
+async def timed(query: str, runs: int, http_first: bool, max_jobs: int = 3):
+    samples = []
+    jobs = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        jobs = await scout_jobs(query, max_jobs=max_jobs, http_first=http_first)
+        samples.append(time.perf_counter() - start)
+        check_jobs(jobs)
+
+    return samples, jobs
+
+
+def summarize(name: str, samples: list):
+    return {
+        "mode": name,
+        "n": len(samples),
+        "mean_ms": round(statistics.mean(samples) * 1000, 1),
+        "p50_ms": round(statistics.median(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    http_samples, jobs = await timed("Machine Learning Intern", args.queries, http_first=True)
+    parsed = [job for job in jobs if "fake-" not in job["source_url"]]
+    assert len(parsed) == 3, f"expected 3 listings parsed from fixtures, got {len(parsed)}"
+    assert "Selected intern's day-to-day responsibilities include:" in parsed[0]["description"]
+    assert "Skill(s) required" in parsed[0]["description"]
+
+    browser_samples, _ = await timed("Machine Learning Intern", max(1, args.queries // 5), http_first=False)
+
+    # 4th card has no detail page -> that listing alone goes to the browser agent
+    listing_samples, listing_jobs = await timed("Machine Learning Intern", 1, http_first=True, max_jobs=4)
+    assert len(listing_jobs) == 4
+
+    # Bot-check page -> the whole search falls back to the browser agent
+    search_samples, search_jobs = await timed("Data Science Intern", 1, http_first=True)
+    assert all("fake-" in job["source_url"] for job in search_jobs)
+
+    for row in (
+        summarize("http", http_samples),
+        summarize("browser", browser_samples),
+        summarize("http, one listing via browser", listing_samples),
+        summarize("search via browser", search_samples),
+    ):
+        print(json.dumps(row))
+
+    print(json.dumps({"sample_listing": parsed[0]}, indent=2))
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+"""
+Cold-start cost of the entry points, from `python -X importtime`.
+
+    python bench/import_bench.py --runs 5 --baseline data/import_baseline.json
+
+    runner        python runner.py --help (imports everything, then exits)
+    app           the modules app.py imports at top level (read from its
+                  source; ones not installed here are listed and skipped)
+    scout_worker  python -m agents.scout --worker, until its "ready" frame
+                  (bench/fakes/browser_use when browser_use isn't installed)
+
+For each: median wall time of a fresh interpreter, total import time,
+and the heaviest top-level imports. --baseline compares with an
+earlier run (and writes one when the file doesn't exist yet).
+"""
+import os
+import re
+import ast
+import sys
+import json
+import time
+import tempfile
+import argparse
+import statistics
+import subprocess
+import importlib.util
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+sys.path.insert(0, str(BASE_DIR))
+
+from agents.scout_protocol import read_frame, write_frame  # noqa: E402
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+WATCHED = ("openai", "browser_use", "tiktoken", "numpy", "httpx", "nest_asyncio", "streamlit")
+
+
+def parse_importtime(stderr: str):
+    """
+    {module: cumulative ms} for every import, plus the top-level ones.
+    """
+    every, top = {}, {}
+
+    for line in stderr.splitlines():
+        match = LINE_RE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, module = match.groups()
+        every[module] = int(cumulative) / 1000
+        if not indent:
+            top[module] = int(cumulative) / 1000
+
+    return every, top
+
+
+def app_imports():
+    """
+    Top-level imports of app.py, in order.
+    """
+    tree = ast.parse((BASE_DIR / "app.py").read_text(encoding="utf-8"))
+    modules = []
+
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+
+    return list(dict.fromkeys(modules))
+
+
+def command(target: str):
+    if target == "runner":
+        return [sys.executable, "-X", "importtime", "runner.py", "--help"], []
+
+    if target == "app":
+        modules = app_imports()
+        missing = [module for module in modules if importlib.util.find_spec(module.split(".")[0]) is None]
+        code = "; ".join(f"import {module}" for module in modules if module not in missing)
+        return [sys.executable, "-X", "importtime", "-c", code], missing
+
+    return [sys.executable, "-X", "importtime", "-m", "agents.scout", "--worker"], []
+
+
+def run_once(target: str):
+    argv, missing = command(target)
+    started = time.perf_counter()
+
+    if target != "scout_worker":
+        process = subprocess.run(argv, cwd=BASE_DIR, capture_output=True, text=True, check=True)
+        return (time.perf_counter() - started) * 1000, process.stderr, missing
+
+    process = subprocess.Popen(argv, cwd=BASE_DIR, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True)
+    frame = read_frame(process.stdout)
+    ready_ms = (time.perf_counter() - started) * 1000
+    assert frame and frame.get("type") == "ready", frame
+
+    write_frame(process.stdin, {"type": "shutdown"})
+    _, stderr = process.communicate(timeout=30)
+    return ready_ms, stderr, missing
+
+
+def measure(target: str, runs: int):
+    walls = []
+
+    for _ in range(runs):
+        wall_ms, stderr, missing = run_once(target)
+        walls.append(wall_ms)
+
+    every, top = parse_importtime(stderr)
+    heaviest = sorted(top.items(), key=lambda item: item[1], reverse=True)[:5]
+
+    return {
+        "target": target,
+        "wall_ms": round(statistics.median(walls), 1),
+        "import_ms": round(sum(top.values()), 1),
+        "heaviest": {module: round(ms, 1) for module, ms in heaviest},
+        "loaded": [module for module in WATCHED if module in every],
+        **({"skipped_not_installed": missing} if missing else {}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--targets", default="runner,app,scout_worker")
+    parser.add_argument("--baseline", type=Path, help="JSON from an earlier run to compare with")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+    if importlib.util.find_spec("browser_use") is None:
+        # Only the browser_use stand-in: the real openai import cost is part of what is measured
+        fakes = Path(tempfile.mkdtemp())
+        (fakes / "browser_use").symlink_to(FAKES_DIR / "browser_use")
+        os.environ["PYTHONPATH"] = os.pathsep.join(filter(None, [str(fakes), os.getenv("PYTHONPATH")]))
+        print("browser_use not installed: using bench/fakes/browser_use", file=sys.stderr)
+
+    results = [measure(target, args.runs) for target in args.targets.split(",")]
+
+    baseline = {}
+    if args.baseline and args.baseline.exists():
+        baseline = {item["target"]: item for item in json.loads(args.baseline.read_text())}
+
+    for result in results:
+        before = baseline.get(result["target"])
+        if before:
+            result["wall_ms_before"] = before["wall_ms"]
+            result["import_ms_before"] = before["import_ms"]
+        print(json.dumps(result))
+
+    if args.baseline and not args.baseline.exists():
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"baseline written to {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
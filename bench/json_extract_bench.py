@@ -0,0 +1,117 @@
+"""
+Shared JSON extractor vs the old greedy DOTALL regexes
+on multi-megabyte noisy logs.
+
+    python bench/json_extract_bench.py --mb 4
+"""
+import re
+import sys
+import json
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.json_extract import extract_json_array  # noqa: E402
+
+OLD_PATTERNS = {
+    "pipeline": r"\[\s*{.*}\s*\]",
+    "analyst": r"\[.*\]",
+}
+
+JOBS = [
+    {"title": f"ML Intern {i}", "company": "Acme [AI]", "description": "Uses {PyTorch} \"and\" NLP", "source_url": f"https://x/{i}"}
+    for i in range(3)
+]
+
+
+NOISE = {
+    # Browser-agent style logs full of brackets and quotes
+    "agent_log": [
+        "INFO [agent] step {n}: clicked element [{n}]",
+        "DEBUG {{'tab': {n}, 'url': 'https://internshala.com'}}",
+        "DEBUG actions=[{{'click_element': {{'index': {n}}}}}]",
+        "WARN [browser] retrying \"navigation\" #{n}",
+        "📍 Step {n}: eval: {{\"ok\": true}} next goal [close popup]",
+    ],
+    # Progress bars and no payload at all: every "[" makes the greedy
+    # regexes scan to the end of the text and back (quadratic)
+    "progress_bar": [
+        "downloading chromium [{n:>6} ##########",
+        "step {n} [=====>",
+    ],
+}
+
+
+# The regex baselines are quadratic on progress_bar; keep it small
+DEFAULT_MB = {"agent_log": [1, 2, 4, 8], "progress_bar": [0.125, 0.25, 0.5]}
+
+
+def noisy_log(megabytes: float, kind: str = "agent_log", seed: int = 3):
+    rng = random.Random(seed)
+    lines = NOISE[kind]
+    out = []
+    size = 0
+    n = 0
+    while size < megabytes * 1024 * 1024:
+        line = rng.choice(lines).format(n=n)
+        out.append(line)
+        size += len(line) + 1
+        n += 1
+
+    if kind == "agent_log":
+        # The real payload sits in the middle, noise on both sides
+        out.insert(len(out) // 2, json.dumps(JOBS))
+
+    return "\n".join(out)
+
+
+def old_extract(pattern: str, text: str):
+    match = re.search(pattern, text, re.DOTALL)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return None
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    value = fn(*args)
+    return time.perf_counter() - start, value
+
+
+def run(kind: str, megabytes: float):
+    text = noisy_log(megabytes, kind)
+    expected = None if kind == "progress_bar" else JOBS
+
+    row = {"kind": kind, "mb": megabytes}
+
+    seconds, value = timed(extract_json_array, text)
+    row["shared_ms"] = round(seconds * 1000, 1)
+    row["shared_ok"] = value == expected
+
+    for name, pattern in OLD_PATTERNS.items():
+        seconds, value = timed(old_extract, pattern, text)
+        row[f"{name}_regex_ms"] = round(seconds * 1000, 1)
+        row[f"{name}_regex_ok"] = value == expected
+
+    print(json.dumps(row))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kind", choices=sorted(NOISE), nargs="+", default=sorted(NOISE))
+    parser.add_argument("--mb", type=float, nargs="+", help="sizes (default per kind)")
+    args = parser.parse_args()
+
+    for kind in args.kind:
+        for megabytes in args.mb or DEFAULT_MB[kind]:
+            run(kind, megabytes)
+
+
+if __name__ == "__main__":
+    main()
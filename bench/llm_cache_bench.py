@@ -0,0 +1,206 @@
+"""
+LLM response cache (core/llm_cache.py) against a stub gateway.
+
+    python bench/llm_cache_bench.py --latency 0.05
+
+Checks, with a scratch SQLite file:
+
+  hit          a repeated call (sync and async) never reaches the gateway
+  key          another model / temperature / resume is a miss
+  hit_rate     the store's counters match the calls made
+  ttl          an entry older than the TTL is fetched again
+  eviction     over max_bytes the least recently used entries go first
+  parse        an answer the parser rejects is not stored: the next
+               call reaches the gateway again; a stored one it rejects
+               is dropped and fetched again
+
+and prints miss vs hit latency.
+"""
+import sys
+import json
+import time
+import atexit
+import shutil
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from core.llm_cache import LLMCache  # noqa: E402
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="llm-cache-bench-"))
+atexit.register(shutil.rmtree, SCRATCH_DIR, True)
+
+
+class _Obj:
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class StubGateway:
+    """
+    LLMGateway's create / acreate: answers echo the prompt (or are
+    taken from `replies` while they last), every call is counted.
+    """
+
+    def __init__(self, latency: float, replies: list = None):
+        self.latency = latency
+        self.replies = list(replies or [])
+        self.calls = 0
+
+    def _response(self, messages: list):
+        self.calls += 1
+        content = self.replies.pop(0) if self.replies else f"answer to: {messages[-1]['content']}"
+        return _Obj(
+            choices=[_Obj(message=_Obj(role="assistant", content=content))],
+            usage=_Obj(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        )
+
+    def create(self, model: str, messages: list, temperature: float):
+        time.sleep(self.latency)
+        return self._response(messages)
+
+    async def acreate(self, model: str, messages: list, temperature: float):
+        await asyncio.sleep(self.latency)
+        return self._response(messages)
+
+
+def messages(text: str):
+    return [{"role": "user", "content": text}]
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def check_hits(latency: float):
+    cache = LLMCache(path=SCRATCH_DIR / "hits.sqlite", max_bytes=None, ttl=None, enabled=True)
+    gateway = StubGateway(latency)
+
+    first, miss_ms = timed(cache.complete, gateway, "gpt-4o", messages("score job 1"), 0.2, resume_text="resume")
+    second, hit_ms = timed(cache.complete, gateway, "gpt-4o", messages("score job 1"), 0.2, resume_text="resume")
+    assert first == second and gateway.calls == 1, "the repeat should be served from cache"
+
+    async def async_calls():
+        a = await cache.acomplete(gateway, "gpt-4o", messages("score job 2"), 0.2, resume_text="resume")
+        b = await cache.acomplete(gateway, "gpt-4o", messages("score job 2"), 0.2, resume_text="resume")
+        return a, b
+
+    a, b = asyncio.run(async_calls())
+    assert a == b and gateway.calls == 2, "async repeat should be served from cache"
+
+    # Anything in the key changes the answer
+    cache.complete(gateway, "gpt-4o-mini", messages("score job 1"), 0.2, resume_text="resume")
+    cache.complete(gateway, "gpt-4o", messages("score job 1"), 0.3, resume_text="resume")
+    cache.complete(gateway, "gpt-4o", messages("score job 1"), 0.2, resume_text="another resume")
+    assert gateway.calls == 5, "model, temperature and resume are part of the key"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 5), stats
+    assert abs(stats["hit_rate"] - 2 / 7) < 1e-9, stats
+
+    return {"check": "hit", "miss_ms": round(miss_ms, 2), "hit_ms": round(hit_ms, 2), **stats}
+
+
+def check_ttl(latency: float, ttl: float):
+    cache = LLMCache(path=SCRATCH_DIR / "ttl.sqlite", max_bytes=None, ttl=ttl, enabled=True)
+    gateway = StubGateway(latency)
+
+    cache.complete(gateway, "gpt-4o", messages("score job 1"), 0.2)
+    cache.complete(gateway, "gpt-4o", messages("score job 1"), 0.2)
+    assert gateway.calls == 1, "fresh entry should be a hit"
+
+    time.sleep(ttl * 1.5)
+    cache.complete(gateway, "gpt-4o", messages("score job 1"), 0.2)
+    assert gateway.calls == 2, "expired entry should be fetched again"
+
+    return {"check": "ttl", "ttl_s": ttl, **cache.stats()}
+
+
+def check_eviction(latency: float):
+    # Room for three answers (stored as {"content": ...})
+    entry_bytes = len(json.dumps({"content": "answer to: prompt 0"}))
+    cache = LLMCache(path=SCRATCH_DIR / "eviction.sqlite", max_bytes=entry_bytes * 3, ttl=None, enabled=True)
+    gateway = StubGateway(latency)
+
+    def call(i):
+        return cache.complete(gateway, "gpt-4o", messages(f"prompt {i}"), 0.2)
+
+    for i in range(3):
+        call(i)
+        time.sleep(0.01)
+
+    # prompt 0 becomes the most recently used; prompt 1 is now the oldest
+    call(0)
+    time.sleep(0.01)
+    call(3)
+
+    calls = gateway.calls
+    call(0)
+    assert gateway.calls == calls, "recently used entry should survive eviction"
+    call(1)
+    assert gateway.calls == calls + 1, "least recently used entry should have been evicted"
+
+    stats = cache.stats()
+    assert stats["bytes"] <= entry_bytes * 3, stats
+
+    return {"check": "eviction", "max_bytes": entry_bytes * 3, **stats}
+
+
+def parse_answer(content: str):
+    if not content.startswith("answer to:"):
+        raise RuntimeError("malformed answer")
+    return content
+
+
+def check_parse(latency: float):
+    cache = LLMCache(path=SCRATCH_DIR / "parse.sqlite", max_bytes=None, ttl=None, enabled=True)
+    gateway = StubGateway(latency, replies=["{not json", "{still not json"])
+
+    def call():
+        return cache.complete(gateway, "gpt-4o", messages("tailor job 1"), 0.2, parse=parse_answer)
+
+    for attempt in range(2):
+        try:
+            call()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("a malformed answer should not parse")
+
+    assert gateway.calls == 2, "a rejected answer must not be served from cache"
+
+    async def async_call():
+        return await cache.acomplete(gateway, "gpt-4o", messages("tailor job 1"), 0.2, parse=parse_answer)
+
+    valid = asyncio.run(async_call())
+    assert asyncio.run(async_call()) == valid and gateway.calls == 3, "the valid answer should be cached"
+
+    # Stored before it was checked (e.g. by an older version)
+    key = cache.key("gpt-4o", 0.2, messages("tailor job 1"), "")
+    cache.save(key, "{not json")
+    assert call() == valid and gateway.calls == 4, "a rejected cached answer should be fetched again"
+    assert cache.lookup(key) == valid, "the fresh answer should replace it"
+
+    return {"check": "parse", "gateway_calls": gateway.calls, **cache.stats()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.05, help="stub gateway seconds per call")
+    parser.add_argument("--ttl", type=float, default=0.3)
+    args = parser.parse_args()
+
+    for result in (check_hits(args.latency), check_ttl(args.latency, args.ttl), check_eviction(args.latency),
+                   check_parse(args.latency)):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+LLM gateway against a local mock of the chat completions API.
+
+    python bench/llm_gateway_bench.py --calls 60
+
+The mock (real HTTP, real openai SDK) enforces what a provider does:
+at most `--server-rps` requests per second and `--server-concurrency`
+requests in flight, answering 429 + retry-after-ms beyond that, and
+gets slower as more requests pile up. Both limits default to a share
+of `--calls`, so the burst overruns them at any size. Same burst of
+calls three ways:
+
+  naive      fixed concurrency = calls, no retries (old behaviour)
+  aimd       adaptive concurrency + jittered retries
+  aimd+rpm   the same with the request bucket set just under the
+             server's limit: 429s are avoided instead of retried
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from openai import RateLimitError  # noqa: E402
+
+from core.limits import TokenBucket  # noqa: E402
+from core.llm_gateway import LLMGateway  # noqa: E402
+
+MESSAGES = [{"role": "user", "content": "Score this job."}]
+
+
+class MockProvider(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        with server.lock:
+            server.requests += 1
+            busy = server.inflight >= server.max_inflight
+            allowed = not busy and server.bucket.reserve() == 0
+            if not allowed:
+                if not busy:
+                    # a rejected request doesn't use up the window
+                    server.bucket.adjust(-1)
+                    server.rate_rejected += 1
+                server.rejected += 1
+            else:
+                server.inflight += 1
+                server.peak = max(server.peak, server.inflight)
+                latency = server.latency * (1 + server.inflight / server.max_inflight)
+
+        if not allowed:
+            return self.reply(429, {"error": {
+                "message": "Rate limit reached for requests", "type": "requests", "code": "rate_limit_exceeded"
+            }}, {"retry-after-ms": str(int(1000 / server.bucket.rate))})
+
+        time.sleep(latency)
+
+        with server.lock:
+            server.inflight -= 1
+
+        self.reply(200, {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-4o",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "[]"},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 12, "completion_tokens": 2, "total_tokens": 14}
+        })
+
+    def reply(self, status: int, body: dict, headers: dict = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+
+    def __init__(self, address, handler, backlog: int):
+        # The default listen backlog (5) resets connections of a large
+        # burst before the handler can answer 429
+        self.request_queue_size = backlog
+        super().__init__(address, handler)
+
+
+def start_mock(rps: float, max_inflight: int, latency: float, backlog: int):
+    server = MockServer(("127.0.0.1", 0), MockProvider, backlog)
+    server.daemon_threads = True
+    server.bucket = TokenBucket(rps, rps)
+    server.max_inflight = max_inflight
+    server.latency = latency
+    server.lock = threading.Lock()
+    server.requests = server.rejected = server.rate_rejected = server.inflight = server.peak = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(name: str, server, gateway: LLMGateway, calls: int):
+    server.requests = server.rejected = server.rate_rejected = server.peak = 0
+    server.bucket = TokenBucket(server.bucket.rate, server.bucket.rate)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(gateway.acreate(model="gpt-4o", messages=MESSAGES) for _ in range(calls)),
+        return_exceptions=True
+    )
+    elapsed = time.perf_counter() - started
+
+    failed = [result for result in results if isinstance(result, Exception)]
+    unexpected = [result for result in failed if not isinstance(result, RateLimitError)]
+    assert not unexpected, unexpected[0]
+
+    stats = gateway.stats()
+    print(json.dumps({
+        "mode": name,
+        "ok": calls - len(failed),
+        "failed": len(failed),
+        "wall_s": round(elapsed, 2),
+        "server_429s": server.rejected,
+        "server_rps_429s": server.rate_rejected,
+        "server_peak_in_flight": server.peak,
+        "final_limit": stats["concurrency_limit"],
+        "retries": stats["retries"],
+        "mean_queue_wait_ms": stats["mean_queue_wait_ms"],
+        "max_queue_wait_ms": stats["max_queue_wait_ms"],
+    }))
+    return len(failed), stats
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--server-rps", type=float, help="default: calls / 3")
+    parser.add_argument("--server-concurrency", type=int, help="default: calls / 8, at least 2")
+    parser.add_argument("--latency", type=float, default=0.2, help="server seconds per call when idle")
+    args = parser.parse_args()
+
+    args.server_rps = args.server_rps or args.calls / 3
+    args.server_concurrency = args.server_concurrency or max(2, args.calls // 8)
+    if args.calls <= 2 * args.server_concurrency:
+        parser.error("--calls must be over twice --server-concurrency, or nothing gets rejected")
+
+    server = start_mock(args.server_rps, args.server_concurrency, args.latency, backlog=2 * args.calls)
+    client_options = {"base_url": f"http://127.0.0.1:{server.server_port}/v1", "api_key": "mock"}
+
+    naive = LLMGateway(concurrency=args.calls, min_concurrency=args.calls, max_concurrency=args.calls,
+                       retries=0, latency_target=0, client_options=client_options)
+    failed, _ = await run("naive", server, naive, args.calls)
+    assert failed, "the mock should reject an unpaced burst"
+
+    aimd = LLMGateway(concurrency=32, retries=8, base_delay=0.2, latency_target=0,
+                      client_options=client_options)
+    failed, stats = await run("aimd", server, aimd, args.calls)
+    assert not failed, f"{failed} calls failed through the gateway"
+    assert stats["concurrency_limit"] < 32, "429s should have cut the limit"
+
+    # RPM just under the server's rate, 1s of burst
+    paced = LLMGateway(rpm=args.server_rps * 60 * 0.9, concurrency=args.server_concurrency, retries=8,
+                       base_delay=0.2, latency_target=0, client_options=client_options)
+    # LLM_BURST_SECONDS would let it open with more than the server's 1s bucket
+    paced.requests = TokenBucket(args.server_rps * 0.9, args.server_rps * 0.9)
+    failed, stats = await run("aimd+rpm", server, paced, args.calls)
+    assert not failed
+    assert server.rate_rejected <= max(1, args.calls // 10), "request bucket should keep clear of the server's rate"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
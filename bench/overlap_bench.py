@@ -0,0 +1,132 @@
+"""
+Scout/Analyst overlap (pipeline.ascout_and_score) vs scouting first and
+ranking after (agents/analyst.arank_jobs), fully offline.
+
+    python bench/overlap_bench.py --jobs 30 --top-k 20 --batch 5
+
+bench/fakes/browser_use yields the jobs, bench/fakes/openai logs every
+Analyst prompt. The overlap must not cost more LLM work than ranking
+after Scout: the same number of jobs sent (the PRERANK_TOP_K budget)
+in about as many calls. Per mode:
+
+  wall_ms          Scout + Analyst
+  first_leader_ms  until the first scored job (overlap only)
+  analyst_calls    Analyst prompts sent
+  jobs_sent        jobs in those prompts
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="overlap-bench-"))
+atexit.register(shutil.rmtree, SCRATCH_DIR, True)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--jobs", type=int, default=30, help="jobs Scout finds")
+parser.add_argument("--top-k", type=int, default=20)
+parser.add_argument("--batch", type=int, default=5, help="RANK_STREAM_BATCH")
+args = parser.parse_args()
+
+os.environ["AGENT_DATA_DIR"] = str(SCRATCH_DIR)
+os.environ["LLM_CACHE_ENABLED"] = "0"
+os.environ["SCORE_INDEX_ENABLED"] = "0"
+os.environ["RANK_CASCADE_FIRST_PASS"] = ""
+os.environ["PRERANK_TOP_K"] = str(args.top_k)
+os.environ["RANK_STREAM_BATCH"] = str(args.batch)
+os.environ["SCOUT_MAX_JOBS"] = str(args.jobs)
+os.environ["FAKE_AGENT_JOBS"] = str(args.jobs)
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("FAKE_AGENT_LATENCY", "0.05")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.2")
+os.environ.setdefault("SCOUT_HTTP_FAST_PATH", "0")
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+import openai  # noqa: E402  (bench/fakes/openai)
+import config  # noqa: E402
+from agents.analyst import arank_jobs  # noqa: E402
+from pipeline import astream_jobs, ascout_and_score  # noqa: E402
+
+QUERY = "Machine Learning Intern"
+
+RESUME = """# Jane Doe
+## Skills
+Python, PyTorch, scikit-learn, SQL, NLP, Docker
+"""
+
+
+def analyst_requests():
+    """
+    (calls, jobs sent) since the last call.
+    """
+    sent = [openai._JOBS_RE.search(messages[-1]["content"]) for _, messages in openai.requests]
+    openai.requests.clear()
+
+    sent = [json.loads(jobs.group(1)) for jobs in sent if jobs]
+    return len(sent), sum(len(jobs) for jobs in sent)
+
+
+async def overlapped():
+    started = time.perf_counter()
+    first_leader = []
+
+    def on_leader(job):
+        if not first_leader:
+            first_leader.append(time.perf_counter() - started)
+
+    ranked = await ascout_and_score(QUERY, refresh=True, on_leader=on_leader)
+    elapsed = time.perf_counter() - started
+
+    calls, jobs_sent = analyst_requests()
+    return ranked, {
+        "mode": "overlap",
+        "wall_ms": round(elapsed * 1000, 1),
+        "first_leader_ms": round(first_leader[0] * 1000, 1),
+        "analyst_calls": calls,
+        "jobs_sent": jobs_sent,
+    }
+
+
+async def sequential():
+    started = time.perf_counter()
+    jobs = [job async for _, job in astream_jobs(QUERY, refresh=True)]
+    ranked = await arank_jobs(jobs, QUERY)
+    elapsed = time.perf_counter() - started
+
+    calls, jobs_sent = analyst_requests()
+    return ranked, {
+        "mode": "scout, then rank",
+        "wall_ms": round(elapsed * 1000, 1),
+        "analyst_calls": calls,
+        "jobs_sent": jobs_sent,
+    }
+
+
+async def main():
+    config.RESUME_PATH.parent.mkdir(parents=True, exist_ok=True)
+    config.RESUME_PATH.write_text(RESUME, encoding="utf-8")
+    openai.requests = []
+
+    _, after = await sequential()
+    print(json.dumps(after))
+
+    ranked, overlap = await overlapped()
+    print(json.dumps(overlap))
+
+    budget = min(args.jobs, args.top_k) if args.top_k > 0 else args.jobs
+    assert overlap["jobs_sent"] == budget == len(ranked), f"sent {overlap['jobs_sent']} jobs, budget {budget}"
+    # Micro-chunks may split where one token-bounded chunk would not, but never per job
+    assert overlap["analyst_calls"] <= -(-budget // args.batch) + after["analyst_calls"], overlap
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,247 @@
+"""
+End-to-end pipeline benchmark, fully offline.
+
+    python bench/pipeline_bench.py --concurrency 1 8 64 --out bench/results/pipeline.json
+    python bench/pipeline_bench.py --compare bench/results/pipeline.json
+
+bench/fakes/openai and bench/fakes/browser_use replace the real
+clients (tune them with the FAKE_* env vars, see those modules).
+Data, caches and checkpoints live in a scratch AGENT_DATA_DIR and
+the LLM cache and score index are off, so every run does the full
+amount of work.
+
+Reports per-stage latency (Scout, Analyst, Tailor run one after
+another), then run_agent at each concurrency level: wall time,
+throughput, per-query latency and peak traced memory. Memory is
+measured in a second pass so tracemalloc does not skew latency.
+"""
+import os
+import sys
+import time
+import json
+import atexit
+import shutil
+import asyncio
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="pipeline-bench-"))
+atexit.register(shutil.rmtree, SCRATCH_DIR, True)
+
+os.environ.setdefault("AGENT_DATA_DIR", str(SCRATCH_DIR))
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+os.environ.setdefault("SCORE_INDEX_ENABLED", "0")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("FAKE_AGENT_LATENCY", "0.05")
+# The fake browser is the Scout under test, not internshala.com
+os.environ.setdefault("SCOUT_HTTP_FAST_PATH", "0")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.2")
+os.environ["PYTHONPATH"] = os.pathsep.join(
+    [str(FAKES_DIR), str(BASE_DIR), os.environ.get("PYTHONPATH", "")]
+)
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+import config  # noqa: E402
+from core.loop import run_sync  # noqa: E402
+from agents.analyst import arank_jobs  # noqa: E402
+from agents.tailor import atailor_application  # noqa: E402
+from pipeline import astream_jobs, arun_agent  # noqa: E402
+
+QUERY = "Machine Learning Intern"
+
+RESUME = """# Jane Doe
+## Skills
+Python, PyTorch, scikit-learn, SQL, NLP, Docker
+
+## Projects
+- Sentiment classifier served with FastAPI
+- Retrieval-augmented QA over course notes
+"""
+
+
+def ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def latency_summary(samples: list):
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": ms(statistics.mean(ordered)),
+        "p50_ms": ms(statistics.median(ordered)),
+        "p95_ms": ms(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]),
+        "max_ms": ms(ordered[-1]),
+    }
+
+
+# -----------------------------------------
+# PER-STAGE
+# -----------------------------------------
+async def one_pass(query: str):
+    timings = {}
+
+    start = time.perf_counter()
+    jobs = [job async for _, job in astream_jobs(query, refresh=True)]
+    timings["scout"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranked = await arank_jobs(jobs, query)
+    timings["analyst"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    await atailor_application(ranked[0], query)
+    timings["tailor"] = time.perf_counter() - start
+
+    return timings
+
+
+def bench_stages(samples: int):
+    per_stage = {"scout": [], "analyst": [], "tailor": []}
+
+    for i in range(samples):
+        for stage, seconds in run_sync(one_pass(f"{QUERY} {i}")).items():
+            per_stage[stage].append(seconds)
+
+    return {stage: latency_summary(values) for stage, values in per_stage.items()}
+
+
+# -----------------------------------------
+# END-TO-END
+# -----------------------------------------
+async def timed_run(query: str):
+    start = time.perf_counter()
+    await arun_agent(query, refresh=True)
+    return time.perf_counter() - start
+
+
+async def run_batch(concurrency: int, tag: str):
+    return await asyncio.gather(*[
+        timed_run(f"{QUERY} {tag}-{i}") for i in range(concurrency)
+    ])
+
+
+def bench_concurrency(concurrency: int):
+    start = time.perf_counter()
+    latencies = run_sync(run_batch(concurrency, f"c{concurrency}"))
+    wall = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        run_sync(run_batch(concurrency, f"m{concurrency}"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "concurrency": concurrency,
+        "wall_ms": ms(wall),
+        "throughput_qps": round(concurrency / wall, 2),
+        "latency": latency_summary(latencies),
+        "peak_traced_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+# -----------------------------------------
+# RESULTS
+# -----------------------------------------
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def settings():
+    knobs = {key: value for key, value in sorted(os.environ.items()) if key.startswith("FAKE_")}
+    knobs.update({
+        "SCOUT_MODE": config.SCOUT_MODE,
+        "SCOUT_MAX_JOBS": config.SCOUT_MAX_JOBS,
+        "RANK_CONCURRENCY": config.RANK_CONCURRENCY,
+        "TAILOR_TOP_N": config.TAILOR_TOP_N,
+    })
+    return knobs
+
+
+def flatten(results: dict):
+    """
+    {"stages.scout.p50_ms": ..., "c8.throughput_qps": ...} for comparisons.
+    """
+    flat = {}
+
+    for stage, summary in results.get("stages", {}).items():
+        for key, value in summary.items():
+            flat[f"stages.{stage}.{key}"] = value
+
+    for row in results.get("concurrency", []):
+        prefix = f"c{row['concurrency']}"
+        for key, value in row.items():
+            if isinstance(value, dict):
+                for sub, sub_value in value.items():
+                    flat[f"{prefix}.{key}.{sub}"] = sub_value
+            elif key != "concurrency":
+                flat[f"{prefix}.{key}"] = value
+
+    return flat
+
+
+def compare(baseline: dict, current: dict):
+    old, new = flatten(baseline), flatten(current)
+
+    print(f"\n{'metric':40} {'baseline':>12} {'current':>12} {'change':>9}")
+    for key in sorted(set(old) & set(new)):
+        if key.endswith(".n"):
+            continue
+        before, after = old[key], new[key]
+        change = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+        print(f"{key:40} {before:>12} {after:>12} {change:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--stage-samples", type=int, default=5)
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to diff against")
+    args = parser.parse_args()
+
+    if not config.RESUME_PATH.exists():
+        config.RESUME_PATH.parent.mkdir(parents=True, exist_ok=True)
+        config.RESUME_PATH.write_text(RESUME, encoding="utf-8")
+
+    # First call pays for imports / browser start-up; keep it out of the numbers
+    run_sync(one_pass(f"{QUERY} warmup"))
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "settings": settings(),
+        },
+        "stages": bench_stages(args.stage_samples),
+        "concurrency": [bench_concurrency(level) for level in args.concurrency],
+    }
+
+    print(json.dumps(results, indent=2))
+
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text(encoding="utf-8")), results)
+
+
+if __name__ == "__main__":
+    main()
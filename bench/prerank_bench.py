@@ -0,0 +1,66 @@
+"""
+Local pre-ranker throughput on synthetic job descriptions.
+
+    python bench/prerank_bench.py --docs 10000
+"""
+import sys
+import time
+import json
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.prerank import prerank_scores  # noqa: E402
+
+SKILLS = [
+    "python", "pytorch", "tensorflow", "nlp", "sql", "docker", "kubernetes",
+    "react", "javascript", "java", "spring", "aws", "gcp", "pandas", "numpy",
+    "scikit-learn", "llm", "transformers", "fastapi", "django", "excel",
+    "marketing", "sales", "figma", "photoshop", "accounting", "seo",
+]
+FILLER = [
+    "intern", "will", "work", "with", "team", "on", "building", "the", "and",
+    "projects", "experience", "strong", "knowledge", "of", "required", "good",
+    "communication", "skills", "stipend", "remote", "office", "months",
+]
+
+
+def synthetic_descriptions(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    vocab = SKILLS + FILLER + [f"term{i}" for i in range(3000)]
+    return [
+        " ".join(rng.choices(vocab, k=rng.randint(60, 160)))
+        for _ in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    descriptions = synthetic_descriptions(args.docs)
+    query = "Machine Learning Intern remote"
+    resume = "Python PyTorch NLP transformers FastAPI docker pandas numpy scikit-learn LLM projects"
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        scores = prerank_scores(descriptions, query, resume)
+        timings.append(time.perf_counter() - start)
+
+    assert len(scores) == args.docs
+
+    print(json.dumps({
+        "docs": args.docs,
+        "tokens": sum(len(d.split()) for d in descriptions),
+        "best_ms": round(min(timings) * 1000, 1),
+        "mean_ms": round(sum(timings) / len(timings) * 1000, 1),
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Provider prefix caching of the Analyst / Tailor prompts, fully offline.
+
+    python bench/prompt_cache_bench.py --queries 4 --jobs 12 --prefill-ms 150
+
+bench/fakes/openai simulates OpenAI's prefix cache (1024+ token
+prefixes, 128-token steps) and charges FAKE_LLM_PREFILL_MS_PER_1K for
+every prompt token it does not serve from cache. A resume of a few
+thousand tokens is ranked against several queries and the top jobs are
+tailored, once with the cache and once without. Per run:
+
+  wall_ms                 time for every query
+  prefix_tokens           tokens every call for the resume starts with
+  prefix_cache_hits       calls that reused a cached prefix
+  prefix_cache_hit_rate   share of prompt tokens served from cache
+  prefix_cache_saved_ms   summarize()'s estimate of the latency saved
+
+The estimate is checked against the measured difference in wall time.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="prompt-cache-bench-"))
+atexit.register(shutil.rmtree, SCRATCH_DIR, True)
+
+os.environ.setdefault("AGENT_DATA_DIR", str(SCRATCH_DIR))
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+os.environ.setdefault("SCORE_INDEX_ENABLED", "0")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.1")
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+import openai  # noqa: E402  (bench/fakes/openai)
+from agents import analyst, tailor  # noqa: E402
+from core.prompting import count_tokens  # noqa: E402
+from core.tracing import get_trace, summarize, trace  # noqa: E402
+
+QUERIES = ["Machine Learning Intern", "Data Science Intern", "NLP Research Intern", "Computer Vision Intern",
+           "MLOps Intern", "Backend Intern"]
+
+ROLES = ["Machine Learning", "Data Science", "NLP Research", "Computer Vision", "Backend", "Sales"]
+
+
+def make_resume(projects: int):
+    lines = ["# Jane Doe", "## Skills", "Python, PyTorch, scikit-learn, SQL, NLP, Docker", "", "## Projects"]
+    lines += [
+        f"- Project {i}: built and deployed model {i} with PyTorch, tracked {i * 3} experiments, "
+        f"served {i * 100} requests per second behind FastAPI"
+        for i in range(projects)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def make_jobs(n: int):
+    return [
+        {
+            "title": f"{ROLES[i % len(ROLES)]} Intern {i}",
+            "company": f"Company {i}",
+            "description": f"{ROLES[i % len(ROLES)]} internship at company {i}. Python and ML a plus. " * 6,
+            "source_url": f"https://example.com/jobs/{i}",
+        }
+        for i in range(n)
+    ]
+
+
+async def run(name: str, queries: list, jobs: list, tailor_top: int, concurrency: int):
+    openai._prefixes.clear()
+
+    with trace("bench.prompt_cache") as root:
+        started = time.perf_counter()
+        for query in queries:
+            ranked = await analyst.arank_jobs(jobs, query, concurrency, top_k=0, first_pass="")
+            for job in ranked[:tailor_top]:
+                await tailor.atailor_application(job, query)
+        elapsed = time.perf_counter() - started
+
+    summary = summarize(get_trace(root.trace_id))
+
+    return {
+        "config": name,
+        "wall_ms": round(elapsed * 1000, 1),
+        "llm_calls": summary["llm_calls"],
+        "prompt_tokens": summary["prompt_tokens"],
+        "cached_tokens": summary["cached_tokens"],
+        "prefix_cache_hits": summary["prefix_cache_hits"],
+        "prefix_cache_hit_rate": summary["prefix_cache_hit_rate"],
+        "prefix_cache_saved_ms": summary["prefix_cache_saved_ms"],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=4)
+    parser.add_argument("--jobs", type=int, default=12)
+    parser.add_argument("--tailor-top", type=int, default=2)
+    parser.add_argument("--projects", type=int, default=60, help="resume size (lines)")
+    parser.add_argument("--concurrency", type=int, default=1, help="ranking calls in flight")
+    parser.add_argument("--prefill-ms", type=float, default=150, help="per 1K uncached prompt tokens")
+    args = parser.parse_args()
+
+    openai.PREFILL_MS_PER_1K = args.prefill_ms
+
+    resume = make_resume(args.projects)
+    (SCRATCH_DIR / "master_resume.md").write_text(resume, encoding="utf-8")
+    jobs = make_jobs(args.jobs)
+    queries = (QUERIES * args.queries)[:args.queries]
+
+    # Everything before the query must not depend on it
+    for agent in (analyst, tailor):
+        prompts = [agent.build_prompt([(0, jobs[0])] if agent is analyst else jobs[0], q, resume) for q in queries]
+        prefix = agent.PROMPT.prefix(resume)
+        assert all(prompt.startswith(prefix) for prompt in prompts), agent.__name__
+        print(json.dumps({"agent": agent.__name__, "prefix_tokens": count_tokens(agent.PROMPT.system + prefix)}))
+
+    openai.PREFIX_CACHE = False
+    without = await run("no prefix cache", queries, jobs, args.tailor_top, args.concurrency)
+    print(json.dumps(without))
+
+    openai.PREFIX_CACHE = True
+    cached = await run("prefix cache", queries, jobs, args.tailor_top, args.concurrency)
+    print(json.dumps({**cached, "measured_saved_ms": round(without["wall_ms"] - cached["wall_ms"], 1)}))
+
+    assert without["cached_tokens"] == 0
+    assert cached["prefix_cache_hits"] > 0
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
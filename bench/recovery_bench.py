@@ -0,0 +1,91 @@
+"""
+Stage retries after malformed LLM output, fully offline.
+
+    python bench/recovery_bench.py
+
+bench/fakes/openai answers the first Analyst (or Tailor) call of a run
+without any JSON, and every later call normally. The LLM cache is on,
+so a malformed answer that got stored would be replayed on every
+retry. Per case, run_agent must recover on a retry:
+
+  analyst    ranked by the model (no local fallback), analyst
+             checkpoint written
+  tailor     a tailored package for the best match (speculative
+             tailoring is off, so the best match's own call gets it)
+
+and each run reports its LLM calls and wall time.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import asyncio
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="recovery-bench-"))
+atexit.register(shutil.rmtree, SCRATCH_DIR, True)
+
+os.environ["AGENT_DATA_DIR"] = str(SCRATCH_DIR)
+os.environ["LLM_CACHE_ENABLED"] = "1"
+os.environ.setdefault("SCORE_INDEX_ENABLED", "0")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("FAKE_AGENT_LATENCY", "0.05")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.05")
+os.environ.setdefault("SCOUT_HTTP_FAST_PATH", "0")
+os.environ.setdefault("STAGE_RETRY_BASE_DELAY", "0.05")
+# No speculative tailoring: the malformed Tailor answer goes to the best match's own call
+os.environ["SPECULATIVE_TAILOR_THRESHOLD"] = "101"
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+import openai  # noqa: E402  (bench/fakes/openai)
+import config  # noqa: E402
+from core.checkpoints import get_checkpoint_store  # noqa: E402
+from pipeline import arun_agent  # noqa: E402
+
+QUERIES = {"analyst": "Machine Learning Intern", "tailor": "Data Science Intern"}
+
+RESUME = """# Jane Doe
+## Skills
+Python, PyTorch, scikit-learn, SQL, NLP, Docker
+"""
+
+
+async def run_case(case: str):
+    openai.malformed.update(dict.fromkeys(openai.malformed, 0))
+    openai.malformed[case] = 1
+    openai.requests = []
+
+    started = time.perf_counter()
+    result = await arun_agent(QUERIES[case])
+    elapsed = time.perf_counter() - started
+
+    assert openai.malformed[case] == 0, f"{case}: the malformed answer was never served"
+    assert not result["best_match"].get("local_fallback"), f"{case}: fell back to the local ranking"
+    assert get_checkpoint_store().load(result["run_id"], "analyst") is not None, f"{case}: no analyst checkpoint"
+    assert isinstance(result["tailored_package"], dict), f"{case}: no tailored package"
+    assert not any(alt.get("tailor_error") for alt in result["alternatives"]), f"{case}: an alternative failed"
+
+    return {
+        "case": case,
+        "llm_calls": len(openai.requests),
+        "wall_ms": round(elapsed * 1000, 1),
+        "best_match": result["best_match"]["title"],
+    }
+
+
+async def main():
+    config.RESUME_PATH.parent.mkdir(parents=True, exist_ok=True)
+    config.RESUME_PATH.write_text(RESUME, encoding="utf-8")
+
+    for case in QUERIES:
+        print(json.dumps(await run_case(case)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
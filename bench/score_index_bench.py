@@ -0,0 +1,129 @@
+"""
+Persistent score index (core/score_index.py) under ascore_jobs, fully
+offline.
+
+    python bench/score_index_bench.py --jobs 12
+
+bench/fakes/openai logs every request, so the jobs actually sent to
+the LLM are known. Runs against a scratch index:
+
+  cold       every job is sent
+  warm       the same jobs plus new ones, shuffled together: only the
+             new ones are sent, results keep the input order and every
+             job has its own score
+  resume     the resume text changes: every job is sent again
+  back       the old resume again: its scores were dropped, so every
+             job is sent again
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import random
+import shutil
+import asyncio
+import argparse
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="score-index-bench-"))
+atexit.register(shutil.rmtree, SCRATCH_DIR, True)
+
+os.environ["AGENT_DATA_DIR"] = str(SCRATCH_DIR)
+os.environ["SCORE_INDEX_ENABLED"] = "1"
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.1")
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+import openai  # noqa: E402  (bench/fakes/openai)
+from agents.analyst import MODEL, ascore_jobs  # noqa: E402
+from core.score_index import get_score_index  # noqa: E402
+
+QUERY = "Machine Learning Intern"
+
+RESUME = """# Jane Doe
+## Skills
+Python, PyTorch, scikit-learn, SQL, NLP, Docker
+"""
+
+
+def make_jobs(start: int, n: int):
+    return [
+        {
+            "title": f"ML Intern {i}",
+            "company": f"Company {i}",
+            "description": "Python and ML a plus.",
+            "source_url": f"https://example.com/jobs/{i}",
+        }
+        for i in range(start, start + n)
+    ]
+
+
+def sent_titles():
+    """
+    Titles of the jobs in every Analyst prompt since the last call.
+    """
+    titles = []
+    for _, messages in openai.requests:
+        jobs = openai._JOBS_RE.search(messages[-1]["content"])
+        titles += [job["title"] for job in json.loads(jobs.group(1))]
+
+    openai.requests.clear()
+    return titles
+
+
+async def score(name: str, jobs: list, resume: str):
+    started = time.perf_counter()
+    scored = await ascore_jobs(jobs, QUERY, resume, asyncio.Semaphore(4))
+    elapsed = time.perf_counter() - started
+    sent = sent_titles()
+
+    assert [job["title"] for job in scored] == [job["title"] for job in jobs], f"{name}: input order lost"
+    for job in scored:
+        expected = openai._model_score(f"{job['title']}|{job['company']}", MODEL)
+        assert job["match_score"] == expected, f"{name}: {job['title']} got another job's score"
+
+    print(json.dumps({
+        "run": name,
+        "jobs": len(jobs),
+        "sent_to_llm": len(sent),
+        "wall_ms": round(elapsed * 1000, 1),
+        **{key: get_score_index().stats()[key] for key in ("hits", "misses", "entries")},
+    }))
+    return sent
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=12)
+    parser.add_argument("--new", type=int, default=4, help="unseen jobs in the warm run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    openai.requests = []
+    seen = make_jobs(0, args.jobs)
+    new = make_jobs(args.jobs, args.new)
+
+    sent = await score("cold", seen, RESUME)
+    assert sorted(sent) == sorted(job["title"] for job in seen)
+
+    mixed = seen + new
+    random.Random(args.seed).shuffle(mixed)
+    sent = await score("warm", mixed, RESUME)
+    assert sorted(sent) == sorted(job["title"] for job in new), f"warm run sent {sent}"
+
+    edited = RESUME + "Kubernetes\n"
+    sent = await score("resume", mixed, edited)
+    assert len(sent) == len(mixed), "an edited resume must not reuse old scores"
+
+    sent = await score("back", mixed, RESUME)
+    assert len(sent) == len(mixed), "scores of a replaced resume should have been dropped"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
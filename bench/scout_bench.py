@@ -0,0 +1,88 @@
+"""
+Cold-spawn vs warm-worker Scout latency with a stubbed browser_use.Agent.
+
+    python bench/scout_bench.py --queries 10
+
+Uses bench/fakes/browser_use; tune it with the FAKE_* env vars
+(see that module). Defaults simulate a heavy import and browser launch.
+"""
+import os
+import sys
+import time
+import json
+import argparse
+import statistics
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+
+os.environ.setdefault("FAKE_BROWSER_USE_IMPORT_SECONDS", "0.3")
+os.environ.setdefault("FAKE_BROWSER_START_SECONDS", "0.5")
+os.environ.setdefault("FAKE_AGENT_LATENCY", "0.05")
+# The fake browser is the Scout under test, not internshala.com
+os.environ.setdefault("SCOUT_HTTP_FAST_PATH", "0")
+os.environ["PYTHONPATH"] = os.pathsep.join(
+    [str(FAKES_DIR), str(BASE_DIR), os.environ.get("PYTHONPATH", "")]
+)
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+import browser_use  # noqa: E402  (bench/fakes/browser_use)
+from agents.scout_pool import SubprocessScout, ScoutWorkerPool, InProcessScout  # noqa: E402
+
+
+def timed(fn, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        jobs = fn(query)
+        samples.append(time.perf_counter() - start)
+        assert jobs, "scout returned no jobs"
+    return samples
+
+
+def summarize(name, samples):
+    return {
+        "mode": name,
+        "n": len(samples),
+        "first_ms": round(samples[0] * 1000, 1),
+        "mean_ms": round(statistics.mean(samples) * 1000, 1),
+        "p50_ms": round(statistics.median(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=10)
+    args = parser.parse_args()
+
+    queries = [f"Machine Learning Intern {i}" for i in range(args.queries)]
+    results = []
+
+    cold = SubprocessScout()
+    results.append(summarize("subprocess", timed(cold.run, queries)))
+
+    pool = ScoutWorkerPool(size=1)
+    try:
+        results.append(summarize("pool", timed(pool.run, queries)))
+    finally:
+        pool.close()
+
+    inproc = InProcessScout()
+    try:
+        results.append(summarize("inprocess", timed(inproc.run, queries)))
+        sessions = len(inproc._browser_session.sessions)
+    finally:
+        inproc.close()
+
+    # Concurrent listing agents each get their own warm session
+    assert browser_use.max_agents_per_session == 1, f"{browser_use.max_agents_per_session} agents shared a session"
+    results.append({"mode": "inprocess", "browser_sessions": sessions})
+
+    for row in results:
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+HTTP service (service.py) under load, fully offline.
+
+    python bench/service_bench.py --clients 40 --distinct 8
+
+Starts the service in-process on a free port with the fake OpenAI and
+browser_use clients (bench/fakes, FAKE_* env vars) and a scratch
+AGENT_DATA_DIR, then:
+
+  1. `clients` concurrent POST /runs spread over `distinct` queries,
+     each client polling its run to completion; identical queries must
+     coalesce into one execution
+  2. one run followed over GET /runs/<id>/stream
+  3. a burst larger than the queue, which must get 429s
+  4. a non-numeric or negative Content-Length, which must get a 400
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import shutil
+import asyncio
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="service-bench-"))
+atexit.register(shutil.rmtree, SCRATCH_DIR, True)
+
+os.environ.setdefault("AGENT_DATA_DIR", str(SCRATCH_DIR))
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+os.environ.setdefault("SCORE_INDEX_ENABLED", "0")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("FAKE_AGENT_LATENCY", "0.05")
+# The fake browser is the Scout under test, not internshala.com
+os.environ.setdefault("SCOUT_HTTP_FAST_PATH", "0")
+os.environ.setdefault("FAKE_LLM_LATENCY", "0.2")
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+import httpx  # noqa: E402
+
+import config  # noqa: E402
+from core.limits import StageLimits  # noqa: E402
+from service import AgentService, serve  # noqa: E402
+
+RESUME = """# Jane Doe
+## Skills
+Python, PyTorch, scikit-learn, SQL, NLP, Docker
+"""
+
+ROLES = [
+    "Machine Learning", "Data Science", "Backend", "Frontend", "DevOps",
+    "Product Design", "Data Engineering", "NLP", "Computer Vision", "Android",
+]
+
+
+async def poll(client, run_id: str, interval: float = 0.1):
+    while True:
+        state = (await client.get(f"/runs/{run_id}")).json()
+        if state["status"] in ("done", "failed"):
+            return state
+        await asyncio.sleep(interval)
+
+
+async def one_client(client, query: str):
+    started = time.perf_counter()
+    response = await client.post("/runs", json={"query": query, "refresh": True})
+    assert response.status_code == 202, response.text
+    submitted = response.json()
+    state = await poll(client, submitted["run_id"])
+    assert state["status"] == "done", state["error"]
+    return submitted, time.perf_counter() - started
+
+
+async def stream(client, query: str):
+    run_id = (await client.post("/runs", json={"query": query})).json()["run_id"]
+    stages = []
+
+    async with client.stream("GET", f"/runs/{run_id}/stream") as response:
+        async for line in response.aiter_lines():
+            if line:
+                state = json.loads(line)
+                if not stages or stages[-1] != state["stage"]:
+                    stages.append(state["stage"])
+
+    assert state["status"] == "done", state
+    return stages
+
+
+async def burst(base_url: str, size: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        responses = await asyncio.gather(*(
+            client.post("/runs", json={"query": f"Burst Role {i} Intern", "refresh": True})
+            for i in range(size)
+        ))
+    codes = [response.status_code for response in responses]
+    retry_after = [response.headers.get("Retry-After") for response in responses if response.status_code == 429]
+    return codes, retry_after
+
+
+async def raw_status(port: int, content_length: str):
+    """
+    Status of a POST /runs with a hand-written Content-Length header.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"POST /runs HTTP/1.1\r\nHost: bench\r\nContent-Length: {content_length}\r\n\r\n".encode("latin-1")
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    writer.close()
+    return int(status_line.split()[1])
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--distinct", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=config.SERVICE_WORKERS)
+    parser.add_argument("--queue", type=int, default=config.SERVICE_QUEUE_SIZE)
+    args = parser.parse_args()
+
+    config.RESUME_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if not config.RESUME_PATH.exists():
+        config.RESUME_PATH.write_text(RESUME, encoding="utf-8")
+
+    service = AgentService(
+        workers=args.workers,
+        queue_size=args.queue,
+        limits=StageLimits(
+            scout=config.SERVICE_SCOUT_LIMIT,
+            analyst=config.SERVICE_ANALYST_LIMIT,
+            tailor=config.SERVICE_TAILOR_LIMIT
+        )
+    )
+    bound = asyncio.get_running_loop().create_future()
+    server = asyncio.ensure_future(serve("127.0.0.1", 0, service, ready=bound.set_result))
+    port = await bound
+    base_url = f"http://127.0.0.1:{port}"
+
+    queries = [f"{ROLES[i % len(ROLES)]} Intern" + (f" {i}" if i >= len(ROLES) else "") for i in range(args.distinct)]
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            one_client(client, queries[i % len(queries)]) for i in range(args.clients)
+        ))
+        wall = time.perf_counter() - started
+
+        run_ids = {submitted["run_id"] for submitted, _ in results}
+        coalesced = sum(1 for submitted, _ in results if submitted["coalesced"])
+        assert len(run_ids) == len(queries), f"{len(run_ids)} executions for {len(queries)} queries"
+
+        latencies = sorted(latency for _, latency in results)
+        print(json.dumps({
+            "clients": args.clients,
+            "distinct_queries": len(queries),
+            "executions": len(run_ids),
+            "coalesced": coalesced,
+            "wall_s": round(wall, 2),
+            "p50_ms": round(statistics.median(latencies) * 1000, 1),
+            "max_ms": round(latencies[-1] * 1000, 1),
+        }))
+
+        stages = await stream(client, "Robotics Intern")
+        print(json.dumps({"streamed_stages": stages}))
+
+        health = (await client.get("/health")).json()
+
+    codes, retry_after = await burst(base_url, service.workers + service.queue.maxsize + 10)
+    assert 429 in codes, "queue never pushed back"
+    print(json.dumps({
+        "burst": len(codes),
+        "accepted": codes.count(202),
+        "rejected_429": codes.count(429),
+        "retry_after_s": retry_after[:1],
+    }))
+    print(json.dumps({"health_after_load": health}))
+
+    bad_lengths = {value: await raw_status(port, value) for value in ("abc", "-5")}
+    assert set(bad_lengths.values()) == {400}, bad_lengths
+    print(json.dumps({"bad_content_length": bad_lengths}))
+
+    server.cancel()
+    await asyncio.gather(server, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+"""
+Multi-source Scout against local fixture boards.
+
+    python bench/sources_bench.py --latency 0.3
+
+Serves bench/fixtures/internshala and bench/fixtures/greenhouse from
+two local HTTP servers (two hosts, so two rate limits and two
+connection pools), each answering after `--latency` seconds, then:
+
+  1. each source alone, then both at once: concurrent sources should
+     cost about the slowest one, not the sum
+  2. the Greenhouse board stalls past the Scout deadline: Internshala
+     listings must still come back, on time
+  3. a third Internshala server limited to 2 req/s, burst 1: the gaps
+     between the requests it receives must respect that
+  4. one Greenhouse board token does not exist (404): the other
+     boards' listings must still come back
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from functools import partial
+from pathlib import Path
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+FAKES_DIR = BASE_DIR / "bench" / "fakes"
+FIXTURES_DIR = BASE_DIR / "bench" / "fixtures"
+
+RATE_LIMITED = (2.0, 1.0)
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+
+    def do_GET(self):
+        # "/x" -> 301 "/x/" is followed inside the same rate-limited fetch
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/") or not os.path.isdir(self.translate_path(path)):
+            self.server.hits.append(time.monotonic())
+        time.sleep(self.server.latency)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server(board: str, latency: float = 0.0):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(FixtureHandler, directory=str(FIXTURES_DIR / board)))
+    server.latency = latency
+    server.hits = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+internshala_server = start_fixture_server("internshala")
+greenhouse_server = start_fixture_server("greenhouse")
+limited_server = start_fixture_server("internshala")
+
+os.environ["INTERNSHALA_BASE_URL"] = f"http://127.0.0.1:{internshala_server.server_port}"
+os.environ["SCOUT_HOST_RATES"] = f"127.0.0.1:{limited_server.server_port}={RATE_LIMITED[0]}:{RATE_LIMITED[1]}"
+os.environ.setdefault("SCOUT_HOST_RATE", "0")
+os.environ.setdefault("FAKE_AGENT_LATENCY", "0.5")
+sys.path[:0] = [str(FAKES_DIR), str(BASE_DIR)]
+
+from agents.scout import scout_jobs  # noqa: E402
+from agents.sources import GreenhouseSource, InternshalaSource  # noqa: E402
+
+QUERY = "Machine Learning Intern"
+BOARDS = ["nimbus", "orbitlabs"]
+
+
+def internshala(server=internshala_server):
+    return InternshalaSource(f"http://127.0.0.1:{server.server_port}")
+
+
+def greenhouse():
+    return GreenhouseSource(BOARDS, f"http://127.0.0.1:{greenhouse_server.server_port}")
+
+
+async def timed(name: str, sources: list, **kwargs):
+    started = time.perf_counter()
+    jobs = await scout_jobs(QUERY, max_jobs=3, http_first=True, sources=sources, **kwargs)
+    elapsed = time.perf_counter() - started
+
+    for job in jobs:
+        for key in ("title", "company", "description", "source_url"):
+            assert job.get(key), f"{key} missing in {json.dumps(job)[:200]}"
+
+    by_source = {}
+    for job in jobs:
+        by_source[job["source"]] = by_source.get(job["source"], 0) + 1
+
+    print(json.dumps({"case": name, "ms": round(elapsed * 1000, 1), "jobs": len(jobs), "by_source": by_source}))
+    return jobs, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per response from each fixture board")
+    parser.add_argument("--deadline", type=float, default=1.5)
+    args = parser.parse_args()
+
+    internshala_server.latency = greenhouse_server.latency = args.latency
+
+    # 1. Alone vs together (listing 104 has no detail page -> max_jobs=3 keeps it out)
+    _, alone_i = await timed("internshala alone", [internshala()])
+    gh_jobs, alone_g = await timed("greenhouse alone", [greenhouse()])
+    jobs, together = await timed("both concurrently", [internshala(), greenhouse()])
+
+    assert {job["source"] for job in jobs} == {"internshala", "greenhouse"}
+    assert all("Machine Learning" in job["title"] for job in gh_jobs)
+    assert together < (alone_i + alone_g) * 0.8, "sources did not overlap"
+
+    # Interleaved: each board's first result comes before any board's second
+    print(json.dumps({"merged_order": [f"{job['source']}: {job['title']}" for job in jobs]}, indent=2))
+
+    # 2. A stalled board does not hold up the others
+    greenhouse_server.latency = args.deadline * 3
+    jobs, elapsed = await timed("greenhouse stalled", [internshala(), greenhouse()], deadline=args.deadline)
+    assert jobs and all(job["source"] == "internshala" for job in jobs)
+    assert elapsed < args.deadline + 0.5, "deadline not enforced"
+    greenhouse_server.latency = args.latency
+
+    # 3. Per-host token bucket
+    limited_server.hits.clear()
+    await timed("internshala at 2 req/s", [internshala(limited_server)])
+    gaps = [later - earlier for earlier, later in zip(limited_server.hits, limited_server.hits[1:])]
+    min_gap = 1 / RATE_LIMITED[0]
+    # Burst 1: every request after the first waits for a fresh token
+    # (the first also pays for the TCP connect, which shortens gap one)
+    assert all(gap >= min_gap * 0.8 for gap in gaps), gaps
+    print(json.dumps({"rate_limited_gaps_ms": [round(gap * 1000) for gap in gaps]}))
+
+    # 4. A bad board only loses its own listings
+    bad_board = GreenhouseSource(BOARDS + ["no-such-board"], f"http://127.0.0.1:{greenhouse_server.server_port}")
+    jobs, _ = await timed("greenhouse with a bad board", [bad_board])
+    assert sorted(job["source_url"] for job in jobs) == sorted(job["source_url"] for job in gh_jobs), jobs
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
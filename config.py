@@ -0,0 +1,219 @@
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+# Overridable so benchmarks can run against a scratch directory
+DATA_DIR = Path(os.getenv("AGENT_DATA_DIR", BASE_DIR / "data"))
+RESUME_PATH = DATA_DIR / "master_resume.md"
+# Largest share of a prompt budget the resume may take. It is compacted
+# the same way for every call, so prompts keep a cacheable prefix
+PROMPT_RESUME_SHARE = float(os.getenv("PROMPT_RESUME_SHARE", "0.5"))
+
+
+# -----------------------------------------
+# SCOUT EXECUTION
+# -----------------------------------------
+# "inprocess" -> scout_jobs runs on a shared event loop in this process
+# "pool"      -> long-lived scout workers (agents/scout.py --worker)
+# "subprocess"-> legacy: one fresh interpreter per query
+SCOUT_MODE = os.getenv("SCOUT_MODE", "inprocess")
+SCOUT_POOL_SIZE = int(os.getenv("SCOUT_POOL_SIZE", "2"))
+SCOUT_MAX_JOBS = int(os.getenv("SCOUT_MAX_JOBS", "3"))
+# Listing pages fetched in parallel (browser tabs / agents)
+SCOUT_CONCURRENCY = int(os.getenv("SCOUT_CONCURRENCY", "3"))
+SCOUT_LISTING_TIMEOUT = float(os.getenv("SCOUT_LISTING_TIMEOUT", "90"))
+
+
+# -----------------------------------------
+# JOB CACHE
+# -----------------------------------------
+JOB_CACHE_PATH = DATA_DIR / "cache" / "jobs.sqlite"
+JOB_CACHE_TTL = float(os.getenv("JOB_CACHE_TTL", str(6 * 60 * 60)))
+JOB_CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "2000"))
+
+
+# -----------------------------------------
+# ANALYST
+# -----------------------------------------
+# Job tokens per ranking prompt / jobs per prompt / prompts in flight
+RANK_CHUNK_TOKENS = int(os.getenv("RANK_CHUNK_TOKENS", "6000"))
+RANK_CHUNK_MAX_JOBS = int(os.getenv("RANK_CHUNK_MAX_JOBS", "10"))
+RANK_CONCURRENCY = int(os.getenv("RANK_CONCURRENCY", "4"))
+
+# While Scout runs, arriving jobs are scored in micro-chunks: sent once
+# this many are waiting, or this long after the first of them arrived
+RANK_STREAM_BATCH = int(os.getenv("RANK_STREAM_BATCH", "5"))
+RANK_STREAM_FLUSH_SECONDS = float(os.getenv("RANK_STREAM_FLUSH_SECONDS", "0.5"))
+
+# Whole-prompt token budget per ranking call (resume + job descriptions
+# are compacted to fit, see core/prompting.py)
+RANK_PROMPT_TOKEN_BUDGET = int(os.getenv("RANK_PROMPT_TOKEN_BUDGET", "12000"))
+
+# Local TF-IDF pre-rank: only the top K jobs go to the LLM (0 = all)
+PRERANK_TOP_K = int(os.getenv("PRERANK_TOP_K", "20"))
+PRERANK_QUERY_WEIGHT = float(os.getenv("PRERANK_QUERY_WEIGHT", "0.4"))
+
+# Model cascade: a cheap first pass scores every job, the Analyst's
+# strong model re-scores only the ones near the top.
+# "" = off (strong model for everything), "local" = pre-rank score x 100,
+# anything else = the first-pass model (e.g. "gpt-4o-mini").
+# Off by default: it can change the best match. bench/cascade_bench.py
+# (40 jobs, first pass off by up to 8 points) picked the same best
+# match as the strong model alone with gpt-4o-mini at every band from
+# 5 to 25 (agreement 1.0, 1 strong call instead of 4), but not with
+# "local" (agreement 0.08, another leader). Run the bench against
+# your own jobs first; the trace reports cascade_agreement.
+RANK_CASCADE_FIRST_PASS = os.getenv("RANK_CASCADE_FIRST_PASS", "")
+# Re-scored: jobs within this many points of the best first-pass score,
+# and never fewer than RANK_CASCADE_MIN_RESCORE
+RANK_CASCADE_BAND = float(os.getenv("RANK_CASCADE_BAND", "15"))
+RANK_CASCADE_MIN_RESCORE = int(os.getenv("RANK_CASCADE_MIN_RESCORE", "3"))
+# The tiers "agree" on a job when their scores are this close
+RANK_CASCADE_AGREE_POINTS = float(os.getenv("RANK_CASCADE_AGREE_POINTS", "10"))
+
+
+# -----------------------------------------
+# LLM RESPONSE CACHE
+# -----------------------------------------
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_PATH = DATA_DIR / "cache" / "llm.sqlite"
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+# Unset -> entries never expire (identical inputs, identical answer)
+LLM_CACHE_TTL = float(os.environ["LLM_CACHE_TTL"]) if os.getenv("LLM_CACHE_TTL") else None
+
+
+# -----------------------------------------
+# LLM GATEWAY (core/llm_gateway.py, every Analyst / Tailor call)
+# -----------------------------------------
+# Account limits: requests and tokens per minute (0 = unlimited)
+LLM_RPM = float(os.getenv("LLM_RPM", "0"))
+LLM_TPM = float(os.getenv("LLM_TPM", "0"))
+# Seconds of unused allowance that may be spent in one burst
+LLM_BURST_SECONDS = float(os.getenv("LLM_BURST_SECONDS", "5"))
+# Completion tokens assumed per call until the real usage is known
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", "800"))
+# Calls in flight: starting point and bounds for the AIMD limit
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+# Calls slower than this shrink the limit a little (0 = only 429s / 5xx do)
+LLM_LATENCY_TARGET = float(os.getenv("LLM_LATENCY_TARGET", "60"))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", "4"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+
+
+# -----------------------------------------
+# SCORE INDEX (Analyst scores reused across runs, see core/score_index.py)
+# -----------------------------------------
+SCORE_INDEX_ENABLED = os.getenv("SCORE_INDEX_ENABLED", "1") == "1"
+SCORE_INDEX_PATH = DATA_DIR / "cache" / "scores.sqlite"
+SCORE_INDEX_TTL = float(os.getenv("SCORE_INDEX_TTL", str(30 * 24 * 60 * 60)))
+SCORE_INDEX_MAX_ENTRIES = int(os.getenv("SCORE_INDEX_MAX_ENTRIES", "20000"))
+
+
+# -----------------------------------------
+# TAILOR
+# -----------------------------------------
+# Best match + (N - 1) alternatives get a tailored package
+TAILOR_TOP_N = int(os.getenv("TAILOR_TOP_N", "3"))
+TAILOR_CONCURRENCY = int(os.getenv("TAILOR_CONCURRENCY", "3"))
+TAILOR_PROMPT_TOKEN_BUDGET = int(os.getenv("TAILOR_PROMPT_TOKEN_BUDGET", "6000"))
+# Start tailoring the current leader early once it scores at least this
+SPECULATIVE_TAILOR_THRESHOLD = float(os.getenv("SPECULATIVE_TAILOR_THRESHOLD", "75"))
+
+
+# -----------------------------------------
+# CHECKPOINTS / RETRIES
+# -----------------------------------------
+CHECKPOINT_DIR = DATA_DIR / "runs"
+STAGE_RETRIES = int(os.getenv("STAGE_RETRIES", "3"))
+STAGE_RETRY_BASE_DELAY = float(os.getenv("STAGE_RETRY_BASE_DELAY", "1.0"))
+
+
+# -----------------------------------------
+# TRACING (see core/tracing.py)
+# -----------------------------------------
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "1") == "1"
+# Every finished span appended as one JSON line (unset = off)
+TRACE_JSONL_PATH = Path(os.environ["TRACE_JSONL_PATH"]) if os.getenv("TRACE_JSONL_PATH") else None
+# One OTLP/JSON file per finished trace (unset = off)
+TRACE_OTLP_DIR = Path(os.environ["TRACE_OTLP_DIR"]) if os.getenv("TRACE_OTLP_DIR") else None
+# Finished traces kept in memory for the UI
+TRACE_KEEP = int(os.getenv("TRACE_KEEP", "50"))
+
+
+# -----------------------------------------
+# BATCH RUNNER (runner.py --batch)
+# -----------------------------------------
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
+
+# -----------------------------------------
+# RUN POOL (run_pool.py, shared by every Streamlit session)
+# -----------------------------------------
+RUN_POOL_WORKERS = int(os.getenv("RUN_POOL_WORKERS", "4"))
+# Seconds between progress refreshes in the UI
+UI_POLL_INTERVAL = float(os.getenv("UI_POLL_INTERVAL", "0.5"))
+
+
+# -----------------------------------------
+# HTTP SERVICE (service.py)
+# -----------------------------------------
+SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8080"))
+# Runs executing at once / runs waiting before new ones get a 429
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", "8"))
+SERVICE_QUEUE_SIZE = int(os.getenv("SERVICE_QUEUE_SIZE", "32"))
+# Stage slots across all workers (0 = no cap): crawls / ranking calls / tailoring calls
+SERVICE_SCOUT_LIMIT = int(os.getenv("SERVICE_SCOUT_LIMIT", "2"))
+SERVICE_ANALYST_LIMIT = int(os.getenv("SERVICE_ANALYST_LIMIT", "8"))
+SERVICE_TAILOR_LIMIT = int(os.getenv("SERVICE_TAILOR_LIMIT", "4"))
+# Finished runs kept for polling
+SERVICE_KEEP_RUNS = int(os.getenv("SERVICE_KEEP_RUNS", "500"))
+SERVICE_STREAM_INTERVAL = float(os.getenv("SERVICE_STREAM_INTERVAL", "0.25"))
+
+
+# -----------------------------------------
+# DEDUPLICATION (between Scout and Analyst)
+# -----------------------------------------
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") == "1"
+DEDUP_PATH = DATA_DIR / "cache" / "dedup.sqlite"
+# Estimated Jaccard similarity of description shingles to call two listings the same
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+DEDUP_SHINGLE_WORDS = int(os.getenv("DEDUP_SHINGLE_WORDS", "3"))
+# Listings with fewer shingles than this are only matched by URL
+DEDUP_MIN_SHINGLES = int(os.getenv("DEDUP_MIN_SHINGLES", "12"))
+DEDUP_HISTORY_TTL = float(os.getenv("DEDUP_HISTORY_TTL", str(30 * 24 * 60 * 60)))
+# 1 = also drop postings already seen in an earlier run (new-only sweeps)
+DEDUP_DROP_SEEN = os.getenv("DEDUP_DROP_SEEN", "0") == "1"
+
+
+# -----------------------------------------
+# SCOUT HTTP FAST PATH (agents/internshala.py)
+# -----------------------------------------
+# 1 = fetch + parse pages directly, browser agent only as fallback
+SCOUT_HTTP_FAST_PATH = os.getenv("SCOUT_HTTP_FAST_PATH", "1") == "1"
+# Point at a local server to run against saved HTML fixtures
+INTERNSHALA_BASE_URL = os.getenv("INTERNSHALA_BASE_URL", "https://internshala.com")
+SCOUT_HTTP_TIMEOUT = float(os.getenv("SCOUT_HTTP_TIMEOUT", "15"))
+# Per host (each host gets its own connection pool)
+SCOUT_HTTP_MAX_CONNECTIONS = int(os.getenv("SCOUT_HTTP_MAX_CONNECTIONS", "10"))
+# Token bucket per host: requests/second (0 = unlimited) and burst;
+# override per host with "host=rate[:burst],..." e.g. "internshala.com=1:2"
+SCOUT_HOST_RATE = float(os.getenv("SCOUT_HOST_RATE", "2"))
+SCOUT_HOST_BURST = float(os.getenv("SCOUT_HOST_BURST", "4"))
+SCOUT_HOST_RATES = os.getenv("SCOUT_HOST_RATES", "")
+
+
+# -----------------------------------------
+# JOB SOURCES (agents/sources/)
+# -----------------------------------------
+# Boards queried concurrently for every search, comma-separated
+SCOUT_SOURCES = [name.strip() for name in os.getenv("SCOUT_SOURCES", "internshala").split(",") if name.strip()]
+# Whole-search budget across all sources; what arrived by then is kept
+SCOUT_DEADLINE = float(os.getenv("SCOUT_DEADLINE", "180"))
+# Greenhouse job boards to search (board tokens, comma-separated)
+GREENHOUSE_BOARDS = [name.strip() for name in os.getenv("GREENHOUSE_BOARDS", "").split(",") if name.strip()]
+GREENHOUSE_API_URL = os.getenv("GREENHOUSE_API_URL", "https://boards-api.greenhouse.io")
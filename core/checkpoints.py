@@ -0,0 +1,78 @@
+import os
+import json
+import time
+import uuid
+import threading
+
+from config import CHECKPOINT_DIR
+
+STAGES = ("scout", "analyst", "tailor")
+
+
+def new_run_id():
+    return time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+
+class CheckpointStore:
+    """
+    One directory per run:
+        <root>/<run_id>/meta.json     query + options
+        <root>/<run_id>/<stage>.json  output of each finished stage
+    Writes are atomic (temp file + rename), so a crash never
+    leaves a half-written checkpoint behind.
+    """
+
+    def __init__(self, root=CHECKPOINT_DIR):
+        self.root = root
+
+    def _path(self, run_id: str, name: str):
+        return self.root / run_id / f"{name}.json"
+
+    def _write(self, path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _read(self, path):
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def open_run(self, run_id: str = None, query: str = None, **options):
+        """
+        Returns (run_id, meta). Existing runs keep their stored query;
+        new runs need one.
+        """
+        run_id = run_id or new_run_id()
+        meta = self._read(self._path(run_id, "meta"))
+
+        if meta is None:
+            if not query:
+                raise RuntimeError(f"Unknown run {run_id} and no query given.")
+            meta = {"run_id": run_id, "query": query, "created_at": time.time(), **options}
+            self._write(self._path(run_id, "meta"), meta)
+
+        return run_id, meta
+
+    def save(self, run_id: str, stage: str, data):
+        self._write(self._path(run_id, stage), data)
+
+    def load(self, run_id: str, stage: str):
+        return self._read(self._path(run_id, stage))
+
+    def completed_stages(self, run_id: str):
+        return [stage for stage in STAGES if self._path(run_id, stage).exists()]
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store():
+    global _store
+
+    with _store_lock:
+        if _store is None:
+            _store = CheckpointStore()
+        return _store
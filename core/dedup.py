@@ -0,0 +1,336 @@
+import re
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+from config import (
+    DEDUP_ENABLED, DEDUP_PATH, DEDUP_THRESHOLD, DEDUP_NUM_PERM,
+    DEDUP_SHINGLE_WORDS, DEDUP_MIN_SHINGLES, DEDUP_HISTORY_TTL, DEDUP_DROP_SEEN
+)
+from core.job_cache import normalize_url
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+# -----------------------------------------
+# MINHASH
+# -----------------------------------------
+def shingles(job: dict, size: int = DEDUP_SHINGLE_WORDS):
+    """
+    Word n-grams over company + title + description.
+    """
+    text = f"{job.get('company', '')} {job.get('title', '')} {job.get('description', '')}"
+    words = _WORD_RE.findall(text.lower())
+
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """
+    Universal hashing (a*x + b) mod p over 32-bit shingle hashes,
+    vectorised over all permutations at once.
+    """
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, seed: int = 1):
+        # numpy is imported on first use, not with the module (cold start)
+        import numpy as np
+
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: set):
+        import numpy as np
+
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingle_set),
+            dtype=np.uint64,
+            count=len(shingle_set)
+        )
+        # uint64 overflow wraps, as in the usual MinHash implementations
+        permuted = ((hashes[:, None] * self.a + self.b) % np.uint64(_MERSENNE_PRIME)) & np.uint64(_MAX_HASH)
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """
+    Estimated Jaccard similarity of two signatures.
+    """
+    import numpy as np
+
+    return float(np.mean(sig_a == sig_b))
+
+
+def lsh_params(num_perm: int, threshold: float):
+    """
+    (bands, rows) whose S-curve midpoint (1/b)^(1/r) sits just below
+    `threshold`: candidates are cheap to verify, missed pairs are not.
+    """
+    best = (num_perm, 1)
+    best_midpoint = 0.0
+
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        midpoint = (1 / bands) ** (1 / rows)
+        if best_midpoint < midpoint <= threshold:
+            best, best_midpoint = (bands, rows), midpoint
+
+    return best
+
+
+# -----------------------------------------
+# PERSISTENT INDEX
+# -----------------------------------------
+class DedupIndex:
+    """
+    Every posting seen so far, in SQLite:
+
+        urls        normalized URL -> posting id
+        signatures  posting id -> MinHash signature
+        bands       LSH band bucket -> posting id (indexed)
+
+    A lookup is one URL probe plus one indexed query over `bands`
+    buckets, so cost per job does not grow with the history.
+    """
+
+    def __init__(self, path=DEDUP_PATH, threshold: float = DEDUP_THRESHOLD,
+                 num_perm: int = DEDUP_NUM_PERM, ttl: float = DEDUP_HISTORY_TTL):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.threshold = threshold
+        self.ttl = ttl
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = lsh_params(num_perm, threshold)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                posting_id TEXT NOT NULL,
+                first_seen_at REAL NOT NULL,
+                seen_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS signatures (
+                posting_id TEXT PRIMARY KEY,
+                signature BLOB NOT NULL,
+                first_seen_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS bands (
+                bucket TEXT NOT NULL,
+                posting_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS bands_bucket ON bands(bucket);
+        """)
+        self._conn.commit()
+        self.prune()
+
+    def _buckets(self, signature):
+        return [
+            f"{band}:" + hashlib.blake2b(
+                signature[band * self.rows:(band + 1) * self.rows].tobytes(), digest_size=8
+            ).hexdigest()
+            for band in range(self.bands)
+        ]
+
+    def _near_duplicate(self, signature, buckets):
+        import numpy as np
+
+        marks = ",".join("?" * len(buckets))
+        candidates = self._conn.execute(
+            f"SELECT DISTINCT s.posting_id, s.signature FROM bands b "
+            f"JOIN signatures s ON s.posting_id = b.posting_id "
+            f"WHERE b.bucket IN ({marks})",
+            buckets
+        ).fetchall()
+
+        best_id, best_score = None, 0.0
+        for posting_id, blob in candidates:
+            score = similarity(signature, np.frombuffer(blob, dtype=np.uint32))
+            if score >= self.threshold and score > best_score:
+                best_id, best_score = posting_id, score
+
+        return best_id, best_score
+
+    def resolve(self, job: dict):
+        """
+        Returns (posting_id, match, seen_at) and records the job.
+
+        match is "url" (same normalized link), "near" (MinHash match)
+        or None (new posting). seen_at is when the link / posting was
+        first recorded, None for a new one.
+        """
+        url = normalize_url(job.get("source_url") or "")
+        shingle_set = shingles(job)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT posting_id, first_seen_at FROM urls WHERE url = ?", (url,)
+            ).fetchone() if url else None
+
+            if row is not None:
+                self._conn.execute("UPDATE urls SET seen_at = ? WHERE url = ?", (now, url))
+                self._conn.commit()
+                return row[0], "url", row[1]
+
+            signature = None
+            if len(shingle_set) >= DEDUP_MIN_SHINGLES:
+                signature = self.hasher.signature(shingle_set)
+                buckets = self._buckets(signature)
+                posting_id, _ = self._near_duplicate(signature, buckets)
+
+                if posting_id is not None:
+                    seen_at = self._conn.execute(
+                        "SELECT first_seen_at FROM signatures WHERE posting_id = ?", (posting_id,)
+                    ).fetchone()[0]
+                    if url:
+                        self._conn.execute(
+                            "INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?)", (url, posting_id, now, now)
+                        )
+                        self._conn.commit()
+                    return posting_id, "near", seen_at
+
+            posting_id = hashlib.sha1((url or repr(sorted(shingle_set))).encode("utf-8")).hexdigest()[:16]
+
+            if url:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO urls VALUES (?, ?, ?, ?)", (url, posting_id, now, now)
+                )
+            if signature is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO signatures VALUES (?, ?, ?)",
+                    (posting_id, signature.tobytes(), now)
+                )
+                self._conn.executemany(
+                    "INSERT INTO bands (bucket, posting_id) VALUES (?, ?)",
+                    [(bucket, posting_id) for bucket in buckets]
+                )
+            self._conn.commit()
+
+        return posting_id, None, None
+
+    def prune(self):
+        """
+        Forget postings not seen for `ttl` seconds.
+        """
+        if self.ttl is None:
+            return
+
+        cutoff = time.time() - self.ttl
+
+        with self._lock:
+            self._conn.execute("DELETE FROM urls WHERE seen_at < ?", (cutoff,))
+            self._conn.execute(
+                "DELETE FROM signatures WHERE first_seen_at < ? AND posting_id NOT IN "
+                "(SELECT posting_id FROM urls)",
+                (cutoff,)
+            )
+            self._conn.execute(
+                "DELETE FROM bands WHERE posting_id NOT IN (SELECT posting_id FROM signatures)"
+            )
+            self._conn.commit()
+
+    def session(self):
+        return DedupSession(self)
+
+
+# -----------------------------------------
+# ONE RUN
+# -----------------------------------------
+class DedupSession:
+    """
+    Filters the jobs of one run. Kept jobs gain a `posting_id`
+    (shared by every copy of a posting across sources and runs)
+    and, if the posting was seen in an earlier run, `first_seen_at`.
+    """
+
+    def __init__(self, index: DedupIndex):
+        self.index = index
+        self.posting_ids = set()
+        self.removed = 0
+        self.removed_seen = 0
+        self.started_at = time.time()
+
+    def check(self, job: dict):
+        """
+        Annotated copy of `job`, or None if it is a duplicate.
+        """
+        posting_id, match, seen_at = self.index.resolve(job)
+
+        if posting_id in self.posting_ids:
+            self.removed += 1
+            return None
+
+        seen_before = seen_at is not None and seen_at < self.started_at
+
+        if seen_before and DEDUP_DROP_SEEN:
+            self.removed += 1
+            self.removed_seen += 1
+            return None
+
+        self.posting_ids.add(posting_id)
+
+        kept = {**job, "posting_id": posting_id}
+        if seen_before:
+            kept["first_seen_at"] = seen_at
+        if match == "near":
+            kept["near_duplicate"] = True
+
+        return kept
+
+    def filter(self, jobs: list):
+        return [kept for kept in map(self.check, jobs) if kept is not None]
+
+    def report(self):
+        return {
+            "kept": len(self.posting_ids),
+            "duplicates_removed": self.removed,
+            "seen_before_removed": self.removed_seen,
+        }
+
+
+class _PassThrough:
+    # DEDUP_ENABLED=0: same surface, keeps everything
+
+    removed = 0
+
+    def check(self, job: dict):
+        return job
+
+    def filter(self, jobs: list):
+        return list(jobs)
+
+    def report(self):
+        return {"kept": None, "duplicates_removed": 0, "seen_before_removed": 0}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_dedup_index():
+    global _index
+
+    with _index_lock:
+        if _index is None:
+            _index = DedupIndex()
+        return _index
+
+
+def dedup_session():
+    if not DEDUP_ENABLED:
+        return _PassThrough()
+    return get_dedup_index().session()
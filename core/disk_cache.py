@@ -0,0 +1,144 @@
+import json
+import time
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class DiskCache:
+    """
+    Small SQLite-backed key/value store.
+
+    - values are JSON
+    - optional TTL (seconds) per cache, overridable per get()
+    - LRU eviction by entry count and/or total value bytes
+    - hit / miss counters for this process
+    """
+
+    def __init__(self, path, namespace: str = "default", ttl: float = None,
+                 max_entries: int = None, max_bytes: int = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.table = f"cache_{namespace}"
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_lru ON {self.table}(accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+
+            if ttl is not None and now - created_at > ttl:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value):
+        payload = json.dumps(value)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                f"""INSERT OR REPLACE INTO {self.table}
+                    (key, value, size, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?)""",
+                (key, payload, len(payload), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def _evict(self):
+        # Caller holds the lock
+        if self.max_entries is not None:
+            self._conn.execute(f"""
+                DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table}
+                    ORDER BY accessed_at DESC
+                    LIMIT -1 OFFSET ?
+                )""", (self.max_entries,))
+
+        if self.max_bytes is not None:
+            total = self._conn.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()[0]
+
+            if total > self.max_bytes:
+                rows = self._conn.execute(
+                    f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC"
+                ).fetchall()
+
+                doomed = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+
+                self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", doomed)
+
+    def stats(self):
+        with self._lock:
+            entries, total = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+        }
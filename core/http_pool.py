@@ -0,0 +1,110 @@
+import asyncio
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import (
+    SCOUT_HTTP_TIMEOUT, SCOUT_HTTP_MAX_CONNECTIONS, SCOUT_HOST_RATE, SCOUT_HOST_BURST, SCOUT_HOST_RATES
+)
+from core.limits import TokenBucket
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/json",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+# -----------------------------------------
+# RATE LIMIT (one TokenBucket per host, process-wide)
+# -----------------------------------------
+def host_limits(host: str):
+    """
+    (rate, burst) for `host`: SCOUT_HOST_RATES entries such as
+    "internshala.com=2:4,boards-api.greenhouse.io=5" override the
+    SCOUT_HOST_RATE / SCOUT_HOST_BURST defaults.
+    """
+    for entry in SCOUT_HOST_RATES.split(","):
+        name, _, limits = entry.strip().partition("=")
+        if name and name == host:
+            rate, _, burst = limits.partition(":")
+            return float(rate), float(burst or SCOUT_HOST_BURST)
+
+    return SCOUT_HOST_RATE, SCOUT_HOST_BURST
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(host: str):
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(*host_limits(host))
+        return _buckets[host]
+
+
+# -----------------------------------------
+# CONNECTION POOLS (one client per host per event loop)
+# -----------------------------------------
+_clients = {}
+
+
+def get_client(host: str):
+    """
+    httpx.AsyncClient for `host` on the running loop: keep-alive
+    connections are reused by every request to that host, and one
+    slow board can't use up another board's connections.
+    """
+    key = (asyncio.get_running_loop(), host)
+    client = _clients.get(key)
+
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=SCOUT_HTTP_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=SCOUT_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=SCOUT_HTTP_MAX_CONNECTIONS
+            )
+        )
+        _clients[key] = client
+
+    return client
+
+
+async def close_clients():
+    """
+    Closes every client bound to the running loop.
+    """
+    loop = asyncio.get_running_loop()
+
+    for key in [key for key in _clients if key[0] is loop]:
+        await _clients.pop(key).aclose()
+
+
+async def fetch(url: str):
+    host = urlsplit(url).netloc.lower()
+
+    await get_bucket(host).acquire()
+
+    response = await get_client(host).get(url)
+    response.raise_for_status()
+    return response
+
+
+async def fetch_text(url: str):
+    """
+    (body, final URL after redirects).
+    """
+    response = await fetch(url)
+    return response.text, str(response.url)
+
+
+async def fetch_json(url: str):
+    return (await fetch(url)).json()
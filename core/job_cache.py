@@ -0,0 +1,109 @@
+import re
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from config import JOB_CACHE_PATH, JOB_CACHE_TTL, JOB_CACHE_MAX_ENTRIES, SCOUT_SOURCES
+from core.disk_cache import DiskCache
+
+# Tracking params that change between otherwise identical listing links
+_TRACKING_PARAMS = {"utm_source", "utm_medium", "utm_campaign", "utm_term",
+                    "utm_content", "ref", "referral", "fbclid", "gclid"}
+
+_QUERY_ALIASES = {
+    "ml": "machine learning",
+    "ds": "data science",
+    "ai": "artificial intelligence",
+    "internship": "intern",
+    "internships": "intern",
+}
+
+
+def normalize_url(url: str):
+    parts = urlsplit(url.strip())
+
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in _TRACKING_PARAMS
+    ]
+
+    return urlunsplit((
+        parts.scheme.lower() or "https",
+        parts.netloc.lower().removeprefix("www."),
+        parts.path.rstrip("/"),
+        urlencode(sorted(query)),
+        ""
+    ))
+
+
+def normalize_query(query: str):
+    """
+    "ML Intern, remote" and "remote machine-learning internship"
+    map to the same key.
+    """
+    words = re.findall(r"[a-z0-9+#]+", query.lower())
+    expanded = " ".join(_QUERY_ALIASES.get(word, word) for word in words)
+    return " ".join(sorted(set(expanded.split())))
+
+
+class JobCache:
+    """
+    Two namespaces in one SQLite file:
+      jobs    -> normalized source_url : job dict
+      queries -> sources + normalized query : {"max_jobs": n, "urls": [...]}
+
+    The active job sources are part of the query key: adding a board
+    to SCOUT_SOURCES must not serve results that never searched it.
+    """
+
+    def __init__(self, path=JOB_CACHE_PATH, ttl: float = JOB_CACHE_TTL,
+                 max_entries: int = JOB_CACHE_MAX_ENTRIES, sources: list = None):
+        self.jobs = DiskCache(path, "jobs", ttl=ttl, max_entries=max_entries)
+        self.queries = DiskCache(path, "queries", ttl=ttl, max_entries=max_entries)
+        self.sources = ",".join(sorted(SCOUT_SOURCES if sources is None else sources))
+
+    def query_key(self, query: str):
+        return f"{self.sources}:{normalize_query(query)}"
+
+    def get_jobs(self, query: str, max_jobs: int):
+        entry = self.queries.get(self.query_key(query))
+
+        if entry is None or entry["max_jobs"] < max_jobs:
+            return None
+
+        jobs = []
+        for url in entry["urls"][:max_jobs]:
+            job = self.jobs.get(url)
+            if job is None:
+                # A listing was evicted / expired -> treat as a miss
+                return None
+            jobs.append(job)
+
+        return jobs
+
+    def put_jobs(self, query: str, max_jobs: int, jobs: list):
+        urls = []
+
+        for job in jobs:
+            if not job.get("source_url"):
+                continue
+            url = normalize_url(job["source_url"])
+            self.jobs.set(url, job)
+            urls.append(url)
+
+        self.queries.set(self.query_key(query), {"max_jobs": max_jobs, "urls": urls})
+
+    def stats(self):
+        return {"queries": self.queries.stats(), "jobs": self.jobs.stats()}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_job_cache():
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = JobCache()
+        return _cache
@@ -0,0 +1,169 @@
+import re
+import json
+
+_decoder = json.JSONDecoder()
+
+_CLOSERS = {"[": "]", "{": "}"}
+
+# A JSON string literal that itself holds JSON: "[{\"title\": ...}]"
+_ENCODED_START_RE = re.compile(r'"\s*[\[{]')
+
+
+# Only these characters matter to the scanner; everything else is
+# skipped inside re.search (C speed) instead of a Python loop.
+_STRUCTURAL_RE = re.compile(r'[\[\]{}"]')
+# Outside any block, only an opener that can start JSON is worth
+# tracking: "[agent]" or "{'tab': 1}" in log noise is skipped in C.
+_START_RE = re.compile(r'[\[{](?=\s*["\[{\]}\-0-9tfn])')
+# Rest of a JSON string after its opening quote (unrolled-loop form)
+_STRING_TAIL_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+
+def _bracket_spans(text: str):
+    """
+    One pass over `text`: (start, end) of every balanced [...] / {...}
+    span, in order of start. String state is only tracked inside an
+    open bracket, so quotes in surrounding log noise are ignored.
+    A mismatched closer or unterminated string discards everything
+    currently open.
+    """
+    spans = []
+    stack = []
+    pos = 0
+
+    while True:
+        match = (_STRUCTURAL_RE if stack else _START_RE).search(text, pos)
+        if match is None:
+            break
+
+        index = match.start()
+        ch = text[index]
+        pos = index + 1
+
+        if ch in _CLOSERS:
+            stack.append((index, _CLOSERS[ch]))
+        elif ch == '"':
+            tail = _STRING_TAIL_RE.match(text, pos)
+            if tail is None:
+                stack.clear()
+            else:
+                pos = tail.end()
+        else:
+            start, expected = stack.pop()
+            if ch == expected:
+                spans.append((start, pos))
+            else:
+                stack.clear()
+
+    spans.sort()
+    return spans
+
+
+def _matches(value, expect):
+    if expect is None:
+        return True
+    if isinstance(expect, type):
+        return isinstance(value, expect)
+    return expect(value)
+
+
+def is_object_array(value):
+    return isinstance(value, list) and all(isinstance(item, dict) for item in value)
+
+
+def _scan(text: str, expect):
+    """
+    Outermost blocks first; a block that decodes but does not match
+    `expect` is descended into (e.g. the list inside {"jobs": [...]}).
+    """
+    accepted_end = -1
+    opener = _OPENER_FOR.get(expect)
+
+    for start, end in _bracket_spans(text):
+        if start < accepted_end or (opener and text[start] != opener):
+            continue
+
+        # Decode the span on its own: JSONDecodeError computes line/col
+        # from the start of the document, which is O(n) per failure
+        # on a multi-megabyte log.
+        block = text[start:end]
+
+        try:
+            value, stop = _decoder.raw_decode(block)
+        except json.JSONDecodeError:
+            continue
+
+        if stop == len(block) and _matches(value, expect):
+            accepted_end = end
+            yield value
+
+
+# Expectations that pin down the opening bracket; other spans are
+# not worth a decode attempt
+_OPENER_FOR = {list: "[", dict: "{", is_object_array: "["}
+
+
+def iter_json_candidates(text: str):
+    """
+    Every outermost JSON array/object embedded in `text`, in order,
+    decoded. Nested values of an accepted block are not repeated.
+    """
+    return _scan(text, None)
+
+
+def _decode_encoded(text: str, expect):
+    """
+    Double-encoded JSON: a string literal whose content is JSON.
+    """
+    for match in _ENCODED_START_RE.finditer(text):
+        try:
+            inner, _ = _decoder.raw_decode(text, match.start())
+        except json.JSONDecodeError:
+            continue
+
+        if isinstance(inner, str):
+            value = extract_json(inner, expect)
+            if value is not None:
+                return value
+
+    return None
+
+
+def extract_json(text: str, expect=None):
+    """
+    First JSON value in noisy model / subprocess output.
+
+    Handles ```json fences, leading/trailing prose and logs,
+    several candidate blocks (first one of type `expect` wins),
+    and double-encoded JSON. Returns None if nothing matches.
+
+    expect: None, a type (list / dict) or a predicate
+            such as is_object_array.
+    """
+    if not text:
+        return None
+
+    stripped = text.strip()
+
+    # Fast path: the whole thing is JSON (possibly a JSON string of JSON)
+    try:
+        value = json.loads(stripped)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(value, str):
+            return extract_json(value, expect)
+        if _matches(value, expect):
+            return value
+
+    for value in _scan(text, expect):
+        return value
+
+    return _decode_encoded(text, expect)
+
+
+def extract_json_array(text: str):
+    """
+    First array of JSON objects (job lists, score lists) in `text`.
+    """
+    return extract_json(text, is_object_array)
@@ -0,0 +1,244 @@
+import time
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from contextlib import asynccontextmanager
+
+_current = contextvars.ContextVar("stage_limits", default=None)
+
+
+class StageLimits:
+    """
+    Caps on how many runs may be in one stage at once, shared by every
+    run started under use_limits(). A stage without a cap is free.
+    """
+
+    def __init__(self, **limits):
+        self.limits = {stage: max(1, n) for stage, n in limits.items() if n}
+        self._semaphores = {stage: asyncio.Semaphore(n) for stage, n in self.limits.items()}
+        self.active = dict.fromkeys(self.limits, 0)
+        self.waiting = dict.fromkeys(self.limits, 0)
+
+    @asynccontextmanager
+    async def slot(self, stage: str):
+        semaphore = self._semaphores.get(stage)
+        if semaphore is None:
+            yield
+            return
+
+        self.waiting[stage] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting[stage] -= 1
+
+        self.active[stage] += 1
+        try:
+            yield
+        finally:
+            self.active[stage] -= 1
+            semaphore.release()
+
+    def stats(self):
+        return {
+            stage: {"limit": self.limits[stage], "active": self.active[stage], "waiting": self.waiting[stage]}
+            for stage in self.limits
+        }
+
+
+def use_limits(limits: StageLimits):
+    """
+    Applies `limits` to the current context (and tasks started from it).
+    """
+    return _current.set(limits)
+
+
+@asynccontextmanager
+async def stage_slot(stage: str):
+    """
+    Holds a `stage` slot under the limits in effect; no-op without any.
+    """
+    limits = _current.get()
+
+    if limits is None:
+        yield
+        return
+
+    async with limits.slot(stage):
+        yield
+
+
+# -----------------------------------------
+# TOKEN BUCKET (requests or tokens per second)
+# -----------------------------------------
+class TokenBucket:
+    """
+    `rate` units per second with bursts of up to `burst` (rate <= 0
+    means unlimited).
+
+    Callers reserve under a thread lock and sleep outside it (the
+    balance may go negative: that is the queue), so one bucket works
+    across event loops and threads.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.waits = 0
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, cost: float = 1.0):
+        """
+        Takes `cost` units; returns how long to wait before using them.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            self._refill()
+            self.tokens -= cost
+
+            if self.tokens >= 0:
+                return 0.0
+
+            self.waits += 1
+            return -self.tokens / self.rate
+
+    def adjust(self, cost: float):
+        """
+        Charges (or refunds, if negative) `cost` units without waiting,
+        e.g. once the real size of a reserved request is known.
+        """
+        if self.rate <= 0 or not cost:
+            return
+
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.burst, self.tokens - cost)
+
+    async def acquire(self, cost: float = 1.0):
+        delay = self.reserve(cost)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, cost: float = 1.0):
+        delay = self.reserve(cost)
+        if delay:
+            time.sleep(delay)
+
+
+# -----------------------------------------
+# ADAPTIVE CONCURRENCY (AIMD)
+# -----------------------------------------
+class _Waiter:
+
+    def __init__(self, wake):
+        self.wake = wake
+        self.granted = False
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit tuned by AIMD: each success adds 1/limit (about
+    +1 slot per limit's worth of calls), an overload signal multiplies
+    it down. Calls started before the last cut don't cut again, so one
+    burst of 429s halves the limit once, not once per call.
+
+    Waiters are served in arrival order, from any thread or event loop.
+    """
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 64, backoff: float = 0.5):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.backoff = backoff
+        self.inflight = 0
+        self.cut_at = 0.0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self):
+        return len(self._waiters)
+
+    def _grant(self):
+        # Under self._lock; the caller wakes the returned waiters outside it
+        granted = []
+        while self._waiters and self.inflight < int(self.limit):
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self.inflight += 1
+            granted.append(waiter)
+        return granted
+
+    def _enter(self, waiter: _Waiter):
+        with self._lock:
+            if not self._waiters and self.inflight < int(self.limit):
+                self.inflight += 1
+                return True
+            self._waiters.append(waiter)
+            return False
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = _Waiter(lambda: loop.call_soon_threadsafe(_resolve, future))
+
+        if self._enter(waiter):
+            return
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+            if waiter.granted:
+                self.release()
+            raise
+
+    def acquire_sync(self):
+        event = threading.Event()
+
+        if not self._enter(_Waiter(event.set)):
+            event.wait()
+
+    def release(self):
+        with self._lock:
+            self.inflight -= 1
+            granted = self._grant()
+
+        for waiter in granted:
+            waiter.wake()
+
+    def succeeded(self):
+        with self._lock:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            granted = self._grant()
+
+        for waiter in granted:
+            waiter.wake()
+
+    def overloaded(self, started_at: float, factor: float = None):
+        """
+        Cuts the limit (by `backoff` unless `factor` is given) for a call
+        that started at `started_at` (time.monotonic()) and hit overload.
+        """
+        with self._lock:
+            if started_at < self.cut_at:
+                return
+            self.limit = max(self.minimum, self.limit * (factor or self.backoff))
+            self.cut_at = time.monotonic()
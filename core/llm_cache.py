@@ -0,0 +1,138 @@
+import json
+import hashlib
+import threading
+
+from config import LLM_CACHE_ENABLED, LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL
+from core.disk_cache import DiskCache
+from core.tracing import span, payload_bytes, usage_attributes
+
+
+def content_hash(text: str):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Content-addressed cache around chat.completions.create.
+
+    Key = sha256(model, temperature, messages, resume hash).
+    Misses are sent through `gateway` (core/llm_gateway.py): sync via
+    complete(), async via acomplete(). With `parse`, the parsed
+    completion is returned and only completions it accepts are stored;
+    a stored one it rejects is dropped and fetched again.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, max_bytes: int = LLM_CACHE_MAX_BYTES,
+                 ttl: float = LLM_CACHE_TTL, enabled: bool = LLM_CACHE_ENABLED):
+        self.enabled = enabled
+        self.store = DiskCache(path, "llm", ttl=ttl, max_bytes=max_bytes)
+
+    def key(self, model: str, temperature: float, messages: list, resume_text: str = ""):
+        payload = json.dumps({
+            "model": model,
+            "temperature": temperature,
+            "messages": messages,
+            "resume": content_hash(resume_text),
+        }, sort_keys=True)
+        return content_hash(payload)
+
+    def lookup(self, key: str):
+        if not self.enabled:
+            return None
+
+        cached = self.store.get(key)
+        return None if cached is None else cached["content"]
+
+    def save(self, key: str, content: str):
+        if self.enabled:
+            self.store.set(key, {"content": content})
+
+    def invalidate(self, key: str):
+        if self.enabled:
+            self.store.delete(key)
+
+    def complete(self, gateway, model: str, messages: list, temperature: float,
+                 resume_text: str = "", label: str = "chat", parse=None):
+        key = self.key(model, temperature, messages, resume_text)
+
+        with span(f"llm.{label}", model=model, prompt_bytes=payload_bytes(messages)) as s:
+            cached = self.lookup(key)
+            if cached is not None:
+                try:
+                    result = parse(cached) if parse else cached
+                except Exception:
+                    # Stored before it was checked: drop it, ask the model again
+                    self.invalidate(key)
+                else:
+                    s.set(cache_hit=True, completion_bytes=payload_bytes(cached))
+                    return result
+
+            response = gateway.create(
+                model=model,
+                messages=messages,
+                temperature=temperature
+            )
+            content = response.choices[0].message.content
+
+            s.set(
+                cache_hit=False,
+                completion_bytes=payload_bytes(content or ""),
+                **usage_attributes(getattr(response, "usage", None))
+            )
+
+        # A completion the caller cannot parse is never stored (and replayed)
+        result = parse(content) if parse else content
+        self.save(key, content)
+
+        return result
+
+    async def acomplete(self, gateway, model: str, messages: list, temperature: float,
+                        resume_text: str = "", label: str = "chat", parse=None):
+        key = self.key(model, temperature, messages, resume_text)
+
+        with span(f"llm.{label}", model=model, prompt_bytes=payload_bytes(messages)) as s:
+            cached = self.lookup(key)
+            if cached is not None:
+                try:
+                    result = parse(cached) if parse else cached
+                except Exception:
+                    # Stored before it was checked: drop it, ask the model again
+                    self.invalidate(key)
+                else:
+                    s.set(cache_hit=True, completion_bytes=payload_bytes(cached))
+                    return result
+
+            response = await gateway.acreate(
+                model=model,
+                messages=messages,
+                temperature=temperature
+            )
+            content = response.choices[0].message.content
+
+            s.set(
+                cache_hit=False,
+                completion_bytes=payload_bytes(content or ""),
+                **usage_attributes(getattr(response, "usage", None))
+            )
+
+        # A completion the caller cannot parse is never stored (and replayed)
+        result = parse(content) if parse else content
+        self.save(key, content)
+
+        return result
+
+    def stats(self):
+        return self.store.stats()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+        return _cache
@@ -0,0 +1,336 @@
+import sys
+import time
+import random
+import asyncio
+import threading
+import weakref
+
+from config import (
+    LLM_RPM, LLM_TPM, LLM_BURST_SECONDS, LLM_EXPECTED_OUTPUT_TOKENS, LLM_CONCURRENCY,
+    LLM_MIN_CONCURRENCY, LLM_MAX_CONCURRENCY, LLM_LATENCY_TARGET, LLM_RETRIES,
+    LLM_RETRY_BASE_DELAY, LLM_TIMEOUT
+)
+from core.limits import AdaptiveLimit, TokenBucket
+from core.prompting import count_tokens
+from core.retry import backoff_delay
+from core.startup import init
+from core.tracing import current_span
+
+# Limit cut for a call slower than LLM_LATENCY_TARGET (a 429 halves it)
+SLOW_CALL_FACTOR = 0.9
+
+
+def retry_after(error):
+    """
+    Seconds the server asked for (retry-after-ms / retry-after), or None.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        # HTTP-date form: plain backoff instead
+        return None
+
+    return None
+
+
+class LLMGateway:
+    """
+    Every chat completion goes through here:
+
+    - one client per event loop (sync callers share one), so calls
+      reuse keep-alive connections instead of one client per module
+    - request and token buckets sized to the account's RPM / TPM
+    - an AIMD limit on calls in flight, cut by 429s, 5xx and slow calls
+    - jittered retries on 429 / 5xx / network errors, honouring
+      Retry-After (the SDK's own retries are off)
+
+    Token cost is estimated from the prompt before the call and
+    corrected from `usage` after it. openai is imported with the first
+    client, not with this module (it dominates cold start).
+    """
+
+    def __init__(self, rpm: float = LLM_RPM, tpm: float = LLM_TPM, concurrency: int = LLM_CONCURRENCY,
+                 min_concurrency: int = LLM_MIN_CONCURRENCY, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 latency_target: float = LLM_LATENCY_TARGET, retries: int = LLM_RETRIES,
+                 base_delay: float = LLM_RETRY_BASE_DELAY, timeout: float = LLM_TIMEOUT,
+                 client_options: dict = None):
+        self.requests = TokenBucket(rpm / 60, rpm / 60 * LLM_BURST_SECONDS)
+        self.tokens = TokenBucket(tpm / 60, tpm / 60 * LLM_BURST_SECONDS)
+        self.limit = AdaptiveLimit(concurrency, min_concurrency, max_concurrency)
+        self.latency_target = latency_target
+        self.retries = retries
+        self.base_delay = base_delay
+        self.client_options = {"max_retries": 0, "timeout": timeout, **(client_options or {})}
+
+        self._client = None
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.counters = dict.fromkeys(
+            ("calls", "retries", "rate_limited", "failed", "queue_wait_ms", "max_queue_wait_ms", "latency_ms",
+             "prompt_tokens", "cached_tokens", "prefix_cache_hits"), 0
+        )
+
+    # -----------------------------------------
+    # CLIENTS
+    # -----------------------------------------
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                from openai import OpenAI
+                init()
+                self._client = OpenAI(**self.client_options)
+            return self._client
+
+    def async_client(self):
+        """
+        AsyncOpenAI for the running loop (its connections belong to it).
+        """
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                from openai import AsyncOpenAI
+                init()
+                client = self._async_clients[loop] = AsyncOpenAI(**self.client_options)
+            return client
+
+    # -----------------------------------------
+    # ADMISSION / OUTCOMES
+    # -----------------------------------------
+    def estimate_tokens(self, request: dict):
+        prompt = sum(count_tokens(str(message.get("content") or "")) for message in request.get("messages", []))
+        return prompt + (request.get("max_tokens") or LLM_EXPECTED_OUTPUT_TOKENS)
+
+    def _count(self, **amounts):
+        with self._lock:
+            for key, amount in amounts.items():
+                self.counters[key] += amount
+
+    def _waited(self, since: float):
+        waited_ms = (time.monotonic() - since) * 1000
+
+        with self._lock:
+            self.queued -= 1
+            self.counters["queue_wait_ms"] += waited_ms
+            self.counters["max_queue_wait_ms"] = max(self.counters["max_queue_wait_ms"], waited_ms)
+
+        current_span().add("queue_wait_ms", round(waited_ms, 1))
+
+    async def _admit(self, cost: float):
+        """
+        A slot under the concurrency limit, then request + token budget.
+        """
+        since = time.monotonic()
+        with self._lock:
+            self.queued += 1
+
+        try:
+            await self.limit.acquire()
+            try:
+                await self.requests.acquire()
+                await self.tokens.acquire(cost)
+            except BaseException:
+                self.limit.release()
+                raise
+        finally:
+            self._waited(since)
+
+    def _admit_sync(self, cost: float):
+        since = time.monotonic()
+        with self._lock:
+            self.queued += 1
+
+        try:
+            self.limit.acquire_sync()
+            try:
+                self.requests.acquire_sync()
+                self.tokens.acquire_sync(cost)
+            except BaseException:
+                self.limit.release()
+                raise
+        finally:
+            self._waited(since)
+
+    def _succeeded(self, started: float):
+        latency = time.monotonic() - started
+
+        if self.latency_target and latency > self.latency_target:
+            self.limit.overloaded(started, SLOW_CALL_FACTOR)
+        else:
+            self.limit.succeeded()
+
+        self._count(calls=1, latency_ms=latency * 1000)
+
+    def _used(self, usage, cost: float):
+        total = getattr(usage, "total_tokens", None)
+        if total is not None:
+            self.tokens.adjust(total - cost)
+
+        # Prompt tokens the provider served from its prefix cache
+        cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None) or 0
+        self._count(
+            prompt_tokens=getattr(usage, "prompt_tokens", None) or 0,
+            cached_tokens=cached,
+            prefix_cache_hits=int(cached > 0)
+        )
+
+    def _retry_delay(self, error: Exception, started: float, attempt: int):
+        """
+        Seconds to wait before the next attempt, or None to give up.
+        """
+        from openai import APIConnectionError, InternalServerError, RateLimitError
+
+        # APITimeoutError is an APIConnectionError
+        retryable = (RateLimitError, APIConnectionError, InternalServerError)
+
+        self._count(failed=1)
+
+        if isinstance(error, RateLimitError):
+            self._count(rate_limited=1)
+            self.limit.overloaded(started)
+            # Out of credit, not out of pace: waiting won't help
+            if getattr(error, "code", None) == "insufficient_quota":
+                return None
+        elif isinstance(error, InternalServerError):
+            self.limit.overloaded(started)
+
+        if not isinstance(error, retryable) or attempt > self.retries:
+            return None
+
+        self._count(retries=1)
+        current_span().add("retries")
+
+        asked = retry_after(error)
+        delay = asked + random.uniform(0, self.base_delay) if asked is not None else backoff_delay(attempt, self.base_delay)
+
+        print(f"⚠ LLM call failed ({type(error).__name__}); retry {attempt}/{self.retries} in {delay:.1f}s",
+              file=sys.stderr)
+        return delay
+
+    # -----------------------------------------
+    # CALLS
+    # -----------------------------------------
+    async def acreate(self, **request):
+        """
+        chat.completions.create (async, not streamed).
+        """
+        cost = self.estimate_tokens(request)
+
+        for attempt in range(1, self.retries + 2):
+            await self._admit(cost)
+            started = time.monotonic()
+            try:
+                response = await self.async_client().chat.completions.create(**request)
+            except Exception as e:
+                delay = self._retry_delay(e, started, attempt)
+                if delay is None:
+                    raise
+            else:
+                self._succeeded(started)
+                self._used(getattr(response, "usage", None), cost)
+                return response
+            finally:
+                self.limit.release()
+
+            await asyncio.sleep(delay)
+
+    def create(self, **request):
+        """
+        chat.completions.create (blocking, not streamed).
+        """
+        cost = self.estimate_tokens(request)
+
+        for attempt in range(1, self.retries + 2):
+            self._admit_sync(cost)
+            started = time.monotonic()
+            try:
+                response = self.client().chat.completions.create(**request)
+            except Exception as e:
+                delay = self._retry_delay(e, started, attempt)
+                if delay is None:
+                    raise
+            else:
+                self._succeeded(started)
+                self._used(getattr(response, "usage", None), cost)
+                return response
+            finally:
+                self.limit.release()
+
+            time.sleep(delay)
+
+    def stream(self, **request):
+        """
+        Streamed chat.completions.create (blocking): yields the events.
+        Opening the stream is retried; a stream that breaks midway
+        raises to the caller. The slot is held until the stream ends.
+        """
+        cost = self.estimate_tokens(request)
+
+        for attempt in range(1, self.retries + 2):
+            self._admit_sync(cost)
+            started = time.monotonic()
+            try:
+                events = self.client().chat.completions.create(stream=True, **request)
+                break
+            except Exception as e:
+                self.limit.release()
+                delay = self._retry_delay(e, started, attempt)
+                if delay is None:
+                    raise
+
+            time.sleep(delay)
+
+        # Time to the first event is the latency signal for a stream
+        self._succeeded(started)
+
+        try:
+            for event in events:
+                if getattr(event, "usage", None) is not None:
+                    self._used(event.usage, cost)
+                yield event
+        finally:
+            self.limit.release()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+            queued = self.queued
+
+        calls = counters.pop("calls")
+        queue_wait_ms = counters.pop("queue_wait_ms")
+        latency_ms = counters.pop("latency_ms")
+
+        return {
+            "concurrency_limit": round(self.limit.limit, 2),
+            "in_flight": self.limit.inflight,
+            "queued": queued,
+            "calls": calls,
+            **counters,
+            "mean_queue_wait_ms": round(queue_wait_ms / max(1, calls + counters["failed"]), 1),
+            "max_queue_wait_ms": round(counters["max_queue_wait_ms"], 1),
+            "mean_latency_ms": round(latency_ms / max(1, calls), 1),
+            "prefix_cache_hit_rate": round(counters["cached_tokens"] / max(1, counters["prompt_tokens"]), 3),
+            "rpm_waits": self.requests.waits,
+            "tpm_waits": self.tokens.waits,
+        }
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway():
+    global _gateway
+
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
@@ -0,0 +1,41 @@
+import asyncio
+import threading
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+
+def get_loop():
+    """
+    Process-wide event loop running on a daemon thread.
+    Lets sync callers (Streamlit, CLI) share one loop, and
+    anything bound to it (browser sessions, async clients).
+    """
+    global _loop, _thread
+
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever,
+                name="shared-event-loop",
+                daemon=True
+            )
+            _thread.start()
+
+    return _loop
+
+
+def run_sync(coro, timeout=None):
+    """
+    Run a coroutine on the shared loop and block for its result.
+    """
+    loop = get_loop()
+
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() called from the shared loop thread.")
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    return future.result(timeout)
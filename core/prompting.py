@@ -0,0 +1,328 @@
+import re
+import hashlib
+import threading
+
+from config import RESUME_PATH
+from core.tracing import current_span
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def get_encoding():
+    """
+    tiktoken's encoder, loaded on first use (reading its BPE ranks
+    takes longer than the rest of the import); None without tiktoken.
+    """
+    global _encoding, _encoding_loaded
+
+    if _encoding_loaded:
+        return _encoding
+
+    with _encoding_lock:
+        if not _encoding_loaded:
+            try:
+                import tiktoken
+                _encoding = tiktoken.get_encoding("o200k_base")
+            except Exception:
+                _encoding = None
+            _encoding_loaded = True
+
+    return _encoding
+
+
+def count_tokens(text: str):
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # ~4 chars per token for English prose
+    return len(text) // 4 + 1 if text else 0
+
+
+# -----------------------------------------
+# RESUME (loaded once, reloaded when mtime changes)
+# -----------------------------------------
+class ResumeStore:
+
+    def __init__(self, path=RESUME_PATH):
+        self.path = path
+        self._mtime = None
+        self._text = None
+        self._digest = None
+        self._lock = threading.Lock()
+
+    def text(self):
+        if not self.path.exists():
+            raise FileNotFoundError("master_resume.md not found in data folder.")
+
+        mtime = self.path.stat().st_mtime_ns
+
+        with self._lock:
+            if mtime != self._mtime:
+                self._text = self.path.read_text(encoding="utf-8")
+                self._digest = hashlib.sha256(self._text.encode("utf-8")).hexdigest()[:16]
+                self._mtime = mtime
+            return self._text
+
+    def digest(self):
+        """
+        Short hash of the current resume text.
+        """
+        self.text()
+        return self._digest
+
+
+_resume_store = None
+_resume_lock = threading.Lock()
+
+
+def get_resume_store():
+    global _resume_store
+
+    with _resume_lock:
+        if _resume_store is None:
+            _resume_store = ResumeStore()
+        return _resume_store
+
+
+# -----------------------------------------
+# SECTIONS
+# -----------------------------------------
+_HEADING_RE = re.compile(r"^\s*(#{1,6}\s+.+|[A-Z][^.!?]{1,60}:\s*)$")
+
+# Job-board headings that come without markdown or a colon
+_BARE_HEADING_RE = re.compile(
+    r"^\s*(about [^.!?]{1,50}|skill\(s\) required|skills required|who can apply|"
+    r"perks|benefits|other requirements|number of openings|responsibilities|requirements)\s*$",
+    re.IGNORECASE
+)
+
+# Headings whose sections go first when a prompt is over budget
+_BOILERPLATE_RE = re.compile(
+    r"perk|benefit|about us|who we are|why join|equal opportunit|"
+    r"number of openings|our culture|life at|"
+    r"^about (?!the (internship|job|role|work)|this)",
+    re.IGNORECASE
+)
+
+
+def split_sections(text: str):
+    """
+    [(heading, [lines])]; text before the first heading has heading "".
+    """
+    sections = [("", [])]
+
+    for line in text.splitlines():
+        if _HEADING_RE.match(line) or _BARE_HEADING_RE.match(line):
+            sections.append((line.strip().lstrip("#").strip().rstrip(":"), [line]))
+        else:
+            sections[-1][1].append(line)
+
+    return [(heading, lines) for heading, lines in sections if heading or any(l.strip() for l in lines)]
+
+
+def is_boilerplate(heading: str):
+    return bool(heading) and bool(_BOILERPLATE_RE.search(heading))
+
+
+def dedupe_lines(sections: list):
+    """
+    Drop repeated non-blank lines within one document
+    (scraped listings often repeat blocks verbatim).
+    """
+    seen = set()
+    deduped = []
+
+    for heading, lines in sections:
+        kept = []
+        for line in lines:
+            key = " ".join(line.lower().split())
+            if key and key in seen:
+                continue
+            if key:
+                seen.add(key)
+            kept.append(line)
+        deduped.append((heading, kept))
+
+    return deduped
+
+
+def join_sections(sections: list):
+    return "\n".join(line for _, lines in sections for line in lines).strip()
+
+
+def trim_to_tokens(sections: list, budget: int):
+    """
+    Keep sections and lines in order until `budget` tokens are used.
+    """
+    kept = []
+    used = 0
+
+    for heading, lines in sections:
+        kept_lines = []
+        for line in lines:
+            cost = count_tokens(line) + 1
+            if used + cost > budget:
+                remaining = budget - used
+                if remaining > 8:
+                    kept_lines.append(line[:remaining * 4].rstrip() + " …")
+                if kept_lines:
+                    kept.append((heading, kept_lines))
+                return kept
+            kept_lines.append(line)
+            used += cost
+        kept.append((heading, kept_lines))
+
+    return kept
+
+
+# -----------------------------------------
+# BUDGETED ASSEMBLY
+# -----------------------------------------
+class PromptStats:
+
+    def __init__(self):
+        self.calls = 0
+        self.original_tokens = 0
+        self.final_tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, report: dict):
+        with self._lock:
+            self.calls += 1
+            self.original_tokens += report["original_tokens"]
+            self.final_tokens += report["final_tokens"]
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "original_tokens": self.original_tokens,
+                "final_tokens": self.final_tokens,
+                "saved_tokens": self.original_tokens - self.final_tokens,
+            }
+
+
+prompt_stats = PromptStats()
+
+
+def fit_to_budget(fixed_text: str, resume_text: str, descriptions: list, budget: int, label: str = "",
+                  resume_share: float = None):
+    """
+    Compact the resume and job descriptions so that, together with the
+    fixed instructions, they fit in `budget` tokens.
+
+    1. duplicate lines within a document are always removed
+    2. over budget -> boilerplate sections (perks, about-us, ...) go first
+    3. still over  -> water-filling: every part gets a fair share,
+                      short parts keep everything, long parts are trimmed
+
+    With `resume_share` the resume is instead compacted on its own, to
+    at most that share of `budget`, and the descriptions split what is
+    left: the same resume then reads the same in every prompt, which
+    keeps the prompt prefix cacheable (see PromptTemplate).
+
+    Returns (resume_text, descriptions, report).
+    """
+    original_tokens = count_tokens(fixed_text) + count_tokens(resume_text) + sum(
+        count_tokens(text or "") for text in descriptions
+    )
+
+    parts = [dedupe_lines(split_sections(resume_text))]
+
+    if resume_share is not None:
+        # Fitted on its own, then fixed for the descriptions' share
+        cap = int(budget * resume_share)
+        if count_tokens(join_sections(parts[0])) > cap:
+            parts[0] = trim_to_tokens(parts[0], cap)
+        resume_text = join_sections(parts.pop(0))
+        fixed_text += resume_text
+
+    parts += [dedupe_lines(split_sections(text or "")) for text in descriptions]
+
+    available = max(budget - count_tokens(fixed_text), 0)
+    sizes = [count_tokens(join_sections(part)) for part in parts]
+
+    if sum(sizes) > available:
+        parts = [
+            [(heading, lines) for heading, lines in part if not is_boilerplate(heading)]
+            for part in parts
+        ]
+        sizes = [count_tokens(join_sections(part)) for part in parts]
+
+    if sum(sizes) > available:
+        shares = [0] * len(parts)
+        pending = sorted(range(len(parts)), key=lambda i: sizes[i])
+        remaining = available
+
+        while pending:
+            fair = remaining // len(pending)
+            i = pending.pop(0)
+            shares[i] = min(sizes[i], fair)
+            remaining -= shares[i]
+
+        parts = [
+            part if sizes[i] <= shares[i] else trim_to_tokens(part, shares[i])
+            for i, part in enumerate(parts)
+        ]
+
+    texts = [join_sections(part) for part in parts]
+
+    final_tokens = count_tokens(fixed_text) + sum(count_tokens(text) for text in texts)
+
+    report = {
+        "label": label,
+        "budget": budget,
+        "original_tokens": original_tokens,
+        "final_tokens": final_tokens,
+        "saved_tokens": original_tokens - final_tokens,
+    }
+    prompt_stats.record(report)
+    current_span().add("prompt_original_tokens", original_tokens).add("prompt_final_tokens", final_tokens).add(
+        "prompt_saved_tokens", report["saved_tokens"]
+    )
+
+    if resume_share is not None:
+        return resume_text, texts, report
+
+    return texts[0], texts[1:], report
+
+
+# -----------------------------------------
+# TEMPLATES
+# -----------------------------------------
+class PromptTemplate:
+    """
+    A chat prompt laid out most-stable-first, so calls sharing a prefix
+    hit the provider's prompt cache (OpenAI caches prefixes from 1024
+    tokens, in 128-token steps; a cached token skips prefill):
+
+      system + static   instructions, rubric, output format: every call
+      resume            the candidate resume: every call for that resume
+      request           query / job fields: this call only
+
+    `resume` and `request` are str.format templates; `static` is used
+    as is, so JSON examples in it keep single braces.
+    """
+
+    def __init__(self, system: str, static: str, resume: str, request: str):
+        self.system = system
+        self.static = static
+        self.resume = resume
+        self.request = request
+
+    def prefix(self, resume_text: str):
+        """
+        The user-message text shared by every call for this resume.
+        """
+        return self.static + self.resume.format(resume_text=resume_text)
+
+    def render(self, resume_text: str, **fields):
+        return self.prefix(resume_text) + self.request.format(**fields)
+
+    def messages(self, resume_text: str, **fields):
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.render(resume_text, **fields)},
+        ]
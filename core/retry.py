@@ -0,0 +1,32 @@
+import sys
+import random
+import asyncio
+
+from config import STAGE_RETRIES, STAGE_RETRY_BASE_DELAY
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float = 30.0):
+    """
+    Exponential backoff with full jitter (attempt starts at 1).
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+async def retry_async(fn, attempts: int = STAGE_RETRIES, base_delay: float = STAGE_RETRY_BASE_DELAY,
+                      give_up_on=(), label: str = ""):
+    """
+    Await fn() up to `attempts` times. Exceptions in `give_up_on`
+    (and cancellation) propagate immediately.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return await fn()
+        except give_up_on:
+            raise
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            delay = backoff_delay(attempt, base_delay)
+            print(f"⚠ {label or 'stage'} failed ({e}); retry {attempt}/{attempts - 1} in {delay:.1f}s", file=sys.stderr)
+            await asyncio.sleep(delay)
+
@@ -0,0 +1,105 @@
+import json
+import hashlib
+import threading
+
+from config import SCORE_INDEX_ENABLED, SCORE_INDEX_PATH, SCORE_INDEX_TTL, SCORE_INDEX_MAX_ENTRIES
+from core.disk_cache import DiskCache
+from core.job_cache import normalize_query
+
+
+def content_hash(value):
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+def job_hash(job: dict):
+    """
+    Hash of what the Analyst reads; an edited listing gets a new one.
+    """
+    return content_hash({
+        "title": job.get("title", ""),
+        "company": job.get("company", ""),
+        "description": job.get("description", ""),
+    })
+
+
+class ScoreIndex:
+    """
+    Analyst scores keyed by (scorer, resume hash, normalized query, job hash).
+
+    The resume hash in every key means an edited master_resume.md
+    never reuses old scores; the first lookup under a new resume also
+    drops the old ones so they don't linger until eviction.
+    """
+
+    def __init__(self, path=SCORE_INDEX_PATH, ttl: float = SCORE_INDEX_TTL,
+                 max_entries: int = SCORE_INDEX_MAX_ENTRIES, enabled: bool = SCORE_INDEX_ENABLED):
+        self.enabled = enabled
+        self.scores = DiskCache(path, "scores", ttl=ttl, max_entries=max_entries)
+        self.meta = DiskCache(path, "score_meta")
+        self._resume_hash = None
+        self._lock = threading.Lock()
+
+    def _key(self, scorer: str, resume_hash: str, query: str, job: dict):
+        return f"{scorer}:{resume_hash}:{normalize_query(query)}:{job_hash(job)}"
+
+    def _check_resume(self, resume_hash: str):
+        with self._lock:
+            if resume_hash == self._resume_hash:
+                return
+
+            if self.meta.get("resume_hash") not in (None, resume_hash):
+                self.scores.clear()
+            self.meta.set("resume_hash", resume_hash)
+            self._resume_hash = resume_hash
+
+    def lookup(self, jobs: list, query: str, resume_text: str, scorer: str = ""):
+        """
+        {position in jobs: {"match_score", "reason"}} for the jobs
+        already scored under this resume and query.
+        """
+        if not self.enabled:
+            return {}
+
+        resume_hash = content_hash(resume_text)
+        self._check_resume(resume_hash)
+
+        found = {}
+        for position, job in enumerate(jobs):
+            entry = self.scores.get(self._key(scorer, resume_hash, query, job))
+            if entry is not None:
+                found[position] = entry
+
+        return found
+
+    def store(self, scored: list, query: str, resume_text: str, scorer: str = ""):
+        """
+        Records scored jobs (dicts with match_score / reason).
+        """
+        if not self.enabled:
+            return
+
+        resume_hash = content_hash(resume_text)
+
+        for job in scored:
+            self.scores.set(
+                self._key(scorer, resume_hash, query, job),
+                {"match_score": job["match_score"], "reason": job.get("reason", "")}
+            )
+
+    def stats(self):
+        return self.scores.stats()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_score_index():
+    global _index
+
+    with _index_lock:
+        if _index is None:
+            _index = ScoreIndex()
+        return _index
@@ -0,0 +1,68 @@
+import sys
+import asyncio
+import threading
+import importlib
+
+_done = False
+_nested = False
+_lock = threading.Lock()
+
+
+def init():
+    """
+    One-time process setup, shared by every entry point (app.py,
+    runner.py, service.py, the Scout worker) and by the LLM / browser
+    clients on first use. Later calls return immediately.
+    """
+    global _done
+
+    with _lock:
+        if _done:
+            return
+
+        if sys.platform.startswith("win"):
+            # Fix Windows subprocess issue for browser_use
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+        from dotenv import load_dotenv
+        load_dotenv()
+
+        _done = True
+
+
+def allow_nested_loops():
+    """
+    nest_asyncio, applied at most once per process and only where it
+    matters: a thread that already has a loop running. Pipeline code
+    runs on the shared loop (core/loop.py) and never nests.
+    """
+    global _nested
+
+    with _lock:
+        if _nested:
+            return
+        _nested = True
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    import nest_asyncio
+    nest_asyncio.apply()
+
+
+def preload(*modules: str):
+    """
+    Imports `modules` on a daemon thread, so a heavy import (openai)
+    is done by the time the first run needs it without holding up
+    startup.
+    """
+    def load():
+        for module in modules:
+            try:
+                importlib.import_module(module)
+            except ImportError:
+                pass
+
+    threading.Thread(target=load, name="preload", daemon=True).start()
@@ -0,0 +1,367 @@
+import os
+import json
+import time
+import uuid
+import threading
+import contextvars
+from collections import OrderedDict
+
+from config import TRACE_ENABLED, TRACE_JSONL_PATH, TRACE_OTLP_DIR, TRACE_KEEP
+
+SERVICE_NAME = "agent-job-hunter"
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+_traces = OrderedDict()
+_traces_lock = threading.Lock()
+_file_lock = threading.Lock()
+
+
+# -----------------------------------------
+# SPANS
+# -----------------------------------------
+class Span:
+    """
+    One timed unit of work. Use as a context manager (it becomes the
+    parent of spans opened inside it, across awaits and tasks) or call
+    end() yourself. Attributes hold tokens, sizes, counts, flags.
+    """
+
+    def __init__(self, name: str, trace=None, parent=None, attributes: dict = None):
+        self.name = name
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = {}
+        self.set(**(attributes or {}))
+        self.start_time = time.time()
+        self.duration_ms = None
+        self.error = None
+        self._started = time.perf_counter()
+        self._token = None
+
+    @property
+    def trace_id(self):
+        return self.trace.trace_id if self.trace is not None else None
+
+    def set(self, **attributes):
+        self.attributes.update({key: value for key, value in attributes.items() if value is not None})
+        return self
+
+    def add(self, key: str, amount=1):
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+        return self
+
+    def elapsed_ms(self):
+        return round((time.perf_counter() - self._started) * 1000, 3)
+
+    def end(self, error: str = None):
+        if self.duration_ms is not None:
+            return
+
+        self.duration_ms = self.elapsed_ms()
+        self.error = error
+
+        if self.trace is not None:
+            self.trace.record(self)
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        error = None
+        if exc is not None and not isinstance(exc, GeneratorExit):
+            error = f"{exc_type.__name__}: {exc}"
+
+        self.end(error)
+
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Closed from another context (e.g. an abandoned async generator)
+            pass
+
+        return False
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NullSpan:
+    # Returned when tracing is off; same surface, records nothing
+
+    trace = None
+    trace_id = None
+    span_id = None
+
+    def set(self, **attributes):
+        return self
+
+    def add(self, key, amount=1):
+        return self
+
+    def elapsed_ms(self):
+        return 0.0
+
+    def end(self, error=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Trace:
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.spans = []
+        self.root = None
+        self._lock = threading.Lock()
+
+    def record(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+        if TRACE_JSONL_PATH:
+            append_jsonl(TRACE_JSONL_PATH, [span.to_dict()])
+
+        if span is self.root and TRACE_OTLP_DIR:
+            path = TRACE_OTLP_DIR / f"{self.trace_id}.json"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(to_otlp(self.span_dicts())), encoding="utf-8")
+
+    def span_dicts(self):
+        with self._lock:
+            return [span.to_dict() for span in self.spans]
+
+
+def trace(name: str, **attributes):
+    """
+    Root span of a new trace (one pipeline run). The finished trace
+    stays available through get_trace(trace_id).
+    """
+    if not TRACE_ENABLED:
+        return NULL_SPAN
+
+    new_trace = Trace(name)
+    root = Span(name, new_trace, attributes=attributes)
+    new_trace.root = root
+
+    with _traces_lock:
+        _traces[new_trace.trace_id] = new_trace
+        while len(_traces) > TRACE_KEEP:
+            _traces.popitem(last=False)
+
+    return root
+
+
+def span(name: str, parent=None, **attributes):
+    """
+    Child of `parent` (default: the span currently open in this context).
+    Outside any trace the span is timed but not recorded.
+    """
+    if not TRACE_ENABLED:
+        return NULL_SPAN
+
+    parent = parent if parent is not None else _current.get()
+    if parent is NULL_SPAN:
+        parent = None
+
+    return Span(name, parent.trace if parent is not None else None, parent, attributes)
+
+
+def current_span():
+    return _current.get() or NULL_SPAN
+
+
+def get_trace(trace_id: str):
+    """
+    Finished spans of a recent trace as dicts, oldest first.
+    """
+    with _traces_lock:
+        found = _traces.get(trace_id)
+
+    if found is None:
+        return []
+
+    return sorted(found.span_dicts(), key=lambda item: item["start_time"])
+
+
+# -----------------------------------------
+# HELPERS
+# -----------------------------------------
+def payload_bytes(value):
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def usage_attributes(usage):
+    """
+    Token counts from an OpenAI `usage` object (or None).
+    """
+    if usage is None:
+        return {}
+
+    details = getattr(usage, "prompt_tokens_details", None)
+
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+        # Prompt tokens served from the provider's prefix cache
+        "cached_tokens": getattr(details, "cached_tokens", None) or 0,
+    }
+
+
+def prefix_cache_saved_ms(calls: list):
+    """
+    Estimated latency saved by the provider's prefix cache: per kind of
+    call (span name + model), mean latency of calls with no cached
+    tokens minus that of calls with some, times the calls with some.
+    """
+    groups = {}
+
+    for item in calls:
+        attributes = item["attributes"]
+        key = (item["name"], attributes.get("model"))
+        latency = item["duration_ms"] - attributes.get("queue_wait_ms", 0)
+        groups.setdefault(key, ([], []))[attributes.get("cached_tokens", 0) > 0].append(latency)
+
+    saved = 0.0
+    for misses, hits in groups.values():
+        if misses and hits:
+            saved += max(0.0, sum(misses) / len(misses) - sum(hits) / len(hits)) * len(hits)
+
+    return round(saved, 1)
+
+
+def summarize(spans: list):
+    """
+    Totals for a trace: wall time, per-stage time and LLM token usage.
+    """
+    roots = [item for item in spans if item["parent_id"] is None]
+    llm = [item for item in spans if item["name"].startswith("llm.")]
+    # Calls that reached the provider and reported usage
+    calls = [item for item in llm if "prompt_tokens" in item["attributes"]]
+
+    def total(key):
+        return sum(item["attributes"].get(key, 0) for item in llm)
+
+    def count(key):
+        return sum(item["attributes"].get(key, 0) for item in spans)
+
+    rescored = count("cascade_rescored")
+    cascades = count("cascade_runs")
+    prompt_tokens = total("prompt_tokens")
+
+    return {
+        "total_ms": round(sum(item["duration_ms"] for item in roots), 1),
+        "stages": {
+            item["name"]: round(item["duration_ms"], 1)
+            for item in spans if item["name"].startswith("stage.")
+        },
+        "llm_calls": len(llm),
+        "llm_cache_hits": sum(1 for item in llm if item["attributes"].get("cache_hit")),
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": total("completion_tokens"),
+        "cached_tokens": total("cached_tokens"),
+        # Provider prefix cache: calls with cached tokens, share of
+        # prompt tokens served from it, latency it saved
+        "prefix_cache_hits": sum(1 for item in calls if item["attributes"].get("cached_tokens", 0) > 0),
+        "prefix_cache_hit_rate": round(total("cached_tokens") / prompt_tokens, 3) if prompt_tokens else None,
+        "prefix_cache_saved_ms": prefix_cache_saved_ms(calls),
+        "llm_queue_wait_ms": round(total("queue_wait_ms"), 1),
+        "llm_retries": total("retries"),
+        # Compaction by core/prompting.fit_to_budget
+        "prompt_saved_tokens": count("prompt_saved_tokens"),
+        "duplicates_removed": sum(item["attributes"].get("duplicates_removed", 0) for item in spans),
+        "score_index_hits": sum(item["attributes"].get("score_index_hits", 0) for item in spans),
+        # Model cascade (agents/analyst.py): share of re-scored jobs the
+        # tiers agreed on, and of runs where both picked the same leader
+        "cascade_rescored": rescored,
+        "cascade_agreement": round(count("cascade_agreed") / rescored, 3) if rescored else None,
+        "cascade_same_leader": round(count("cascade_same_leader") / cascades, 3) if cascades else None,
+    }
+
+
+# -----------------------------------------
+# EXPORT
+# -----------------------------------------
+def to_jsonl(spans: list):
+    return "".join(json.dumps(item) + "\n" for item in spans)
+
+
+def append_jsonl(path, spans: list):
+    with _file_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(to_jsonl(spans))
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: list):
+    """
+    OTLP/JSON (the body of an OTLP HTTP export), so traces can be
+    loaded into any OpenTelemetry collector or viewer.
+    """
+    otlp_spans = []
+
+    for item in spans:
+        start_ns = int(item["start_time"] * 1e9)
+        otlp_span = {
+            "traceId": item["trace_id"],
+            "spanId": item["span_id"],
+            "name": item["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(item["duration_ms"] * 1e6)),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in item["attributes"].items()
+            ],
+            "status": {"code": 2, "message": item["error"]} if item["error"] else {"code": 1},
+        }
+        if item["parent_id"]:
+            otlp_span["parentSpanId"] = item["parent_id"]
+        otlp_spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [{
+            "resource": {
+                "attributes": [
+                    {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                    {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+                ]
+            },
+            "scopeSpans": [{
+                "scope": {"name": SERVICE_NAME},
+                "spans": otlp_spans,
+            }]
+        }]
+    }
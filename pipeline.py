@@ -1,73 +1,524 @@
 import sys
-import subprocess
 import json
-import re
-from agents.analyst import rank_jobs
-from agents.tailor import tailor_application
+import time
+import asyncio
+from config import (
+    SCOUT_MAX_JOBS, TAILOR_TOP_N, RANK_CONCURRENCY, RANK_STREAM_BATCH, RANK_STREAM_FLUSH_SECONDS,
+    PRERANK_TOP_K, SPECULATIVE_TAILOR_THRESHOLD,
+    STAGE_RETRIES, STAGE_RETRY_BASE_DELAY, RANK_CASCADE_FIRST_PASS
+)
+from agents.analyst import afirst_pass, arank_jobs, arefine, load_resume, local_fallback
+from agents.prerank import job_text, prerank_jobs, prerank_scores
+from agents.tailor import atailor_application, atailor_many, stream_tailor_application
+from agents.scout_pool import get_scout_backend
+from core.job_cache import get_job_cache
+from core.checkpoints import get_checkpoint_store
+from core.dedup import dedup_session
+from core.limits import stage_slot
+from core.loop import get_loop, run_sync
+from core.retry import backoff_delay, retry_async
+from core.tracing import current_span, span, trace
 
 
-def extract_json_array(text: str):
+# ==========================================
+# STEP 1 — SCOUT (cached; see config.SCOUT_MODE)
+# ==========================================
+async def astream_jobs(query: str, refresh: bool = False):
     """
-    Extract first valid JSON array from noisy logs.
+    Yields (result_index, job) as Scout extracts them,
+    or straight from the job cache when it is fresh.
     """
-    match = re.search(r"\[\s*{.*}\s*\]", text, re.DOTALL)
-    if not match:
-        return None
-    return match.group(0)
+    cache = get_job_cache()
+    jobs = None if refresh else cache.get_jobs(query, SCOUT_MAX_JOBS)
+
+    current_span().set(job_cache="hit" if jobs is not None else "miss")
+
+    if jobs is not None:
+        for pair in enumerate(jobs):
+            yield pair
+        return
+
+    pairs = []
+
+    async for index, job in get_scout_backend().astream(query, SCOUT_MAX_JOBS):
+        pairs.append((index, job))
+        yield index, job
+
+    pairs.sort(key=lambda pair: pair[0])
+    jobs = [job for _, job in pairs]
+
+    if jobs:
+        cache.put_jobs(query, SCOUT_MAX_JOBS, jobs)
+
+
+# ==========================================
+# STEP 2 — ANALYST (scores jobs as they arrive)
+# ==========================================
+def rank_key(pair):
+    # strong-model scores before first-pass ones (agents/analyst.rank_order),
+    # highest score first, ties keep result-page order
+    index, job = pair
+    return job.get("score_tier") == "first_pass", -job["match_score"], index
+
+
+class NoJobsFound(RuntimeError):
+    pass
+
+
+async def ascout_and_score(query: str, refresh: bool = False, on_leader=None, on_scouted=None,
+                           on_progress=None, fallback: bool = True, top_k: int = PRERANK_TOP_K):
+    """
+    Overlaps Scout and Analyst: jobs are scored in micro-chunks while
+    Scout is still running (RANK_STREAM_BATCH / RANK_STREAM_FLUSH_SECONDS),
+    skipping duplicates of one already seen in this run (core/dedup.py).
+    At most `top_k` jobs are sent (PRERANK_TOP_K, 0 = all): the first
+    ones as they arrive, then the rest of the budget goes to the best
+    of the others by local pre-rank once Scout is done. With a model
+    cascade that is the first pass; the top band is re-scored after.
+    `on_leader(job)` fires whenever a new job takes the lead (first-pass scores);
+    `on_scouted(jobs)` fires once Scout is done, before scoring finishes;
+    `on_progress(stage, **counts)` fires on every job found / chunk scored.
+    Returns the full ranking; the local one if the analyst is
+    unavailable (with fallback=False, openai.APIError is raised).
+    """
+    from openai import APIError
+
+    resume_text = load_resume()
+    semaphore = asyncio.Semaphore(max(1, RANK_CONCURRENCY))
+    dedup = dedup_session()
+    loop = asyncio.get_running_loop()
+
+    seen = []
+    # (index, job) waiting for the next micro-chunk / held for the pre-rank
+    pending = []
+    held = []
+    sent = 0
+    flush_timer = None
+    scored = []
+    leader = None
+    score_tasks = []
+    # Opened with the first job; scoring overlaps the rest of Scout
+    analyst_span = None
+
+    async def score_chunk(chunk):
+        nonlocal leader
+
+        with span("analyst.score_chunk", parent=analyst_span, jobs=len(chunk)):
+            results = await afirst_pass([job for _, job in chunk], query, resume_text, semaphore)
+
+        previous = leader
+        for (index, _), result in zip(chunk, results):
+            scored.append((index, result))
+            if leader is None or rank_key((index, result)) < rank_key(leader):
+                leader = (index, result)
+
+        if on_progress:
+            on_progress("analyst" if scouted else "scout", jobs=len(seen), scored=len(scored))
 
+        if leader is not previous and on_leader:
+            on_leader(leader[1])
 
-def run_agent(query: str):
+    def flush():
+        nonlocal flush_timer, sent
+
+        if flush_timer is not None:
+            flush_timer.cancel()
+            flush_timer = None
+
+        if pending:
+            sent += len(pending)
+            score_tasks.append(asyncio.ensure_future(score_chunk(list(pending))))
+            pending.clear()
+
+    stage_parent = current_span()
+    scouted = False
+
+    if on_progress:
+        on_progress("scout", jobs=0, scored=0)
 
-    # ==========================================
-    # STEP 1 — SCOUT (subprocess safe mode)
-    # ==========================================
     try:
-        process = subprocess.run(
-            [sys.executable, "agents/scout.py", query],
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        with span("stage.scout") as scout_span:
+            async with stage_slot("scout"):
+                async for index, job in astream_jobs(query, refresh):
+                    job = dedup.check(job)
+                    if job is None:
+                        continue
+                    if analyst_span is None:
+                        analyst_span = span("stage.analyst", parent=stage_parent)
+                    seen.append(job)
+
+                    if top_k > 0 and sent + len(pending) >= top_k:
+                        held.append((index, job))
+                    else:
+                        pending.append((index, job))
+                        if len(pending) >= RANK_STREAM_BATCH:
+                            flush()
+                        elif flush_timer is None:
+                            flush_timer = loop.call_later(RANK_STREAM_FLUSH_SECONDS, flush)
+
+                    if on_progress:
+                        on_progress("scout", jobs=len(seen), scored=len(scored))
+            scout_span.set(jobs=len(seen), **dedup.report())
 
-        raw_output = process.stdout.strip()
+        scouted = True
 
-        json_block = extract_json_array(raw_output)
+        if on_scouted and seen:
+            on_scouted(list(seen))
 
-        if not json_block:
-            raise RuntimeError(f"Could not extract JSON from Scout:\n{raw_output}")
+        if on_progress:
+            on_progress("analyst", jobs=len(seen), scored=len(scored))
 
-        jobs = json.loads(json_block)
+        flush()
 
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"Scout process failed:\n{e.stderr}")
+        # What is left of the budget goes to the held jobs the pre-rank likes best
+        room = top_k - sent
+        if held and room > 0:
+            local = prerank_scores([job_text(job) for _, job in held], query, resume_text)
+            best = sorted(range(len(held)), key=lambda position: -local[position])[:room]
+            pending.extend(held[position] for position in sorted(best))
+            flush()
 
-    except json.JSONDecodeError:
-        raise RuntimeError(f"Invalid JSON returned from Scout:\n{raw_output}")
+        if analyst_span is not None:
+            analyst_span.set(prerank_skipped=len(seen) - sent)
 
-    if not jobs:
-        raise RuntimeError("No jobs found.")
+        await asyncio.gather(*score_tasks)
 
-    # ==========================================
-    # STEP 2 — ANALYST
-    # ==========================================
-    ranked_jobs = rank_jobs(jobs, query)
+        if RANK_CASCADE_FIRST_PASS and scored:
+            scored.sort(key=lambda pair: pair[0])
+            first = [job for _, job in scored]
 
+            with span("analyst.refine", parent=analyst_span, first_pass=RANK_CASCADE_FIRST_PASS):
+                if RANK_CASCADE_FIRST_PASS == "local":
+                    # Streamed jobs were scored chunk by chunk; put them on one scale
+                    first = await afirst_pass(first, query, resume_text, semaphore)
+                refined = await arefine(first, query, resume_text, semaphore)
+
+            scored[:] = [(index, job) for (index, _), job in zip(scored, refined)]
+
+    except APIError as e:
+        for task in score_tasks:
+            task.cancel()
+        if not fallback:
+            raise
+        print(f"⚠ Analyst unavailable, using local ranking: {e}", file=sys.stderr)
+        if analyst_span is not None:
+            analyst_span.set(local_fallback=True)
+        _, local_ranking = prerank_jobs(seen, query, resume_text, 0)
+        return local_fallback(local_ranking)
+
+    except BaseException:
+        for task in score_tasks:
+            task.cancel()
+        raise
+
+    finally:
+        if flush_timer is not None:
+            flush_timer.cancel()
+        if analyst_span is not None:
+            analyst_span.set(jobs=len(scored)).end()
+
+    if not scored:
+        raise NoJobsFound("No jobs found.")
+
+    scored.sort(key=rank_key)
+
+    return [job for _, job in scored]
+
+
+def split_ranking(ranked_jobs: list):
     if not ranked_jobs:
         raise RuntimeError("Ranking failed.")
 
     best_match = ranked_jobs[0]
-    alternatives = ranked_jobs[1:3]
-
-    # ==========================================
-    # STEP 3 — TAILOR
-    # ==========================================
-    tailored_package = tailor_application(best_match, query)
-
-    return {
-        "best_match": best_match,
-        "tailored_package": tailored_package,
-        "alternatives": alternatives
-    }
+    alternatives = ranked_jobs[1:max(3, TAILOR_TOP_N)]
+
+    return best_match, alternatives
+
+
+def scout_and_rank(query: str, refresh: bool = False):
+    return split_ranking(run_sync(ascout_and_score(query, refresh)))
+
+
+# ==========================================
+# CHECKPOINTED STAGES (see core/checkpoints.py)
+# ==========================================
+# Not worth retrying: same input, same outcome
+PERMANENT_ERRORS = (NoJobsFound, FileNotFoundError)
+
+
+async def aranked_stage(run_id: str, query: str, refresh: bool = False, on_leader=None, on_progress=None):
+    """
+    Scout + Analyst for one run, resumable:
+      analyst checkpoint -> returned as-is
+      scout checkpoint   -> only the Analyst runs again
+      nothing            -> overlapped scout-and-score; the scout
+                            checkpoint is written as soon as Scout is done
+    Failures are retried with backoff; a retry after Scout finished
+    never crawls again. An analyst outage that outlasts the retries
+    falls back to the local ranking, which is not checkpointed, so a
+    resume scores again. `on_progress` as in ascout_and_score.
+    """
+    from openai import APIError
+
+    store = get_checkpoint_store()
+
+    ranked_jobs = store.load(run_id, "analyst")
+    if ranked_jobs is not None:
+        current_span().set(resumed_from="analyst")
+        return ranked_jobs
+
+    async def attempt():
+        jobs = store.load(run_id, "scout")
+
+        if jobs is None:
+            return await ascout_and_score(
+                query,
+                refresh,
+                on_leader=on_leader,
+                on_scouted=lambda scouted: store.save(run_id, "scout", scouted),
+                on_progress=on_progress,
+                fallback=False
+            )
+
+        if on_progress:
+            on_progress("analyst", jobs=len(jobs), scored=0)
+
+        with span("stage.analyst", jobs=len(jobs), resumed_from="scout"):
+            return await arank_jobs(jobs, query, fallback=False)
+
+    try:
+        ranked_jobs = await retry_async(attempt, give_up_on=PERMANENT_ERRORS, label="Scout/Analyst")
+    except APIError as e:
+        jobs = store.load(run_id, "scout")
+        if not jobs:
+            raise
+        print(f"⚠ Analyst unavailable, using local ranking: {e}", file=sys.stderr)
+        current_span().set(local_fallback=True)
+        _, local_ranking = prerank_jobs(jobs, query, load_resume(), 0)
+        return local_fallback(local_ranking)
+
+    if not any(job.get("local_fallback") for job in ranked_jobs):
+        store.save(run_id, "analyst", ranked_jobs)
+
+    return ranked_jobs
+
+
+# ==========================================
+# STEP 3 — TAILOR
+# ==========================================
+class SpeculativeTailor:
+    """
+    Starts tailoring the current leader as soon as its score clears
+    SPECULATIVE_TAILOR_THRESHOLD; cancels that work if another job
+    overtakes it.
+    """
+
+    def __init__(self, query: str, threshold: float = SPECULATIVE_TAILOR_THRESHOLD):
+        self.query = query
+        self.threshold = threshold
+        self.parent = current_span()
+        self.job = None
+        self.task = None
+        self.started = 0
+        self.cancelled = 0
+
+    def consider(self, leader: dict):
+        if leader is self.job:
+            return
+
+        self.cancel()
+
+        if leader.get("match_score", 0) >= self.threshold:
+            self.job = leader
+            self.task = asyncio.ensure_future(self._tailor(leader))
+            self.started += 1
+
+    async def _tailor(self, job: dict):
+        # Cancelled runs show up in the trace as errored spans (wasted work)
+        with span("tailor.speculative", parent=self.parent, score=job.get("match_score")):
+            return await atailor_application(job, self.query)
+
+    def cancel(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            self.cancelled += 1
+
+        self.job = None
+        self.task = None
+
+    def take(self, job: dict):
+        """
+        The speculative task if it was for `job` (the same listing, even
+        if a re-score replaced the dict), else None.
+        Hands the task over at most once.
+        """
+        same = self.job is job or (
+            self.job is not None and job.get("source_url") and self.job.get("source_url") == job["source_url"]
+        )
+
+        if same:
+            task = self.task
+            self.job = None
+            self.task = None
+            return task
+
+        self.cancel()
+        return None
+
+
+def attach_packages(alternatives: list, packages: list):
+    """
+    Alternatives tailored alongside the best match carry their own
+    `tailored_package` (or `tailor_error` if that call failed).
+    """
+    attached = []
+
+    for alt, package in zip(alternatives, packages):
+        if isinstance(package, BaseException):
+            attached.append({**alt, "tailored_package": None, "tailor_error": str(package)})
+        else:
+            attached.append({**alt, "tailored_package": package})
+
+    return attached + alternatives[len(packages):]
+
+
+async def arun_agent(query: str = None, refresh: bool = False, run_id: str = None, on_progress=None):
+    """
+    Full pipeline under a run ID. Passing the ID of an earlier run
+    resumes it from its last completed stage (its query is reused).
+    `on_progress(stage, **counts)` as in ascout_and_score.
+    """
+    store = get_checkpoint_store()
+    run_id, meta = store.open_run(run_id, query, refresh=refresh)
+    query = meta["query"]
+
+    with trace("run_agent", run_id=run_id, query=query) as root:
+        result = store.load(run_id, "tailor")
+        if result is not None:
+            root.set(resumed_from="tailor")
+            return {**result, "trace_id": root.trace_id}
+
+        speculative = SpeculativeTailor(query)
+
+        try:
+            ranked_jobs = await aranked_stage(
+                run_id, query, refresh, on_leader=speculative.consider, on_progress=on_progress
+            )
+        except BaseException:
+            speculative.cancel()
+            raise
+
+        best_match, alternatives = split_ranking(ranked_jobs)
+
+        if on_progress:
+            on_progress("tailor", jobs=len(ranked_jobs))
+
+        async def tailor_stage():
+            best_task = speculative.take(best_match) or atailor_application(best_match, query)
+
+            return await asyncio.gather(
+                best_task,
+                atailor_many(alternatives[:TAILOR_TOP_N - 1], query)
+            )
+
+        with span("stage.tailor", jobs=min(len(alternatives) + 1, TAILOR_TOP_N)):
+            tailored_package, packages = await retry_async(
+                tailor_stage, give_up_on=PERMANENT_ERRORS, label="Tailor"
+            )
+
+        root.set(speculative_started=speculative.started, speculative_cancelled=speculative.cancelled)
+
+        result = {
+            "run_id": run_id,
+            "best_match": best_match,
+            "tailored_package": tailored_package,
+            "alternatives": attach_packages(alternatives, packages)
+        }
+        store.save(run_id, "tailor", result)
+
+        return {**result, "trace_id": root.trace_id}
+
+
+def run_agent(query: str = None, refresh: bool = False, run_id: str = None):
+    return run_sync(arun_agent(query, refresh, run_id))
+
+
+def run_agent_stream(query: str = None, refresh: bool = False, run_id: str = None, on_progress=None):
+    """
+    Same pipeline as run_agent, as a stream of events:
+      ("run",     run_id)
+      ("ranked",  {"best_match": ..., "alternatives": [...]})
+      ("section", (name, value))   one per tailored section
+      ("done",    <run_agent result>)
+    `on_progress(stage, **counts)` reports Scout/Analyst progress in
+    between (called from the shared loop thread).
+    """
+    store = get_checkpoint_store()
+    run_id, meta = store.open_run(run_id, query, refresh=refresh)
+    query = meta["query"]
+
+    yield "run", run_id
+
+    # Entered inside a generator, so this trace stays current in the
+    # caller between events; harmless for the UI, which only reads it
+    with trace("run_agent_stream", run_id=run_id, query=query) as root:
+        result = store.load(run_id, "tailor")
+        if result is not None:
+            root.set(resumed_from="tailor")
+            yield "ranked", {"best_match": result["best_match"], "alternatives": result["alternatives"]}
+            for name, value in result["tailored_package"].items():
+                yield "section", (name, value)
+            yield "done", {**result, "trace_id": root.trace_id}
+            return
+
+        best_match, alternatives = split_ranking(
+            run_sync(aranked_stage(run_id, query, refresh, on_progress=on_progress))
+        )
+
+        yield "ranked", {"best_match": best_match, "alternatives": alternatives}
+
+        # Alternatives are tailored on the shared loop while the best match streams
+        pending = asyncio.run_coroutine_threadsafe(
+            atailor_many(alternatives[:TAILOR_TOP_N - 1], query),
+            get_loop()
+        )
+
+        tailored_package = {}
+
+        try:
+            with span("stage.tailor", jobs=min(len(alternatives) + 1, TAILOR_TOP_N)):
+                for attempt in range(1, STAGE_RETRIES + 1):
+                    try:
+                        # A retry replays the stream; sections already shown are skipped
+                        for name, value in stream_tailor_application(best_match, query):
+                            if name not in tailored_package:
+                                tailored_package[name] = value
+                                yield "section", (name, value)
+                        break
+                    except PERMANENT_ERRORS:
+                        raise
+                    except Exception as e:
+                        if attempt == STAGE_RETRIES:
+                            raise
+                        delay = backoff_delay(attempt, STAGE_RETRY_BASE_DELAY)
+                        print(f"⚠ Tailor failed ({e}); retry {attempt}/{STAGE_RETRIES - 1} in {delay:.1f}s",
+                              file=sys.stderr)
+                        time.sleep(delay)
+
+                packages = pending.result()
+        except BaseException:
+            pending.cancel()
+            raise
+
+        result = {
+            "run_id": run_id,
+            "best_match": best_match,
+            "tailored_package": tailored_package,
+            "alternatives": attach_packages(alternatives, packages)
+        }
+        store.save(run_id, "tailor", result)
+
+    yield "done", {**result, "trace_id": root.trace_id}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import RUN_POOL_WORKERS
+from core.job_cache import normalize_query
+from pipeline import run_agent_stream
+
+
+# -----------------------------------------
+# ONE RUN (shared by every session that asked for it)
+# -----------------------------------------
+class RunHandle:
+    """
+    Live state of one pipeline run, filled in by a pool worker and
+    read by any number of pollers through snapshot().
+    """
+
+    def __init__(self, key: tuple, query: str, refresh: bool, run_id: str = None):
+        self.key = key
+        self.query = query
+        self.refresh = refresh
+        self.run_id = run_id
+        self.status = "queued"
+        self.stage = "queued"
+        self.counts = {}
+        self.ranked = None
+        self.sections = {}
+        self.result = None
+        self.error = None
+        self.subscribers = 1
+        self.created_at = time.time()
+        self.finished_at = None
+        # Bumped on every change, so pollers can skip unchanged states
+        self.version = 0
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def progress(self, stage: str, **counts):
+        with self._lock:
+            self.status = "running"
+            self.stage = stage
+            self.counts.update(counts)
+            self.version += 1
+
+    def apply(self, kind: str, payload):
+        """
+        One run_agent_stream event.
+        """
+        with self._lock:
+            self.status = "running"
+            self.version += 1
+
+            if kind == "run":
+                self.run_id = payload
+            elif kind == "ranked":
+                self.ranked = payload
+                self.stage = "tailor"
+            elif kind == "section":
+                name, value = payload
+                self.sections[name] = value
+            elif kind == "done":
+                self.result = payload
+                self.stage = "done"
+                self.status = "done"
+
+    def fail(self, error: BaseException):
+        with self._lock:
+            self.status = "failed"
+            self.error = str(error) or type(error).__name__
+            self.version += 1
+
+    def finish(self):
+        with self._lock:
+            self.finished_at = time.time()
+        self._done.set()
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def wait(self, timeout: float = None):
+        return self._done.wait(timeout)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "query": self.query,
+                "status": self.status,
+                "stage": self.stage,
+                "counts": dict(self.counts),
+                "ranked": self.ranked,
+                "sections": dict(self.sections),
+                "result": self.result,
+                "error": self.error,
+                "subscribers": self.subscribers,
+                "version": self.version,
+                "elapsed": (self.finished_at or time.time()) - self.created_at,
+            }
+
+
+# -----------------------------------------
+# POOL
+# -----------------------------------------
+class RunPool:
+    """
+    Process-wide pipeline workers. Callers submit() and poll the
+    returned handle instead of running the pipeline themselves.
+
+    Identical requests in flight share one run: the same query
+    (normalized, as in the job cache) with the same refresh flag, or
+    the same run ID when resuming.
+    """
+
+    def __init__(self, workers: int = RUN_POOL_WORKERS):
+        self._executor = ThreadPoolExecutor(max(1, workers), thread_name_prefix="pipeline-run")
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(query: str = None, refresh: bool = False, run_id: str = None):
+        if run_id:
+            return ("run", run_id)
+        return ("query", normalize_query(query), bool(refresh))
+
+    def submit(self, query: str = None, refresh: bool = False, run_id: str = None):
+        key = self.key_for(query, refresh, run_id)
+
+        with self._lock:
+            handle = self._inflight.get(key)
+            if handle is not None:
+                handle.subscribers += 1
+                return handle
+
+            handle = RunHandle(key, query, refresh, run_id)
+            self._inflight[key] = handle
+
+        self._executor.submit(self._work, handle)
+        return handle
+
+    def _work(self, handle: RunHandle):
+        try:
+            events = run_agent_stream(
+                handle.query, handle.refresh, handle.run_id, on_progress=handle.progress
+            )
+            for kind, payload in events:
+                handle.apply(kind, payload)
+                if kind == "run":
+                    # Resuming this run ID joins it too
+                    with self._lock:
+                        self._inflight.setdefault(("run", payload), handle)
+        except Exception as e:
+            handle.fail(e)
+        finally:
+            with self._lock:
+                for key in [key for key, value in self._inflight.items() if value is handle]:
+                    del self._inflight[key]
+            handle.finish()
+
+    def inflight(self):
+        with self._lock:
+            return len({id(handle) for handle in self._inflight.values()})
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
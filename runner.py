@@ -1,12 +1,190 @@
 import asyncio
+import argparse
+import hashlib
 import json
 import sys
-from pipeline import run_agent
+import time
+from pathlib import Path
+from config import BATCH_CONCURRENCY
+from core.checkpoints import new_run_id
+from core.startup import init
+from pipeline import arun_agent
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the job hunting pipeline for one query or a batch.")
+    parser.add_argument("query", nargs="?", help="role to search for, e.g. 'Machine Learning Intern'")
+    parser.add_argument("--resume", metavar="RUN_ID", help="continue an earlier run from its last completed stage")
+    parser.add_argument("--refresh", action="store_true", help="ignore cached listings")
+
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", metavar="FILE", help="JSONL of queries ('-' for stdin)")
+    batch.add_argument("--out", metavar="FILE", help="append results here as JSONL (default: stdout)")
+    batch.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="queries in flight at once")
+    batch.add_argument("--batch-id", help="defaults to a hash of the input, so re-running it resumes")
+
+    args = parser.parse_args()
+
+    if not args.query and not args.resume and not args.batch:
+        parser.error("a query, --resume RUN_ID or --batch FILE is required")
+
+    return args
+
+
+# -----------------------------------------
+# SINGLE QUERY
+# -----------------------------------------
+async def run_one(args):
+    run_id = args.resume or new_run_id()
+
+    try:
+        result = await arun_agent(args.query, args.refresh, run_id)
+    except Exception as e:
+        print(f"Run {run_id} failed: {e}", file=sys.stderr)
+        print(f"Resume with: python runner.py --resume {run_id}", file=sys.stderr)
+        sys.exit(1)
 
-async def main():
-    query = sys.argv[1]
-    result = await run_agent(query)
     print(json.dumps(result))
 
+
+# -----------------------------------------
+# BATCH
+# -----------------------------------------
+def read_batch(source: str):
+    """
+    [(item_id, item)] from JSONL lines such as
+      {"id": "u42-ml", "query": "Machine Learning Intern", "user": "u42"}
+      "Data Science Intern"
+    Items without an id are numbered by line.
+    """
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+
+    try:
+        lines = stream.read().splitlines()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    items = []
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Line {number} is not valid JSON: {e}")
+
+        if isinstance(item, str):
+            item = {"query": item}
+
+        if not isinstance(item, dict) or not item.get("query"):
+            raise RuntimeError(f"Line {number} has no query.")
+
+        item_id = str(item.get("id", number))
+        if any(item_id == seen_id for seen_id, _ in items):
+            raise RuntimeError(f"Line {number} repeats id {item_id!r}.")
+
+        items.append((item_id, item))
+
+    return items, hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()[:12]
+
+
+def finished_ids(path: str):
+    """
+    Ids already written successfully to an earlier output file.
+    """
+    if not path or not Path(path).exists():
+        return set()
+
+    done = set()
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from an interrupted run
+            if record.get("status") == "ok":
+                done.add(record["id"])
+
+    return done
+
+
+async def run_batch(args):
+    items, input_hash = read_batch(args.batch)
+    batch_id = args.batch_id or input_hash
+
+    skip = finished_ids(args.out)
+    pending = [(item_id, item) for item_id, item in items if item_id not in skip]
+
+    # Agent warnings go to stderr, so stdout carries only results
+    out = open(args.out, "a", encoding="utf-8") if args.out else sys.stdout
+    counts = {"ok": 0, "error": 0}
+    started = time.perf_counter()
+
+    print(
+        f"Batch {batch_id}: {len(items)} queries, {len(items) - len(pending)} already done, "
+        f"concurrency {args.concurrency}",
+        file=sys.stderr
+    )
+
+    def emit(record: dict):
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    async def run_item(item_id: str, item: dict):
+        # Stable run ID: an interrupted item resumes from its checkpoints
+        run_id = f"batch-{batch_id}-{hashlib.sha256(item_id.encode('utf-8')).hexdigest()[:12]}"
+        record = {"id": item_id, "query": item["query"], "run_id": run_id, "input": item}
+
+        try:
+            result = await arun_agent(item["query"], args.refresh or item.get("refresh", False), run_id)
+            record.update(status="ok", result=result)
+        except Exception as e:
+            record.update(status="error", error=str(e))
+
+        counts[record["status"]] += 1
+        emit(record)
+
+    queue = asyncio.Queue()
+    for pair in pending:
+        queue.put_nowait(pair)
+
+    async def worker():
+        while True:
+            try:
+                item_id, item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await run_item(item_id, item)
+
+    try:
+        await asyncio.gather(*[worker() for _ in range(max(1, args.concurrency))])
+    finally:
+        if args.out:
+            out.close()
+
+    print(
+        f"Batch {batch_id}: {counts['ok']} ok, {counts['error']} failed, "
+        f"{len(items) - len(pending)} skipped in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr
+    )
+
+    if counts["error"]:
+        print("Re-run the same command to retry failed queries.", file=sys.stderr)
+        sys.exit(1)
+
+
+async def main():
+    args = parse_args()
+
+    if args.batch:
+        await run_batch(args)
+    else:
+        await run_one(args)
+
 if __name__ == "__main__":
+    init()
     asyncio.run(main())
@@ -0,0 +1,349 @@
+"""
+HTTP service around the pipeline for other tools (stdlib asyncio,
+no web framework).
+
+    python service.py --port 8080
+
+    POST /runs                    {"query": "...", "refresh": false} or {"run_id": "..."}
+                                  202 {"run_id", "status", "coalesced"}
+                                  429 + Retry-After when the queue is full
+    GET  /runs/<run_id>           current state of a run
+    GET  /runs/<run_id>/stream    NDJSON: one state per change until done / failed
+    GET  /health                  queue depth, runs in flight, stage slots, LLM gateway
+
+Identical requests in flight share one execution: same normalized
+query, same resume (hash) and refresh flag, or the same run ID.
+"""
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import OrderedDict, deque
+
+from config import (
+    SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_QUEUE_SIZE, SERVICE_KEEP_RUNS,
+    SERVICE_SCOUT_LIMIT, SERVICE_ANALYST_LIMIT, SERVICE_TAILOR_LIMIT, SERVICE_STREAM_INTERVAL
+)
+from core.checkpoints import get_checkpoint_store, new_run_id
+from core.job_cache import normalize_query
+from core.limits import StageLimits, use_limits
+from core.llm_gateway import get_llm_gateway
+from core.prompting import get_resume_store, prompt_stats
+from core.startup import init
+from pipeline import arun_agent
+from run_pool import RunHandle
+
+MAX_BODY_BYTES = 64 * 1024
+RUN_ID_RE = re.compile(r"^[A-Za-z0-9_.-]{1,100}$")
+
+REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(RuntimeError):
+
+    def __init__(self, status: int, message: str, headers: dict = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+# -----------------------------------------
+# RUNS (queue + workers + coalescing)
+# -----------------------------------------
+class AgentService:
+
+    def __init__(self, workers: int = SERVICE_WORKERS, queue_size: int = SERVICE_QUEUE_SIZE,
+                 limits: StageLimits = None):
+        self.workers = max(1, workers)
+        self.queue = asyncio.Queue(max(1, queue_size))
+        self.limits = limits or StageLimits(
+            scout=SERVICE_SCOUT_LIMIT, analyst=SERVICE_ANALYST_LIMIT, tailor=SERVICE_TAILOR_LIMIT
+        )
+        self.inflight = {}
+        self.runs = OrderedDict()
+        self.durations = deque(maxlen=20)
+        self.counts = {"submitted": 0, "coalesced": 0, "rejected": 0, "executed": 0, "failed": 0}
+        self._tasks = []
+
+    def start(self):
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def key_for(self, query: str = None, refresh: bool = False, run_id: str = None):
+        if run_id:
+            return ("run", run_id)
+        return ("query", normalize_query(query), get_resume_store().digest(), bool(refresh))
+
+    def submit(self, query: str = None, refresh: bool = False, run_id: str = None):
+        """
+        Returns (handle, coalesced). Raises HTTPError(429) when the
+        queue is full; coalesced requests never take a queue slot.
+        """
+        key = self.key_for(query, refresh, run_id)
+        self.counts["submitted"] += 1
+
+        handle = self.inflight.get(key)
+        if handle is not None:
+            handle.subscribers += 1
+            self.counts["coalesced"] += 1
+            return handle, True
+
+        handle = RunHandle(key, query, refresh, run_id or new_run_id())
+
+        try:
+            self.queue.put_nowait(handle)
+        except asyncio.QueueFull:
+            self.counts["rejected"] += 1
+            raise HTTPError(429, "Queue is full, try again later.", {"Retry-After": str(self.retry_after())})
+
+        self.inflight[key] = handle
+        self.inflight.setdefault(("run", handle.run_id), handle)
+        self.runs[handle.run_id] = handle
+
+        while len(self.runs) > SERVICE_KEEP_RUNS:
+            oldest_id, oldest = next(iter(self.runs.items()))
+            if not oldest.finished:
+                break
+            del self.runs[oldest_id]
+
+        return handle, False
+
+    def retry_after(self):
+        # Seconds until a queue slot is likely free
+        mean = sum(self.durations) / len(self.durations) if self.durations else 30.0
+        return max(1, round(mean * self.queue.qsize() / self.workers))
+
+    async def _worker(self):
+        # Tasks started by the pipeline inherit these limits
+        use_limits(self.limits)
+
+        while True:
+            handle = await self.queue.get()
+            try:
+                await self._execute(handle)
+            finally:
+                self.queue.task_done()
+
+    async def _execute(self, handle: RunHandle):
+        started = time.perf_counter()
+        handle.apply("run", handle.run_id)
+
+        try:
+            result = await arun_agent(handle.query, handle.refresh, handle.run_id, on_progress=handle.progress)
+            handle.apply("done", result)
+        except Exception as e:
+            self.counts["failed"] += 1
+            handle.fail(e)
+        finally:
+            for key in [key for key, value in self.inflight.items() if value is handle]:
+                del self.inflight[key]
+            self.counts["executed"] += 1
+            self.durations.append(time.perf_counter() - started)
+            handle.finish()
+
+    def get(self, run_id: str):
+        handle = self.runs.get(run_id)
+        if handle is None:
+            raise HTTPError(404, f"Unknown run {run_id}.")
+        return handle
+
+    def health(self):
+        return {
+            "queue": {"depth": self.queue.qsize(), "size": self.queue.maxsize},
+            "workers": self.workers,
+            "in_flight": len({id(handle) for handle in self.inflight.values()}),
+            "stages": self.limits.stats(),
+            "counts": dict(self.counts),
+            "llm": get_llm_gateway().stats(),
+            "prompts": prompt_stats.snapshot(),
+        }
+
+
+# -----------------------------------------
+# HTTP
+# -----------------------------------------
+async def read_request(reader):
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    if not request_line:
+        return None
+
+    try:
+        method, target, _ = request_line.split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.")
+
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length.")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "Request body too large.")
+
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target.split("?", 1)[0], body
+
+
+def response_head(status: int, content_type: str, headers: dict = None, length: int = None):
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Content-Type: {content_type}", "Connection: close"]
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def send_json(writer, status: int, data, headers: dict = None):
+    body = json.dumps(data).encode("utf-8")
+    writer.write(response_head(status, "application/json", headers, len(body)) + body)
+    await writer.drain()
+
+
+def parse_submit(body: bytes):
+    try:
+        data = json.loads(body or b"{}")
+    except json.JSONDecodeError as e:
+        raise HTTPError(400, f"Body is not valid JSON: {e}")
+
+    if isinstance(data, str):
+        data = {"query": data}
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Body must be a JSON object.")
+
+    query = (data.get("query") or "").strip() or None
+    run_id = data.get("run_id")
+
+    if run_id is not None:
+        if not isinstance(run_id, str) or not RUN_ID_RE.match(run_id):
+            raise HTTPError(400, "Invalid run_id.")
+        if get_checkpoint_store().load(run_id, "meta") is None:
+            raise HTTPError(404, f"Unknown run {run_id}.")
+    elif not query:
+        raise HTTPError(400, "A query or run_id is required.")
+
+    return query, bool(data.get("refresh", False)), run_id
+
+
+async def stream_run(writer, handle: RunHandle):
+    writer.write(response_head(200, "application/x-ndjson", {"Cache-Control": "no-cache"}))
+    await writer.drain()
+
+    version = None
+    while True:
+        # Read before the snapshot, so the final state is always sent
+        finished = handle.finished
+        snapshot = handle.snapshot()
+
+        if snapshot["version"] != version:
+            version = snapshot["version"]
+            writer.write((json.dumps(snapshot) + "\n").encode("utf-8"))
+            await writer.drain()
+
+        if finished:
+            return
+
+        await asyncio.sleep(SERVICE_STREAM_INTERVAL)
+
+
+async def route(service: AgentService, method: str, path: str, body: bytes, writer):
+    if path == "/health":
+        return await send_json(writer, 200, service.health())
+
+    if path == "/runs":
+        if method != "POST":
+            raise HTTPError(405, "Use POST.")
+        handle, coalesced = service.submit(*parse_submit(body))
+        snapshot = handle.snapshot()
+        return await send_json(writer, 202, {
+            "run_id": snapshot["run_id"],
+            "status": snapshot["status"],
+            "coalesced": coalesced,
+        }, {"Location": f"/runs/{snapshot['run_id']}"})
+
+    match = re.match(r"^/runs/([^/]+)(/stream)?$", path)
+    if match:
+        if method != "GET":
+            raise HTTPError(405, "Use GET.")
+        handle = service.get(match.group(1))
+        if match.group(2):
+            return await stream_run(writer, handle)
+        return await send_json(writer, 200, handle.snapshot())
+
+    raise HTTPError(404, f"No route for {path}.")
+
+
+async def handle_connection(service: AgentService, reader, writer):
+    try:
+        request = await read_request(reader)
+        if request is not None:
+            await route(service, *request, writer)
+    except HTTPError as e:
+        await send_json(writer, e.status, {"error": str(e)}, e.headers)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    except Exception as e:
+        print(f"⚠ Request failed: {e}", file=sys.stderr)
+        try:
+            await send_json(writer, 500, {"error": str(e)})
+        except ConnectionError:
+            pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = SERVICE_HOST, port: int = SERVICE_PORT, service: AgentService = None, ready=None):
+    """
+    Runs until cancelled. `ready(port)` fires once the socket is bound
+    (port 0 picks a free one).
+    """
+    service = service or AgentService()
+    service.start()
+
+    server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+    bound_port = server.sockets[0].getsockname()[1]
+    print(f"Agent service on http://{host}:{bound_port} ({service.workers} workers, queue {service.queue.maxsize})")
+
+    if ready:
+        ready(bound_port)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the job hunting pipeline over HTTP.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    args = parser.parse_args()
+
+    init()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()